@@ -10,33 +10,59 @@ Based on:
 """
 
 import asyncio
+import functools
 import json
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, ClassVar, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 from loguru import logger
-from sqlmodel import select
+from sqlalchemy.orm import raiseload
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from packages.harvester.core.base_harvester import BaseHarvester, HarvesterError
 from packages.harvester.core.models import HostType, RiskLevel
 from packages.harvester.models.models import (
+    Dependency,
     Prompt,
     ResourceTemplate,
     Server,
     Tool,
+    ToolEmbedding,
 )
 from packages.harvester.utils.http_client import HTTPClientError, get_client
 
+# Splits an http(s) URL into scheme, netloc and path
+_URL_RE = re.compile(r"^(https?)://([^/?#]+)([^?#]*)")
+
+_EVENT_STREAM = "text/event-stream"
+
+
+def _is_event_stream(content_type: str) -> bool:
+    """Check whether a Content-Type value is ``text/event-stream``.
+
+    Only the media-type prefix is case-folded, so long parameter lists
+    (charset, boundary, ...) are never copied.
+
+    Args:
+        content_type: Raw Content-Type header value
+
+    Returns:
+        True for Server-Sent Events responses
+    """
+    return content_type[: len(_EVENT_STREAM)].lower() == _EVENT_STREAM
+
 
 class HTTPHarvester(BaseHarvester):
     """HTTP endpoint harvester for detecting and introspecting MCP servers.
 
     This harvester:
-    - Probes HTTP/HTTPS endpoints with OPTIONS and GET requests
+    - Probes HTTP/HTTPS endpoints with GET, falling back to OPTIONS when needed
     - Detects MCP-specific headers (X-MCP-Version, X-Protocol, etc.)
     - Connects via Server-Sent Events (SSE) for MCP handshake
     - Performs introspection via tools/list, resources/list, prompts/list
@@ -57,12 +83,32 @@ class HTTPHarvester(BaseHarvester):
     """
 
     # MCP-specific headers to check for
-    MCP_HEADERS = [
-        "x-mcp-version",
-        "x-mcp-protocol",
-        "x-protocol-version",
-        "x-model-context-protocol",
-    ]
+    MCP_HEADERS = frozenset(
+        {
+            "x-mcp-version",
+            "x-mcp-protocol",
+            "x-protocol-version",
+            "x-model-context-protocol",
+        }
+    )
+
+    # GET status codes that warrant an OPTIONS probe for capabilities
+    OPTIONS_FALLBACK_STATUSES = (405, 501)
+
+    # Loopback hosts never need a CORS preflight, so OPTIONS is skipped for them
+    LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+    # Hosts whose GET response alone exposed MCP headers, shared across instances
+    # as an LRU set; least recently seen hosts are evicted beyond KNOWN_NON_CORS_SIZE
+    KNOWN_NON_CORS_SIZE = 4096
+    _KNOWN_NON_CORS: ClassVar[OrderedDict[str, None]] = OrderedDict()
+
+    # Upper bound on concurrent introspections across all instances,
+    # tunable at runtime via set_max_introspections()
+    MAX_CONCURRENT_INTROSPECTIONS = 32
+    _slots_in_use = 0
+    _slot_condition: Optional[asyncio.Condition] = None
+    _slot_loop: Optional[asyncio.AbstractEventLoop] = None
 
     # Timeout for SSE connection (seconds)
     SSE_TIMEOUT = 30.0
@@ -70,6 +116,35 @@ class HTTPHarvester(BaseHarvester):
     # Maximum time to wait for introspection responses (seconds)
     INTROSPECTION_TIMEOUT = 10.0
 
+    # JSON-RPC requests sent during introspection, batched into one POST
+    INTROSPECTION_REQUESTS = [
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {
+                    "name": "MCPS-Harvester",
+                    "version": "2.4.0",
+                },
+            },
+        },
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}},
+        {"jsonrpc": "2.0", "id": 3, "method": "resources/list", "params": {}},
+        {"jsonrpc": "2.0", "id": 4, "method": "prompts/list", "params": {}},
+    ]
+
+    # Request bodies encoded once at import time instead of on every POST
+    INTROSPECTION_BATCH_BODY = orjson.dumps(INTROSPECTION_REQUESTS)
+    INTROSPECTION_REQUEST_BODIES = {
+        rpc_request["id"]: orjson.dumps(rpc_request) for rpc_request in INTROSPECTION_REQUESTS
+    }
+
+    # Maps JSON-RPC request ids to the introspection result key they fill
+    RPC_RESULT_KEYS = {1: "serverInfo", 2: "tools", 3: "resources", 4: "prompts"}
+
     def __init__(self, session: AsyncSession):
         """Initialize HTTP harvester with session.
 
@@ -78,10 +153,13 @@ class HTTPHarvester(BaseHarvester):
         """
         super().__init__(session)
 
-    def _normalize_url(self, url: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _normalize_url(url: str) -> str:
         """Normalize HTTP URL to standard format.
 
-        Ensures URL has protocol and is properly formatted.
+        Ensures URL has protocol and is properly formatted. Results are
+        cached per URL; invalid URLs raise and are not cached.
 
         Args:
             url: HTTP URL or endpoint
@@ -103,24 +181,63 @@ class HTTPHarvester(BaseHarvester):
             url = f"https://{url}"
 
         # Validate URL
-        try:
-            parsed = urlparse(url)
-            if not parsed.netloc:
-                raise HarvesterError(f"Invalid URL: {url}")
-        except Exception as e:
-            raise HarvesterError(f"Failed to parse URL {url}: {str(e)}") from e
+        if not _URL_RE.match(url):
+            raise HarvesterError(f"Invalid URL: {url}")
 
         logger.debug(f"Normalized URL: {url}")
         return url
 
+    def _split_url(self, url: str) -> Tuple[str, str, str]:
+        """Split a normalized URL into scheme, netloc and path.
+
+        Args:
+            url: Normalized http(s) URL
+
+        Returns:
+            Tuple of (scheme, netloc, path), with path defaulting to "/"
+
+        Raises:
+            HarvesterError: If URL is invalid
+        """
+        match = _URL_RE.match(url)
+        if not match:
+            raise HarvesterError(f"Invalid URL: {url}")
+        scheme, netloc, path = match.groups()
+        return scheme, netloc, path or "/"
+
+    def _is_loopback_host(self, netloc: str) -> bool:
+        """Check whether a netloc points at the local machine.
+
+        Args:
+            netloc: URL netloc, optionally with userinfo and port
+
+        Returns:
+            True for loopback addresses and ``.local`` hostnames
+        """
+        host = netloc.rpartition("@")[2]
+        # Bracketed IPv6 literals contain colons, so only strip a port outside them
+        host = host[1 : host.find("]")] if host.startswith("[") else host.partition(":")[0]
+        host = host.lower()
+        return host in self.LOOPBACK_HOSTS or host.endswith(".local")
+
+    def _remember_non_cors_host(self, netloc: str) -> None:
+        """Record a host that needs no OPTIONS probe in the LRU known-host set."""
+        self._KNOWN_NON_CORS[netloc] = None
+        self._KNOWN_NON_CORS.move_to_end(netloc)
+        while len(self._KNOWN_NON_CORS) > self.KNOWN_NON_CORS_SIZE:
+            self._KNOWN_NON_CORS.popitem(last=False)
+
     async def fetch(self, url: str) -> Dict[str, Any]:
         """Probe HTTP endpoint and detect MCP server.
 
         This method:
         1. Normalizes the URL
-        2. Sends OPTIONS request to check for MCP headers
-        3. Sends GET request to detect SSE endpoint
-        4. Checks response headers for MCP indicators
+        2. Sends GET request to detect SSE endpoint and MCP headers
+        3. Sends OPTIONS request only if GET is rejected (405/501) or
+           exposes neither MCP indicators nor an Allow header. OPTIONS is
+           never sent to loopback/.local hosts or to hosts whose GET has
+           already exposed MCP headers
+        4. Checks combined response headers for MCP indicators
         5. Validates endpoint is reachable
 
         Args:
@@ -132,7 +249,8 @@ class HTTPHarvester(BaseHarvester):
                 - is_mcp: Whether MCP indicators were detected
                 - headers: Response headers
                 - status_code: HTTP status code
-                - content_type: Content-Type header
+                - content_type: Content-Type header (as sent by the server)
+                - _url_parts: (scheme, netloc, path) of the URL, reused by parse()
 
         Raises:
             HarvesterError: If endpoint is unreachable or invalid
@@ -140,26 +258,47 @@ class HTTPHarvester(BaseHarvester):
         url = self._normalize_url(url)
         logger.info(f"Probing HTTP endpoint: {url}")
 
+        url_parts = self._split_url(url)
+        netloc = url_parts[1]
+        skip_options = self._is_loopback_host(netloc)
+        if not skip_options and netloc in self._KNOWN_NON_CORS:
+            self._KNOWN_NON_CORS.move_to_end(netloc)
+            skip_options = True
+
         client = get_client()
 
         try:
-            # Try OPTIONS first to check capabilities
-            logger.debug(f"Sending OPTIONS request to {url}")
-            options_response = await client.options(url, timeout=10.0)
-
-            # Try GET to confirm endpoint
+            # GET alone is enough for most MCP endpoints
             logger.debug(f"Sending GET request to {url}")
             get_response = await client.get(url, timeout=10.0)
-
-            # Combine headers from both requests
-            headers = {**options_response.headers, **get_response.headers}
-
-            # Check for MCP-specific headers
-            is_mcp = self._detect_mcp_headers(headers)
-
-            # Check for SSE content type
-            content_type = headers.get("content-type", "").lower()
-            is_sse = "text/event-stream" in content_type
+            get_headers = get_response.headers
+
+            # Check for MCP-specific headers or an SSE content type
+            is_mcp = self._detect_mcp_headers(get_headers)
+            content_type = get_headers.get("content-type", "")
+            is_sse = _is_event_stream(content_type)
+
+            if is_mcp:
+                self._remember_non_cors_host(netloc)
+
+            # Fall back to OPTIONS only when GET is rejected or told us nothing
+            if not skip_options and (
+                get_response.status_code in self.OPTIONS_FALLBACK_STATUSES
+                or (not is_mcp and not is_sse and "allow" not in get_headers)
+            ):
+                logger.debug(f"Sending OPTIONS request to {url}")
+                options_response = await client.options(url, timeout=10.0)
+
+                # GET headers were already scanned; only OPTIONS can add indicators
+                is_mcp = is_mcp or self._detect_mcp_headers(options_response.headers)
+                if not content_type:
+                    content_type = options_response.headers.get("content-type", "")
+                    is_sse = _is_event_stream(content_type)
+
+                # Combine headers from both requests (GET takes precedence)
+                headers = {**options_response.headers, **get_headers}
+            else:
+                headers = dict(get_headers)
 
             if is_sse:
                 logger.debug("Detected SSE endpoint (text/event-stream)")
@@ -173,10 +312,11 @@ class HTTPHarvester(BaseHarvester):
             return {
                 "url": url,
                 "is_mcp": is_mcp,
-                "headers": dict(headers),
+                "headers": headers,
                 "status_code": get_response.status_code,
                 "content_type": content_type,
                 "is_sse": is_sse,
+                "_url_parts": url_parts,
             }
 
         except httpx.TimeoutException as e:
@@ -216,9 +356,17 @@ class HTTPHarvester(BaseHarvester):
             logger.info(f"Parsing HTTP endpoint: {url}")
 
             # Extract domain for naming
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            path = parsed.path or "/"
+            scheme, domain, _path = data.get("_url_parts") or self._split_url(url)
+
+            # If not detected as MCP, return minimal server
+            if not is_mcp:
+                logger.warning(
+                    f"Endpoint {url} not detected as MCP server. Returning minimal server entity."
+                )
+                return self._build_stub_server(url, domain)
+
+            # Single harvest timestamp, stored as naive UTC to match the schema
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
 
             # Create base Server entity
             server = Server(
@@ -226,19 +374,10 @@ class HTTPHarvester(BaseHarvester):
                 primary_url=url,
                 host_type=HostType.HTTP,
                 description=f"MCP server endpoint at {url}",
-                homepage=f"{parsed.scheme}://{parsed.netloc}",
-                last_indexed_at=datetime.utcnow(),
+                homepage=f"{scheme}://{domain}",
+                last_indexed_at=now,
             )
 
-            # If not detected as MCP, return minimal server
-            if not is_mcp:
-                logger.warning(
-                    f"Endpoint {url} not detected as MCP server. Returning minimal server entity."
-                )
-                server.risk_level = RiskLevel.UNKNOWN
-                server.health_score = 30
-                return server
-
             # Attempt MCP introspection via SSE
             if is_sse:
                 logger.info(f"Attempting MCP introspection via SSE: {url}")
@@ -246,35 +385,41 @@ class HTTPHarvester(BaseHarvester):
 
                 if introspection_data:
                     # Parse tools
-                    tools = introspection_data.get("tools", [])
-                    for tool_data in tools:
-                        tool = Tool(
-                            name=tool_data.get("name", "unknown"),
-                            description=tool_data.get("description"),
-                            input_schema=tool_data.get("inputSchema", {}),
-                        )
-                        server.tools.append(tool)
+                    server.tools.extend(
+                        [
+                            Tool(
+                                name=tool_data.get("name", "unknown"),
+                                description=tool_data.get("description"),
+                                input_schema=tool_data.get("inputSchema", {}),
+                            )
+                            for tool_data in introspection_data.get("tools", [])
+                        ]
+                    )
 
                     # Parse resources
-                    resources = introspection_data.get("resources", [])
-                    for resource_data in resources:
-                        resource = ResourceTemplate(
-                            uri_template=resource_data.get("uriTemplate", ""),
-                            name=resource_data.get("name"),
-                            mime_type=resource_data.get("mimeType"),
-                            description=resource_data.get("description"),
-                        )
-                        server.resources.append(resource)
+                    server.resources.extend(
+                        [
+                            ResourceTemplate(
+                                uri_template=resource_data.get("uriTemplate", ""),
+                                name=resource_data.get("name"),
+                                mime_type=resource_data.get("mimeType"),
+                                description=resource_data.get("description"),
+                            )
+                            for resource_data in introspection_data.get("resources", [])
+                        ]
+                    )
 
                     # Parse prompts
-                    prompts = introspection_data.get("prompts", [])
-                    for prompt_data in prompts:
-                        prompt = Prompt(
-                            name=prompt_data.get("name", "unknown"),
-                            description=prompt_data.get("description"),
-                            arguments=prompt_data.get("arguments", []),
-                        )
-                        server.prompts.append(prompt)
+                    server.prompts.extend(
+                        [
+                            Prompt(
+                                name=prompt_data.get("name", "unknown"),
+                                description=prompt_data.get("description"),
+                                arguments=prompt_data.get("arguments", []),
+                            )
+                            for prompt_data in introspection_data.get("prompts", [])
+                        ]
+                    )
 
                     # Update server name if available
                     server_info = introspection_data.get("serverInfo", {})
@@ -288,20 +433,15 @@ class HTTPHarvester(BaseHarvester):
                         f"{len(server.resources)} resources, {len(server.prompts)} prompts"
                     )
 
-            # Determine risk level
-            server.risk_level = self._determine_risk_level(
-                is_https=url.startswith("https://"),
-                has_tools=len(server.tools) > 0,
-            )
-
-            # Calculate health score
-            server.health_score = self._calculate_health_score(
-                is_https=url.startswith("https://"),
+            # Look up risk level and health score for this feature combination
+            features = self._pack_features(
+                is_https=scheme == "https",
                 has_tools=len(server.tools) > 0,
                 has_resources=len(server.resources) > 0,
                 has_prompts=len(server.prompts) > 0,
                 introspection_success=bool(introspection_data) if is_sse else False,
             )
+            server.risk_level, server.health_score = _FEATURE_TABLE[features]
 
             logger.success(
                 f"Parsed HTTP endpoint {url}: "
@@ -313,6 +453,27 @@ class HTTPHarvester(BaseHarvester):
         except Exception as e:
             raise HarvesterError(f"Failed to parse HTTP endpoint data: {str(e)}") from e
 
+    def _build_stub_server(self, url: str, domain: str) -> Server:
+        """Build the minimal Server entity for an endpoint that is not MCP.
+
+        Only the required fields are set; description and homepage are left
+        empty and ``last_indexed_at`` falls back to the model default.
+
+        Args:
+            url: Normalized endpoint URL
+            domain: Endpoint netloc, used for naming
+
+        Returns:
+            Server with UNKNOWN risk level and a fixed health score of 30
+        """
+        return Server(
+            name=f"MCP Server @ {domain}",
+            primary_url=url,
+            host_type=HostType.HTTP,
+            risk_level=RiskLevel.UNKNOWN,
+            health_score=30,
+        )
+
     async def store(self, server: Server, session: AsyncSession) -> None:
         """Persist server to database.
 
@@ -326,8 +487,18 @@ class HTTPHarvester(BaseHarvester):
             HarvesterError: If storage operation fails
         """
         try:
-            # Check if server already exists
-            statement = select(Server).where(Server.primary_url == server.primary_url)
+            # Check if server already exists. Child rows are replaced with bulk
+            # statements below, so never load them (lazily or eagerly) here.
+            statement = (
+                select(Server)
+                .options(
+                    raiseload(Server.tools),
+                    raiseload(Server.resources),
+                    raiseload(Server.prompts),
+                    raiseload(Server.dependencies),
+                )
+                .where(Server.primary_url == server.primary_url)
+            )
             result = await session.execute(statement)
             existing_server = result.scalar_one_or_none()
 
@@ -351,32 +522,32 @@ class HTTPHarvester(BaseHarvester):
                 existing_server.verified_source = server.verified_source
                 existing_server.health_score = server.health_score
                 existing_server.last_indexed_at = server.last_indexed_at
-                existing_server.updated_at = datetime.utcnow()
-
-                # Clear and replace related entities
-                existing_server.tools.clear()
-                existing_server.resources.clear()
-                existing_server.prompts.clear()
-                existing_server.dependencies.clear()
-
-                # Add new related entities
-                for tool in server.tools:
-                    tool.server_id = existing_server.id
-                    existing_server.tools.append(tool)
+                existing_server.updated_at = server.last_indexed_at
 
-                for resource in server.resources:
-                    resource.server_id = existing_server.id
-                    existing_server.resources.append(resource)
-
-                for prompt in server.prompts:
-                    prompt.server_id = existing_server.id
-                    existing_server.prompts.append(prompt)
-
-                for dependency in server.dependencies:
-                    dependency.server_id = existing_server.id
-                    existing_server.dependencies.append(dependency)
+                # Replace related entities with one bulk DELETE per table
+                tool_ids = select(Tool.id).where(Tool.server_id == existing_server.id)
+                await session.execute(
+                    delete(ToolEmbedding).where(ToolEmbedding.tool_id.in_(tool_ids))
+                )
+                for model in (Tool, ResourceTemplate, Prompt, Dependency):
+                    await session.execute(
+                        delete(model).where(model.server_id == existing_server.id)
+                    )
+                session.expire(existing_server, ["tools", "resources", "prompts", "dependencies"])
+
+                # Re-parent new entities onto the stored server and add them in bulk
+                related = [
+                    *server.tools,
+                    *server.resources,
+                    *server.prompts,
+                    *server.dependencies,
+                ]
+                for entity in related:
+                    entity.server = existing_server
+                    entity.server_id = existing_server.id
 
                 session.add(existing_server)
+                session.add_all(related)
             else:
                 logger.info(f"Creating new HTTP server: {server.name}")
                 session.add(server)
@@ -390,33 +561,76 @@ class HTTPHarvester(BaseHarvester):
 
     # --- Helper Methods ---
 
-    def _detect_mcp_headers(self, headers: Dict[str, str]) -> bool:
+    def _detect_mcp_headers(self, headers: httpx.Headers) -> bool:
         """Detect MCP-specific headers in HTTP response.
 
+        Header names are scanned once against the precomputed ``MCP_HEADERS``
+        set; httpx already exposes them lowercased.
+
         Args:
-            headers: HTTP response headers (case-insensitive)
+            headers: HTTP response headers
 
         Returns:
             True if MCP headers are detected
         """
-        # Normalize header keys to lowercase
-        headers_lower = {k.lower(): v for k, v in headers.items()}
+        return not self.MCP_HEADERS.isdisjoint(headers.keys())
+
+    @classmethod
+    def _get_slot_condition(cls) -> asyncio.Condition:
+        """Get the introspection slot condition for the running event loop.
+
+        asyncio primitives are bound to one loop, so the condition (and slot
+        count) is recreated if the harvester is used from a new loop.
+
+        Returns:
+            Condition guarding the shared introspection slot counter
+        """
+        loop = asyncio.get_running_loop()
+        if cls._slot_condition is None or cls._slot_loop is not loop:
+            cls._slot_condition = asyncio.Condition()
+            cls._slot_loop = loop
+            cls._slots_in_use = 0
+        return cls._slot_condition
 
-        for mcp_header in self.MCP_HEADERS:
-            if mcp_header in headers_lower:
-                logger.debug(f"MCP header detected: {mcp_header}={headers_lower[mcp_header]}")
-                return True
+    @classmethod
+    async def set_max_introspections(cls, limit: int) -> None:
+        """Change the concurrent introspection limit at runtime.
 
-        return False
+        Args:
+            limit: New maximum number of concurrent introspections (>= 1)
+        """
+        condition = cls._get_slot_condition()
+        async with condition:
+            cls.MAX_CONCURRENT_INTROSPECTIONS = max(1, limit)
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def _introspection_slot(self) -> AsyncGenerator[None, None]:
+        """Hold one of the shared introspection slots for the duration of the block."""
+        condition = self._get_slot_condition()
+        cls = type(self)
+        async with condition:
+            await condition.wait_for(lambda: cls._slots_in_use < cls.MAX_CONCURRENT_INTROSPECTIONS)
+            cls._slots_in_use += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                cls._slots_in_use -= 1
+                condition.notify(1)
 
     async def _introspect_mcp_server(self, url: str) -> Optional[Dict[str, Any]]:
         """Perform MCP introspection via SSE connection.
 
+        At most MAX_CONCURRENT_INTROSPECTIONS run at once across all
+        harvesters; additional calls wait for a free slot.
+
         This method:
         1. Connects to SSE endpoint
-        2. Performs MCP initialization handshake
-        3. Requests tools/list, resources/list, prompts/list
-        4. Collects responses
+        2. Sends initialize, tools/list, resources/list and prompts/list as a
+           single JSON-RPC 2.0 batch
+        3. Falls back to concurrent per-request POSTs if batching is not supported
+        4. Streams responses, stopping as soon as every reply has arrived
         5. Disconnects
 
         Args:
@@ -430,11 +644,14 @@ class HTTPHarvester(BaseHarvester):
             handle the protocol more comprehensively. For production use,
             consider using the official MCP Python SDK.
         """
-        try:
-            logger.debug(f"Attempting SSE connection to {url}")
+        async with self._introspection_slot():
+            try:
+                logger.debug(f"Attempting SSE connection to {url}")
+
+                # Reuse the pooled global client so repeated probes keep TLS sessions alive.
+                # Its lifecycle is owned by the harvester process, so it is not closed here.
+                client = get_client()
 
-            # Create a dedicated client for SSE with longer timeout
-            async with httpx.AsyncClient(timeout=self.SSE_TIMEOUT) as client:
                 # Initialize result
                 result = {
                     "serverInfo": {},
@@ -446,106 +663,38 @@ class HTTPHarvester(BaseHarvester):
                 # Attempt to connect via SSE and send initialization
                 # This is a simplified approach - real MCP requires JSON-RPC over SSE
                 try:
-                    # Send initialization request
-                    init_request = {
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "initialize",
-                        "params": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {},
-                            "clientInfo": {
-                                "name": "MCPS-Harvester",
-                                "version": "2.4.0",
-                            },
-                        },
-                    }
-
-                    # For HTTP endpoints, try POST with JSON-RPC
-                    logger.debug(f"Sending MCP initialize request to {url}")
-                    response = await client.post(
-                        url,
-                        json=init_request,
-                        headers={"Content-Type": "application/json"},
-                        timeout=self.INTROSPECTION_TIMEOUT,
-                    )
-
-                    if response.status_code == 200:
-                        init_result = response.json()
-                        logger.debug(f"Initialize response: {init_result}")
-
-                        # Extract server info
-                        if "result" in init_result:
-                            result["serverInfo"] = init_result["result"].get("serverInfo", {})
-
-                    # Request tools list
-                    tools_request = {
-                        "jsonrpc": "2.0",
-                        "id": 2,
-                        "method": "tools/list",
-                        "params": {},
-                    }
-
-                    logger.debug("Requesting tools/list")
-                    tools_response = await client.post(
-                        url,
-                        json=tools_request,
-                        headers={"Content-Type": "application/json"},
-                        timeout=self.INTROSPECTION_TIMEOUT,
-                    )
-
-                    if tools_response.status_code == 200:
-                        tools_result = tools_response.json()
-                        if "result" in tools_result and "tools" in tools_result["result"]:
-                            result["tools"] = tools_result["result"]["tools"]
-                            logger.debug(f"Found {len(result['tools'])} tools")
-
-                    # Request resources list
-                    resources_request = {
-                        "jsonrpc": "2.0",
-                        "id": 3,
-                        "method": "resources/list",
-                        "params": {},
-                    }
-
-                    logger.debug("Requesting resources/list")
-                    resources_response = await client.post(
-                        url,
-                        json=resources_request,
-                        headers={"Content-Type": "application/json"},
-                        timeout=self.INTROSPECTION_TIMEOUT,
-                    )
-
-                    if resources_response.status_code == 200:
-                        resources_result = resources_response.json()
-                        if (
-                            "result" in resources_result
-                            and "resources" in resources_result["result"]
-                        ):
-                            result["resources"] = resources_result["result"]["resources"]
-                            logger.debug(f"Found {len(result['resources'])} resources")
-
-                    # Request prompts list
-                    prompts_request = {
-                        "jsonrpc": "2.0",
-                        "id": 4,
-                        "method": "prompts/list",
-                        "params": {},
-                    }
-
-                    logger.debug("Requesting prompts/list")
-                    prompts_response = await client.post(
-                        url,
-                        json=prompts_request,
-                        headers={"Content-Type": "application/json"},
-                        timeout=self.INTROSPECTION_TIMEOUT,
-                    )
-
-                    if prompts_response.status_code == 200:
-                        prompts_result = prompts_response.json()
-                        if "result" in prompts_result and "prompts" in prompts_result["result"]:
-                            result["prompts"] = prompts_result["result"]["prompts"]
-                            logger.debug(f"Found {len(result['prompts'])} prompts")
+                    # Send all introspection requests as one JSON-RPC batch
+                    logger.debug(f"Sending batched MCP introspection request to {url}")
+                    try:
+                        replies = await self._post_rpc(
+                            client,
+                            url,
+                            self.INTROSPECTION_REQUESTS,
+                            self.INTROSPECTION_BATCH_BODY,
+                        )
+                    except json.JSONDecodeError:
+                        replies = None
+
+                    if isinstance(replies, list):
+                        for reply in replies:
+                            self._apply_rpc_reply(result, reply)
+                    else:
+                        # Server rejected the batch (e.g. -32600 Invalid Request).
+                        # Send the requests concurrently; on HTTP/2 they share one connection.
+                        logger.debug(f"Batch not supported by {url}, sending requests individually")
+                        fallback_replies = await asyncio.gather(
+                            *(
+                                self._post_rpc(
+                                    client,
+                                    url,
+                                    rpc_request,
+                                    self.INTROSPECTION_REQUEST_BODIES[rpc_request["id"]],
+                                )
+                                for rpc_request in self.INTROSPECTION_REQUESTS
+                            )
+                        )
+                        for reply in fallback_replies:
+                            self._apply_rpc_reply(result, reply)
 
                     logger.success(
                         f"Successfully introspected MCP server: "
@@ -565,13 +714,134 @@ class HTTPHarvester(BaseHarvester):
                     logger.warning(f"Invalid JSON response during introspection: {str(e)}")
                     return None
 
-        except Exception as e:
-            logger.warning(f"Failed to introspect MCP server {url}: {str(e)}")
-            return None
+            except Exception as e:
+                logger.warning(f"Failed to introspect MCP server {url}: {str(e)}")
+                return None
+
+    async def _post_rpc(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        payload: Any,
+        body: bytes,
+    ) -> Optional[Any]:
+        """POST a JSON-RPC request (or batch) and read the reply as it streams in.
+
+        Plain JSON bodies are decoded whole. ``text/event-stream`` bodies are
+        parsed frame by frame and the stream is closed as soon as every
+        expected ``id`` has been answered, rather than waiting for EOF.
+
+        Args:
+            client: HTTP client to send the request with
+            url: MCP endpoint URL
+            payload: A single JSON-RPC request object or a list of them
+            body: ``payload`` already encoded as JSON
+
+        Returns:
+            The decoded reply object, a list of reply objects for a batch, or
+            None if the server did not answer with HTTP 200. A batch that gets
+            back no matching replies returns the first message unchanged so the
+            caller can treat it as a rejection.
+
+        Raises:
+            json.JSONDecodeError: If a reply body or event frame is not JSON
+        """
+        is_batch = isinstance(payload, list)
+        pending = {request["id"] for request in payload} if is_batch else {payload["id"]}
+
+        async with client.stream(
+            "POST",
+            url,
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json, text/event-stream",
+            },
+            timeout=self.INTROSPECTION_TIMEOUT,
+        ) as response:
+            if response.status_code != 200:
+                return None
+
+            if not _is_event_stream(response.headers.get("content-type", "")):
+                return orjson.loads(await response.aread())
+
+            replies: List[Any] = []
+            data_lines: List[str] = []
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].removeprefix(" "))
+                    continue
+                if line or not data_lines:
+                    continue
+
+                # Blank line terminates an event frame
+                message = orjson.loads("\n".join(data_lines))
+                data_lines = []
+                for reply in message if isinstance(message, list) else [message]:
+                    replies.append(reply)
+                    if isinstance(reply, dict):
+                        pending.discard(reply.get("id"))
+                if not pending:
+                    break
+
+        if is_batch and len(pending) < len(payload):
+            return replies
+        return replies[0] if replies else None
+
+    def _apply_rpc_reply(self, result: Dict[str, Any], reply: Any) -> None:
+        """Store a single JSON-RPC reply in the introspection result.
+
+        Replies are matched to their request by ``id`` so batched responses
+        may arrive in any order. Error replies are ignored.
+
+        Args:
+            result: Introspection result being populated
+            reply: Decoded JSON-RPC response object
+        """
+        if not isinstance(reply, dict) or not isinstance(reply.get("result"), dict):
+            return
+
+        key = self.RPC_RESULT_KEYS.get(reply.get("id"))
+        if key == "serverInfo":
+            result["serverInfo"] = reply["result"].get("serverInfo", {})
+        elif key and key in reply["result"]:
+            result[key] = reply["result"][key]
+            logger.debug(f"Found {len(result[key])} {key}")
+
+    @staticmethod
+    def _pack_features(
+        is_https: bool,
+        has_tools: bool,
+        has_resources: bool,
+        has_prompts: bool,
+        introspection_success: bool,
+    ) -> int:
+        """Pack the scoring inputs into a 5-bit index into ``_FEATURE_TABLE``.
+
+        Args:
+            is_https: Whether endpoint uses HTTPS
+            has_tools: Whether tools are available
+            has_resources: Whether resources are available
+            has_prompts: Whether prompts are available
+            introspection_success: Whether introspection succeeded
 
-    def _determine_risk_level(self, is_https: bool, has_tools: bool) -> RiskLevel:
+        Returns:
+            Integer in range 0-31
+        """
+        return (
+            is_https << 4
+            | has_tools << 3
+            | has_resources << 2
+            | has_prompts << 1
+            | introspection_success
+        )
+
+    @staticmethod
+    def _determine_risk_level(is_https: bool, has_tools: bool) -> RiskLevel:
         """Determine risk level for HTTP endpoint.
 
+        Reference implementation used to build ``_FEATURE_TABLE``.
+
         Risk factors:
         - Non-HTTPS endpoints are HIGH risk (unencrypted)
         - Endpoints without tools are UNKNOWN
@@ -593,8 +863,8 @@ class HTTPHarvester(BaseHarvester):
         # HTTP endpoints always have moderate risk due to lack of source visibility
         return RiskLevel.MODERATE
 
+    @staticmethod
     def _calculate_health_score(
-        self,
         is_https: bool,
         has_tools: bool,
         has_resources: bool,
@@ -604,6 +874,7 @@ class HTTPHarvester(BaseHarvester):
         """Calculate health score for HTTP endpoint.
 
         HTTP endpoints have limited metadata, so scoring is basic.
+        Reference implementation used to build ``_FEATURE_TABLE``.
 
         Args:
             is_https: Whether endpoint uses HTTPS
@@ -629,3 +900,23 @@ class HTTPHarvester(BaseHarvester):
             score += 10
 
         return min(100, score)
+
+
+# (risk level, health score) for every feature combination, indexed by
+# HTTPHarvester._pack_features() and derived from the reference helpers
+_FEATURE_TABLE: Tuple[Tuple[RiskLevel, int], ...] = tuple(
+    (
+        HTTPHarvester._determine_risk_level(
+            is_https=bool(features & 0b10000),
+            has_tools=bool(features & 0b01000),
+        ),
+        HTTPHarvester._calculate_health_score(
+            is_https=bool(features & 0b10000),
+            has_tools=bool(features & 0b01000),
+            has_resources=bool(features & 0b00100),
+            has_prompts=bool(features & 0b00010),
+            introspection_success=bool(features & 0b00001),
+        ),
+    )
+    for features in range(32)
+)
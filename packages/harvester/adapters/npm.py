@@ -10,21 +10,31 @@ Based on:
 - TASKS.md Phase 2.3 (lines 240-251)
 """
 
-import json
+import asyncio
+import functools
+import heapq
+import io
 import math
+import queue
 import re
 import tarfile
-from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urlparse
-
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, TypedDict
+from urllib.parse import quote, urlparse
+
+import orjson
 from loguru import logger
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from packages.harvester.core.base_harvester import BaseHarvester, HarvesterError
 from packages.harvester.core.models import HostType, RiskLevel
+from packages.harvester.core.upsert import server_child_tables, upsert_server
 from packages.harvester.models.models import (
     Dependency,
     Prompt,
@@ -33,7 +43,269 @@ from packages.harvester.models.models import (
     Server,
     Tool,
 )
-from packages.harvester.utils.http_client import HTTPClientError, fetch_bytes, get_client
+from packages.harvester.settings import settings
+from packages.harvester.utils.http_client import HTTPClientError, get_client
+
+# ISA-L's zlib-compatible inflater is several times faster than stdlib zlib on
+# tarball data; it is optional, so fall back to zlib when it isn't installed
+try:
+    from isal import isal_zlib as _zlib
+except ImportError:
+    _zlib = zlib
+
+# Package name without a trailing @version (e.g. "@scope/pkg@1.0.0" -> "@scope/pkg")
+_NPM_NAME_RE = re.compile(r"(@[^/@]+/[^/@]+|[^/@]+)")
+
+# Package name in an npmjs.com URL path (e.g. "/package/@scope/pkg/v/1.0.0")
+_NPMJS_PACKAGE_PATH_RE = re.compile(r"/package/(@[^/@]+/[^/@]+|[^/@]+)")
+
+# GitHub "owner/repo" in any repository URL format package.json allows
+_GITHUB_REPO_RE = re.compile(
+    r"(?:git\+)?"
+    r"(?:github:|(?:https?|git|ssh)://(?:[^@/]+@)?(?:www\.)?github\.com/|git@github\.com:)?"
+    r"([\w.-]+/[\w.-]+?)(?:\.git)?(?:[/#?].*)?$"
+)
+
+
+def _log_point_thresholds(weight: int, cap: int) -> Tuple[int, ...]:
+    """Precompute the counts at which ``min(cap, int(log10(count) * weight))`` gains a point.
+
+    Each threshold is found with the exact scoring expression, so bisecting the
+    table reproduces the logarithmic formula without calling ``math.log10`` per score.
+    """
+    thresholds = []
+    for points in range(1, cap + 1):
+        count = max(1, math.ceil(10 ** (points / weight)) - 2)
+        while int(math.log10(count) * weight) < points:
+            count += 1
+        thresholds.append(count)
+    return tuple(thresholds)
+
+
+# Health score download contributions: 4 points per decade up to 20, 3 per decade up to 15
+_DOWNLOAD_POINT_THRESHOLDS = _log_point_thresholds(weight=4, cap=20)
+_WEEKLY_DOWNLOAD_POINT_THRESHOLDS = _log_point_thresholds(weight=3, cap=15)
+
+# devDependencies that indicate a test suite
+_TEST_FRAMEWORKS = frozenset(
+    {
+        "jest",
+        "mocha",
+        "vitest",
+        "ava",
+        "tape",
+        "jasmine",
+        "karma",
+        "@jest/core",
+        "@vitest/runner",
+    }
+)
+
+# package.json dependency sections and the Dependency.type they map to
+_NPM_DEPENDENCY_FIELDS = (
+    ("dependencies", "runtime"),
+    ("devDependencies", "dev"),
+    ("peerDependencies", "peer"),
+)
+
+# Package scopes published by the MCP organization
+_OFFICIAL_NPM_SCOPES = ("@modelcontextprotocol/",)
+
+# Dependencies that allow command execution
+_DANGEROUS_NPM_DEPS = frozenset({"child_process", "shelljs", "execa"})
+
+# Dependencies that allow filesystem access (only risky at runtime)
+_FILESYSTEM_NPM_DEPS = frozenset({"fs", "fs-extra", "node:fs"})
+
+
+class NPMFetchResult(TypedDict):
+    """Data handed from NPMHarvester.fetch() to NPMHarvester.parse().
+
+    A TypedDict keeps the BaseHarvester ``Dict[str, Any]`` contract while giving
+    type checkers the exact keys parse() relies on.
+    """
+
+    registry_data: Dict[str, Any]
+    package_json: Optional[Dict[str, Any]]
+    package_json_content: Optional[bytes]
+    package_name: str
+    latest_version: str
+
+
+# Conditional-GET cache entry:
+# (conditional request headers, packument, package.json bytes or None, wall-clock fetch time)
+_RegistryCacheEntry = Tuple[Dict[str, str], Dict[str, Any], Optional[bytes], float]
+
+# NUL-terminated tail of a tar header name field for a package.json member
+_PACKAGE_JSON_NAME = b"/package.json\x00"
+
+# Child tables replaced on every store
+_SERVER_CHILD_TABLES = server_child_tables(
+    (Tool, "tools"),
+    (ResourceTemplate, "resources"),
+    (Prompt, "prompts"),
+    (Dependency, "dependencies"),
+    (Release, "releases"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_npm_package_name(url: str) -> str:
+    """Cached implementation of NPMHarvester._normalize_package_name.
+
+    Retries and repeated batch runs normalize the same identifiers again, so
+    the result is memoized per input string.
+    """
+    # Remove npm:// protocol if present
+    if url.startswith("npm://"):
+        url = url[6:]
+
+    # Handle npmjs.com URLs
+    if "npmjs.com" in url:
+        # Handle @scope/package in URL (encoded as %40scope/package)
+        match = _NPMJS_PACKAGE_PATH_RE.search(urlparse(url).path.replace("%40", "@"))
+        if not match:
+            raise HarvesterError(f"Invalid NPM package URL: {url}")
+        return match.group(1)
+
+    # Remove version specifier if present (e.g., @scope/package@1.0.0 -> @scope/package)
+    # But preserve @scope prefix
+    match = _NPM_NAME_RE.match(url)
+    return match.group(1) if match else url
+
+
+def _object_entries(value: Any) -> List[Dict[str, Any]]:
+    """Return the JSON objects in an mcpServers list field, ignoring malformed entries."""
+    if not isinstance(value, list):
+        return []
+    return [entry for entry in value if isinstance(entry, dict)]
+
+
+class _ChunkStream(io.RawIOBase):
+    """Blocking file object fed with byte chunks from the event loop.
+
+    The download coroutine pushes chunks into the bounded ``chunks`` queue while
+    a worker thread reads them through ``tarfile``; ``None`` marks the end of the
+    stream. The reader closes the stream when it is done, which drains the queue
+    so a producer blocked on a full queue is released.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        # At least two slots: after the reader closed and drained the queue, one
+        # in-flight chunk plus the end marker must still fit without blocking
+        self.chunks: queue.Queue[Optional[bytes]] = queue.Queue(max(maxsize, 2))
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer and not self._eof:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer = chunk
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def feed(self, chunk: bytes) -> None:
+        """Queue a chunk, blocking while the queue is full; dropped once closed."""
+        if not self.closed:
+            self.chunks.put(chunk)
+
+    def close(self) -> None:
+        super().close()
+        while True:
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
+
+
+class _GzipReplayStream(io.RawIOBase):
+    """Uncompressed tarball stream resuming a partially consumed gzip download.
+
+    Replays the bytes already inflated by the package.json fast path, then keeps
+    inflating the rest of ``source`` with the same decompressor.
+    """
+
+    def __init__(
+        self, inflated: bytes, decompressor: Any, source: io.RawIOBase, read_size: int
+    ) -> None:
+        super().__init__()
+        self._pending = inflated
+        self._decompressor = decompressor
+        self._source = source
+        self._read_size = read_size
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending and not self._eof:
+            data = self._decompressor.unconsumed_tail or self._source.read(self._read_size)
+            if data:
+                self._pending = _inflate(self._decompressor, data, self._read_size)
+            else:
+                self._pending = self._decompressor.flush()
+                self._eof = True
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _inflate(decompressor: Any, data: bytes, max_length: int) -> bytes:
+    """Inflate at most ``max_length`` bytes, reporting corrupt input as a tar error."""
+    try:
+        return decompressor.decompress(data, max_length)
+    except _zlib.error as e:
+        raise tarfile.ReadError(f"invalid gzip stream: {e}") from e
+
+
+def _find_package_json(inflated: bytes) -> Optional[bytes]:
+    """Find the top-level package.json in the first inflated bytes of a tarball.
+
+    Candidate headers are located by searching for the member name and validated
+    (checksum, type, name) with ``TarInfo.frombuf``.
+
+    Returns:
+        The member content, or None if it isn't fully contained in ``inflated``
+    """
+    position = inflated.find(_PACKAGE_JSON_NAME)
+    while position != -1:
+        start = position - position % tarfile.BLOCKSIZE
+        try:
+            member = tarfile.TarInfo.frombuf(
+                bytes(inflated[start : start + tarfile.BLOCKSIZE]),
+                tarfile.ENCODING,
+                "surrogateescape",
+            )
+        except tarfile.HeaderError:
+            member = None
+
+        if (
+            member is not None
+            and member.isfile()
+            and member.name.endswith("/package.json")
+            and member.name.count("/") == 1
+        ):
+            data_start = start + tarfile.BLOCKSIZE
+            if data_start + member.size > len(inflated):
+                return None
+            return bytes(inflated[data_start : data_start + member.size])
+
+        position = inflated.find(_PACKAGE_JSON_NAME, position + 1)
+
+    return None
 
 
 class NPMHarvester(BaseHarvester):
@@ -41,7 +313,7 @@ class NPMHarvester(BaseHarvester):
 
     This harvester:
     - Fetches package metadata from NPM registry API
-    - Downloads .tgz tarball to memory (no disk I/O)
+    - Streams the .tgz tarball through gzip/tar extraction (no disk I/O)
     - Extracts package.json and searches for mcpServers configuration
     - Implements zip bomb protection (max 500MB uncompressed)
     - Handles @scoped/packages correctly
@@ -59,6 +331,37 @@ class NPMHarvester(BaseHarvester):
     # Security limit for zip bomb protection
     MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024  # 500MB
 
+    # Hard limit on the compressed tarball download
+    MAX_TARBALL_SIZE = 100 * 1024 * 1024  # 100MB
+
+    # Release history is built from the per-version publish times in the full
+    # packument's "time" map. Abbreviated "install-v1" packuments omit that map but
+    # are a fraction of the size, so they are requested when history is disabled.
+    FETCH_RELEASE_HISTORY = True
+    REGISTRY_ACCEPT = "application/json"
+    ABBREVIATED_REGISTRY_ACCEPT = (
+        "application/vnd.npm.install-v1+json; q=1.0, application/json; q=0.8"
+    )
+
+    # Read size for streamed tarballs (tarfile defaults to 10KiB records)
+    TAR_BUFFER_SIZE = 256 * 1024  # 256KiB, matches the download chunk size
+
+    # npm pack writes package.json near the start of the archive, so the first
+    # inflated bytes are scanned for its header before falling back to tarfile
+    PACKAGE_JSON_SCAN_WINDOW = 512 * 1024  # 512KiB
+
+    # Downloaded chunks buffered ahead of the extraction thread, bounding memory
+    # when the download outpaces decompression
+    STREAM_QUEUE_SIZE = 4
+
+    # Conditional-GET cache shared by all instances: registry URL ->
+    # (validator headers, registry data, package.json, fetch time). Entries younger
+    # than settings.cache_ttl_default are served without a request; least recently
+    # used entries are evicted beyond REGISTRY_CACHE_SIZE. Setting
+    # npm_metadata_cache_dir also persists entries between runs.
+    REGISTRY_CACHE_SIZE = 1024
+    _registry_cache: ClassVar[OrderedDict[str, _RegistryCacheEntry]] = OrderedDict()
+
     def __init__(self, session: AsyncSession):
         """Initialize NPM harvester with session.
 
@@ -91,47 +394,20 @@ class NPMHarvester(BaseHarvester):
             >>> _normalize_package_name("https://www.npmjs.com/package/simple-pkg")
             "simple-pkg"
         """
-        # Remove npm:// protocol if present
-        if url.startswith("npm://"):
-            url = url[6:]
-
-        # Handle npmjs.com URLs
-        if "npmjs.com" in url:
-            parsed = urlparse(url)
-            path_parts = [p for p in parsed.path.split("/") if p]
-            if "package" in path_parts:
-                pkg_idx = path_parts.index("package") + 1
-                if pkg_idx < len(path_parts):
-                    # Handle @scope/package in URL (encoded as %40scope/package)
-                    package_name = "/".join(path_parts[pkg_idx:])
-                    package_name = package_name.replace("%40", "@")
-                    return (
-                        package_name.split("@")[-1]
-                        if "@" in package_name and not package_name.startswith("@")
-                        else package_name
-                    )
-            raise HarvesterError(f"Invalid NPM package URL: {url}")
-
-        # Remove version specifier if present (e.g., @scope/package@1.0.0 -> @scope/package)
-        # But preserve @scope prefix
-        if url.startswith("@"):
-            # Scoped package
-            parts = url.split("@")
-            if len(parts) >= 3:  # @scope/package@version
-                return f"@{parts[1]}"
-            return url
-        else:
-            # Unscoped package
-            return url.split("@")[0]
+        return _normalize_npm_package_name(url)
 
-    async def fetch(self, url: str) -> Dict[str, Any]:
+    async def fetch(self, url: str) -> NPMFetchResult:
         """Fetch package data from NPM registry API.
 
         This method:
         1. Normalizes the package identifier
         2. Fetches registry metadata (versions, downloads, repository info)
-        3. Downloads the latest .tgz tarball to memory
-        4. Validates file size for zip bomb protection
+        3. Streams the latest .tgz tarball through gzip/tar extraction
+        4. Stops at package.json, enforcing the zip bomb size limit on the way
+
+        Packuments fetched earlier in the process are revalidated with
+        If-None-Match/If-Modified-Since; on 304 the cached registry data and
+        package.json are reused without downloading the tarball.
 
         Args:
             url: NPM package identifier or URL
@@ -139,8 +415,11 @@ class NPMHarvester(BaseHarvester):
         Returns:
             Dict containing:
                 - registry_data: Package metadata from NPM API
-                - tarball_content: Raw .tgz bytes
+                - package_json: Manifest embedded in the packument, when it already
+                  includes mcpServers (the tarball is then not downloaded)
+                - package_json_content: Raw package.json bytes from the tarball, otherwise
                 - package_name: Normalized package name
+                - latest_version: Version the tarball was taken from
 
         Raises:
             HarvesterError: If package not found or fetch fails
@@ -148,6 +427,8 @@ class NPMHarvester(BaseHarvester):
         package_name = self._normalize_package_name(url)
         logger.info(f"Fetching NPM package: {package_name}")
 
+        # Registry documents and tarballs are both served from registry.npmjs.org,
+        # so the pooled HTTP/2 client reuses one connection for the two requests
         client = get_client()
 
         try:
@@ -156,9 +437,41 @@ class NPMHarvester(BaseHarvester):
             registry_url = f"https://registry.npmjs.org/{package_name}"
             logger.debug(f"Fetching registry data from {registry_url}")
 
-            response = await client.get(registry_url)
+            # Serve a recently fetched packument as is, revalidate an older one
+            # instead of re-downloading it
+            cached = self._registry_cache.get(registry_url)
+            if cached is None and settings.npm_metadata_cache_dir is not None:
+                cached = await asyncio.to_thread(self._load_registry_entry, package_name)
+            if cached and time.time() - cached[3] < settings.cache_ttl_default:
+                logger.debug(f"Registry data for {package_name} is fresh, reusing cache")
+                self._remember_registry_entry(registry_url, cached)
+                return self._cached_fetch_result(package_name, cached)
+
+            # The abbreviated install-v1 packument is trimmed to name, modified,
+            # dist-tags and, per version, name/version/dist plus the dependency maps.
+            # Readme, description and repository also come from the tarball's
+            # package.json, but the publish times in "time" don't, so the full
+            # document is needed whenever release history is recorded.
+            headers = {
+                "Accept": (
+                    self.REGISTRY_ACCEPT
+                    if self.FETCH_RELEASE_HISTORY
+                    else self.ABBREVIATED_REGISTRY_ACCEPT
+                )
+            }
+            if cached:
+                headers.update(cached[0])
+
+            response = await client.get(registry_url, headers=headers)
+            if cached and response.status_code == 304:
+                # Unchanged since the last fetch, so the latest tarball is unchanged too
+                logger.debug(f"Registry data for {package_name} not modified, reusing cache")
+                cached = (*cached[:3], time.time())
+                await self._store_registry_entry(registry_url, package_name, cached)
+                return self._cached_fetch_result(package_name, cached)
+
             response.raise_for_status()
-            registry_data = response.json()
+            registry_data = orjson.loads(response.content)
 
             # Get latest version info
             latest_version = registry_data.get("dist-tags", {}).get("latest")
@@ -166,55 +479,343 @@ class NPMHarvester(BaseHarvester):
                 raise HarvesterError(f"No latest version found for {package_name}")
 
             version_data = registry_data.get("versions", {}).get(latest_version, {})
-            tarball_url = version_data.get("dist", {}).get("tarball")
 
-            if not tarball_url:
-                raise HarvesterError(f"No tarball URL found for {package_name}@{latest_version}")
+            # Full packuments embed each version's package.json; when it already
+            # carries the MCP configuration there is no need to download the tarball
+            if "mcpServers" in version_data:
+                await self._cache_registry_response(
+                    registry_url, package_name, response.headers, registry_data, None
+                )
+                logger.success(
+                    f"Successfully fetched {package_name}@{latest_version} "
+                    "(package.json from registry)"
+                )
+                return {
+                    "registry_data": registry_data,
+                    "package_json": version_data,
+                    "package_json_content": None,
+                    "package_name": package_name,
+                    "latest_version": latest_version,
+                }
+
+            # Published versions are immutable, so when the packument changed without
+            # a new latest version (a new dist-tag, a deprecation) the package.json
+            # extracted last time is still current
+            if (
+                cached
+                and cached[2] is not None
+                and cached[1]["dist-tags"]["latest"] == latest_version
+            ):
+                logger.debug(f"Reusing cached package.json for {package_name}@{latest_version}")
+                package_json_content = cached[2]
+            else:
+                tarball_url = version_data.get("dist", {}).get("tarball")
 
-            logger.debug(f"Downloading tarball from {tarball_url}")
+                if not tarball_url:
+                    raise HarvesterError(
+                        f"No tarball URL found for {package_name}@{latest_version}"
+                    )
 
-            # Download tarball to memory
-            tarball_content = await fetch_bytes(tarball_url)
+                logger.debug(f"Streaming tarball from {tarball_url}")
 
-            # Check size for zip bomb protection
-            if len(tarball_content) > self.MAX_UNCOMPRESSED_SIZE:
-                raise HarvesterError(
-                    f"Tarball too large ({len(tarball_content)} bytes), "
-                    f"possible zip bomb. Max size: {self.MAX_UNCOMPRESSED_SIZE}"
-                )
+                package_json_content = await self._stream_package_json(client, tarball_url)
+
+            if not package_json_content:
+                raise HarvesterError(f"No package.json found in {package_name} tarball")
+
+            await self._cache_registry_response(
+                registry_url, package_name, response.headers, registry_data, package_json_content
+            )
 
             logger.success(
                 f"Successfully fetched {package_name}@{latest_version} "
-                f"({len(tarball_content)} bytes)"
+                f"(package.json {len(package_json_content)} bytes)"
             )
 
             return {
                 "registry_data": registry_data,
-                "tarball_content": tarball_content,
+                "package_json": None,
+                "package_json_content": package_json_content,
                 "package_name": package_name,
                 "latest_version": latest_version,
             }
 
         except HTTPClientError as e:
             raise HarvesterError(f"Failed to fetch NPM package {package_name}: {str(e)}") from e
+        except tarfile.TarError as e:
+            raise HarvesterError(f"Failed to extract tarball: {str(e)}") from e
         except Exception as e:
             raise HarvesterError(
                 f"Unexpected error fetching NPM package {package_name}: {str(e)}"
             ) from e
 
-    async def parse(self, data: Dict[str, Any]) -> Server:
+    async def _cache_registry_response(
+        self,
+        registry_url: str,
+        package_name: str,
+        response_headers: Any,
+        registry_data: Dict[str, Any],
+        package_json_content: Optional[bytes],
+    ) -> None:
+        """Remember a packument and its package.json for conditional re-fetches.
+
+        Only responses carrying an ETag or Last-Modified validator are cached.
+
+        Args:
+            registry_url: Registry URL the packument was fetched from
+            package_name: Normalized package name
+            response_headers: Headers of the registry response
+            registry_data: Decoded packument
+            package_json_content: package.json extracted from the latest tarball, or
+                None when the packument's own manifest was used
+        """
+        validators = {}
+        if "etag" in response_headers:
+            validators["If-None-Match"] = response_headers["etag"]
+        if "last-modified" in response_headers:
+            validators["If-Modified-Since"] = response_headers["last-modified"]
+        if not validators:
+            return
+
+        await self._store_registry_entry(
+            registry_url,
+            package_name,
+            (validators, registry_data, package_json_content, time.time()),
+        )
+
+    def _cached_fetch_result(self, package_name: str, entry: _RegistryCacheEntry) -> NPMFetchResult:
+        """Build a fetch result from a cached registry entry."""
+        _, registry_data, package_json_content, _ = entry
+        latest_version = registry_data["dist-tags"]["latest"]
+        return {
+            "registry_data": registry_data,
+            "package_json": (
+                registry_data["versions"][latest_version] if package_json_content is None else None
+            ),
+            "package_json_content": package_json_content,
+            "package_name": package_name,
+            "latest_version": latest_version,
+        }
+
+    def _remember_registry_entry(self, registry_url: str, entry: _RegistryCacheEntry) -> None:
+        """Insert or refresh an entry in the in-memory LRU registry cache."""
+        self._registry_cache[registry_url] = entry
+        self._registry_cache.move_to_end(registry_url)
+        while len(self._registry_cache) > self.REGISTRY_CACHE_SIZE:
+            self._registry_cache.popitem(last=False)
+
+    async def _store_registry_entry(
+        self, registry_url: str, package_name: str, entry: _RegistryCacheEntry
+    ) -> None:
+        """Cache a registry entry in memory and, when configured, on disk."""
+        self._remember_registry_entry(registry_url, entry)
+        if settings.npm_metadata_cache_dir is not None:
+            await asyncio.to_thread(self._persist_registry_entry, package_name, entry)
+
+    @staticmethod
+    def _registry_entry_path(package_name: str) -> Optional[Path]:
+        """Location of a package's persisted registry entry, if persistence is enabled."""
+        cache_dir = settings.npm_metadata_cache_dir
+        if cache_dir is None:
+            return None
+        # Scoped names contain "/", so quote them into a single file name
+        return cache_dir / f"{quote(package_name, safe='')}.json"
+
+    def _persist_registry_entry(self, package_name: str, entry: _RegistryCacheEntry) -> None:
+        """Write a registry entry to the metadata cache directory.
+
+        Failures are logged and ignored; the on-disk cache is only an optimization.
+        """
+        path = self._registry_entry_path(package_name)
+        if path is None:
+            return
+        validators, registry_data, package_json_content, fetched_at = entry
+        try:
+            document = orjson.dumps(
+                {
+                    "validators": validators,
+                    "fetched_at": fetched_at,
+                    "registry_data": registry_data,
+                    "package_json": (
+                        None if package_json_content is None else package_json_content.decode()
+                    ),
+                }
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(document)
+            tmp_path.replace(path)
+        except (OSError, TypeError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not persist registry data for {package_name}: {e}")
+
+    def _load_registry_entry(self, package_name: str) -> Optional[_RegistryCacheEntry]:
+        """Read a persisted registry entry, or None if absent or unreadable."""
+        path = self._registry_entry_path(package_name)
+        if path is None:
+            return None
+        try:
+            document = orjson.loads(path.read_bytes())
+            package_json = document["package_json"]
+            return (
+                document["validators"],
+                document["registry_data"],
+                None if package_json is None else package_json.encode(),
+                document["fetched_at"],
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable registry cache for {package_name}: {e}")
+            return None
+
+    async def _stream_package_json(self, client: Any, tarball_url: str) -> Optional[bytes]:
+        """Download a tarball and extract package.json while it streams in.
+
+        Decompression and tar walking run in a worker thread that reads from a
+        bounded queue fed by the HTTP response, so extraction overlaps the download
+        and at most STREAM_QUEUE_SIZE chunks are held in memory. The download is
+        abandoned as soon as package.json has been read.
+
+        Args:
+            client: Shared HTTP client
+            tarball_url: URL of the package .tgz
+
+        Returns:
+            Raw package.json content, or None if the archive has none
+
+        Raises:
+            HarvesterError: If the download exceeds MAX_TARBALL_SIZE
+        """
+        stream = _ChunkStream(self.STREAM_QUEUE_SIZE)
+
+        def extract() -> Optional[bytes]:
+            with stream:
+                return self._extract_package_json(stream)
+
+        extraction = asyncio.create_task(asyncio.to_thread(extract))
+
+        try:
+            try:
+                async with client.stream("GET", tarball_url) as response:
+                    response.raise_for_status()
+                    content_length = response.headers.get("content-length")
+                    if content_length and int(content_length) > self.MAX_TARBALL_SIZE:
+                        raise HarvesterError(
+                            f"Tarball size {content_length} bytes exceeds limit "
+                            f"of {self.MAX_TARBALL_SIZE} bytes"
+                        )
+
+                    received = 0
+                    async for chunk in response.aiter_bytes(chunk_size=self.TAR_BUFFER_SIZE):
+                        if extraction.done():
+                            break
+                        # Content-Length may be absent or wrong, so count the bytes too
+                        received += len(chunk)
+                        if received > self.MAX_TARBALL_SIZE:
+                            raise HarvesterError(
+                                f"Tarball exceeds limit of {self.MAX_TARBALL_SIZE} bytes"
+                            )
+                        # Wait for queue space off the event loop
+                        await asyncio.to_thread(stream.feed, chunk)
+            finally:
+                # Always end the stream, also when the download is cancelled: otherwise
+                # the reader thread blocks on the queue forever and executor shutdown hangs.
+                # This can't deadlock: a live reader frees a slot and a closed one
+                # drained the queue
+                stream.chunks.put(None)
+        except Exception:
+            # Let the reader finish before surfacing the download error
+            await asyncio.gather(extraction, return_exceptions=True)
+            raise
+
+        return await extraction
+
+    def _extract_package_json(self, stream: _ChunkStream) -> Optional[bytes]:
+        """Return the package.json of a streamed .tgz.
+
+        The first PACKAGE_JSON_SCAN_WINDOW inflated bytes are searched for the
+        package.json header directly. If it isn't there, the archive is walked
+        sequentially with tarfile, continuing from the bytes already inflated.
+
+        Args:
+            stream: File object yielding the compressed tarball bytes
+
+        Returns:
+            Raw package.json content, or None if no member matched
+
+        Raises:
+            HarvesterError: If the cumulative uncompressed size exceeds the limit
+        """
+        # Never scan past the zip bomb limit; anything beyond it goes through the
+        # member-by-member size accounting below
+        scan_window = min(self.PACKAGE_JSON_SCAN_WINDOW, self.MAX_UNCOMPRESSED_SIZE)
+        decompressor = _zlib.decompressobj(wbits=_zlib.MAX_WBITS | 16)  # gzip container
+        inflated = bytearray()
+        while len(inflated) < scan_window:
+            data = decompressor.unconsumed_tail or stream.read(self.TAR_BUFFER_SIZE)
+            if not data:
+                break
+            inflated += _inflate(decompressor, data, scan_window - len(inflated))
+
+        package_json = _find_package_json(inflated)
+        if package_json is not None:
+            return package_json
+
+        total_uncompressed = 0
+        replay = _GzipReplayStream(bytes(inflated), decompressor, stream, self.TAR_BUFFER_SIZE)
+
+        with tarfile.open(fileobj=replay, mode="r|", bufsize=self.TAR_BUFFER_SIZE) as tar:
+            for member in tar:
+                # Only regular files carry data; directories, symlinks and hard links
+                # are never read, so they can't be used to escape or alias a path
+                if not member.isfile():
+                    continue
+
+                # Zip bomb protection: check cumulative uncompressed size
+                total_uncompressed += member.size
+                if total_uncompressed > self.MAX_UNCOMPRESSED_SIZE:
+                    raise HarvesterError(
+                        f"Uncompressed size exceeds {self.MAX_UNCOMPRESSED_SIZE} bytes, "
+                        "possible zip bomb"
+                    )
+
+                # Extract the top-level package.json (package/package.json), skipping
+                # nested ones such as test fixtures or bundled dependencies
+                if member.name.endswith("/package.json") and member.name.count("/") == 1:
+                    return tar.extractfile(member).read()
+
+        return None
+
+    async def parse(self, data: NPMFetchResult) -> Server:
         """Parse NPM package data into Server model.
 
         This method:
-        - Extracts .tgz to memory using tarfile
-        - Parses package.json for metadata and dependencies
+        - Parses package.json (extracted during fetch) for metadata and dependencies
         - Searches for MCP configuration in mcpServers field
         - Attempts to link to GitHub repository
         - Calculates health score from download metrics
         - Determines risk level from dependencies
 
         Args:
-            data: Raw data from fetch() containing registry_data and tarball_content
+            data: Raw data from fetch() containing registry_data and either package_json
+                or package_json_content
+
+        Returns:
+            Populated Server model with all related entities
+
+        Raises:
+            HarvesterError: If required data is missing or malformed
+        """
+        # JSON decoding and entity construction are CPU-bound; keep them off the
+        # event loop so concurrent harvests can keep downloading meanwhile
+        return await asyncio.to_thread(self._parse_sync, data)
+
+    def _parse_sync(self, data: NPMFetchResult) -> Server:
+        """Blocking implementation of parse(), run in a worker thread.
+
+        Args:
+            data: Raw data from fetch()
 
         Returns:
             Populated Server model with all related entities
@@ -224,40 +825,15 @@ class NPMHarvester(BaseHarvester):
         """
         try:
             registry_data = data["registry_data"]
-            tarball_content = data["tarball_content"]
             package_name = data["package_name"]
             latest_version = data["latest_version"]
 
             logger.info(f"Parsing NPM package: {package_name}@{latest_version}")
 
-            # Extract tarball in memory
-            package_json_content = None
-            total_uncompressed = 0
-
-            with tarfile.open(fileobj=BytesIO(tarball_content), mode="r:gz") as tar:
-                for member in tar.getmembers():
-                    # Zip bomb protection: check cumulative uncompressed size
-                    total_uncompressed += member.size
-                    if total_uncompressed > self.MAX_UNCOMPRESSED_SIZE:
-                        raise HarvesterError(
-                            f"Uncompressed size exceeds {self.MAX_UNCOMPRESSED_SIZE} bytes, "
-                            "possible zip bomb"
-                        )
-
-                    # Extract package.json (usually at package/package.json)
-                    if member.name.endswith("package.json"):
-                        file_obj = tar.extractfile(member)
-                        if file_obj:
-                            package_json_content = file_obj.read().decode("utf-8")
-                            break
-
-            if not package_json_content:
-                raise HarvesterError(f"No package.json found in {package_name} tarball")
-
-            logger.debug(f"Extracted package.json from tarball ({len(package_json_content)} bytes)")
-
-            # Parse package.json
-            package_json = json.loads(package_json_content)
+            # Use the manifest embedded in the packument, or parse the tarball's package.json
+            package_json = data["package_json"]
+            if package_json is None:
+                package_json = orjson.loads(data["package_json_content"])
 
             # Extract basic metadata
             name = package_json.get("name", package_name)
@@ -284,6 +860,9 @@ class NPMHarvester(BaseHarvester):
             # Construct primary URL as npm:// protocol
             primary_url = f"npm://{package_name}"
 
+            # Single harvest timestamp, stored as naive UTC to match the schema
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+
             # Create base Server entity
             server = Server(
                 name=name,
@@ -295,7 +874,7 @@ class NPMHarvester(BaseHarvester):
                 license=license_name,
                 keywords=keywords if isinstance(keywords, list) else [],
                 downloads=downloads,
-                last_indexed_at=datetime.utcnow(),
+                last_indexed_at=now,
             )
 
             # Parse MCP configuration from mcpServers field
@@ -309,7 +888,7 @@ class NPMHarvester(BaseHarvester):
             self._parse_npm_dependencies(server, package_json)
 
             # Extract version history as releases
-            self._parse_version_history(server, registry_data)
+            self._parse_version_history(server, registry_data, now)
 
             # Calculate health score
             server.health_score = self._calculate_health_score(
@@ -340,10 +919,8 @@ class NPMHarvester(BaseHarvester):
 
             return server
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise HarvesterError(f"Invalid package.json format: {str(e)}") from e
-        except tarfile.TarError as e:
-            raise HarvesterError(f"Failed to extract tarball: {str(e)}") from e
         except Exception as e:
             raise HarvesterError(f"Failed to parse NPM package data: {str(e)}") from e
 
@@ -351,9 +928,8 @@ class NPMHarvester(BaseHarvester):
         """Persist server and related entities to database.
 
         This method:
-        - Checks for existing server by primary_url (upsert logic)
-        - Updates existing or creates new server
-        - Cascades to all related entities (tools, dependencies, etc.)
+        - Upserts the server row with a single INSERT ... ON CONFLICT (primary_url)
+        - Replaces related entities with one bulk DELETE and INSERT per table
         - Commits transaction
 
         Args:
@@ -364,65 +940,8 @@ class NPMHarvester(BaseHarvester):
             HarvesterError: If storage operation fails
         """
         try:
-            # Check if server already exists
-            statement = select(Server).where(Server.primary_url == server.primary_url)
-            result = await session.execute(statement)
-            existing_server = result.scalar_one_or_none()
-
-            if existing_server:
-                logger.info(f"Updating existing NPM server: {server.name}")
-
-                # Update scalar fields
-                existing_server.name = server.name
-                existing_server.description = server.description
-                existing_server.author_name = server.author_name
-                existing_server.homepage = server.homepage
-                existing_server.license = server.license
-                existing_server.readme_content = server.readme_content
-                existing_server.keywords = server.keywords
-                existing_server.categories = server.categories
-                existing_server.stars = server.stars
-                existing_server.downloads = server.downloads
-                existing_server.forks = server.forks
-                existing_server.open_issues = server.open_issues
-                existing_server.risk_level = server.risk_level
-                existing_server.verified_source = server.verified_source
-                existing_server.health_score = server.health_score
-                existing_server.last_indexed_at = server.last_indexed_at
-                existing_server.updated_at = datetime.utcnow()
-
-                # Clear and replace related entities
-                existing_server.tools.clear()
-                existing_server.resources.clear()
-                existing_server.prompts.clear()
-                existing_server.dependencies.clear()
-                existing_server.releases.clear()
-
-                # Add new related entities
-                for tool in server.tools:
-                    tool.server_id = existing_server.id
-                    existing_server.tools.append(tool)
-
-                for resource in server.resources:
-                    resource.server_id = existing_server.id
-                    existing_server.resources.append(resource)
-
-                for prompt in server.prompts:
-                    prompt.server_id = existing_server.id
-                    existing_server.prompts.append(prompt)
-
-                for dependency in server.dependencies:
-                    dependency.server_id = existing_server.id
-                    existing_server.dependencies.append(dependency)
-
-                for release in server.releases:
-                    release.server_id = existing_server.id
-                    existing_server.releases.append(release)
-
-                session.add(existing_server)
-            else:
-                logger.info(f"Creating new NPM server: {server.name}")
-                session.add(server)
+            server.updated_at = server.last_indexed_at
+            await upsert_server(session, server, _SERVER_CHILD_TABLES)
 
             await session.commit()
             logger.success(f"Successfully stored NPM server: {server.name}")
@@ -450,43 +969,21 @@ class NPMHarvester(BaseHarvester):
             >>> _extract_github_url({"type": "git", "url": "git+https://github.com/user/repo.git"})
             "https://github.com/user/repo"
         """
-        if not repository:
-            return None
-
-        url = None
-
         # Handle object format
         if isinstance(repository, dict):
-            url = repository.get("url", "")
+            url = repository.get("url")
         # Handle string format
         elif isinstance(repository, str):
             url = repository
         else:
             return None
 
-        # Normalize URL
-        if not url:
+        if not url or not isinstance(url, str):
             return None
 
-        # Remove git+ prefix
-        url = url.replace("git+", "")
-
-        # Remove .git suffix
-        url = url.replace(".git", "")
-
-        # Handle github: shorthand
-        if url.startswith("github:"):
-            url = f"https://github.com/{url[7:]}"
-
-        # Handle user/repo shorthand
-        if "/" in url and not url.startswith("http"):
-            url = f"https://github.com/{url}"
-
-        # Validate it's a GitHub URL
-        if "github.com" in url:
-            return url
-
-        return None
+        # One pass over git+/github:/git@/ssh:// prefixes, shorthands and .git suffixes
+        match = _GITHUB_REPO_RE.match(url)
+        return f"https://github.com/{match.group(1)}" if match else None
 
     def _get_download_count(self, registry_data: Dict[str, Any]) -> int:
         """Extract download count from registry data.
@@ -521,41 +1018,44 @@ class NPMHarvester(BaseHarvester):
         try:
             # The mcpServers can contain multiple server definitions
             # For now, we'll merge all tools/resources/prompts from all servers
+            configs = [config for config in mcp_servers.values() if isinstance(config, dict)]
+
+            # Collect entities per kind and attach them in one extend per relationship.
+            # Entries that aren't objects are skipped instead of aborting the whole parse.
+            # Fields are read with dict.get: operator.itemgetter has no defaults, and
+            # merging a defaults dict into every entry first measured slower.
+            tools = [
+                Tool(
+                    name=tool_data.get("name", ""),
+                    description=tool_data.get("description"),
+                    input_schema=tool_data.get("inputSchema", {}),
+                )
+                for config in configs
+                for tool_data in _object_entries(config.get("tools"))
+            ]
+            resources = [
+                ResourceTemplate(
+                    uri_template=resource_data.get("uriTemplate", ""),
+                    name=resource_data.get("name"),
+                    mime_type=resource_data.get("mimeType"),
+                    description=resource_data.get("description"),
+                )
+                for config in configs
+                for resource_data in _object_entries(config.get("resources"))
+            ]
+            prompts = [
+                Prompt(
+                    name=prompt_data.get("name", ""),
+                    description=prompt_data.get("description"),
+                    arguments=prompt_data.get("arguments", []),
+                )
+                for config in configs
+                for prompt_data in _object_entries(config.get("prompts"))
+            ]
 
-            for server_key, server_config in mcp_servers.items():
-                if not isinstance(server_config, dict):
-                    continue
-
-                # Extract tools
-                tools = server_config.get("tools", [])
-                for tool_data in tools:
-                    tool = Tool(
-                        name=tool_data.get("name", ""),
-                        description=tool_data.get("description"),
-                        input_schema=tool_data.get("inputSchema", {}),
-                    )
-                    server.tools.append(tool)
-
-                # Extract resources
-                resources = server_config.get("resources", [])
-                for resource_data in resources:
-                    resource = ResourceTemplate(
-                        uri_template=resource_data.get("uriTemplate", ""),
-                        name=resource_data.get("name"),
-                        mime_type=resource_data.get("mimeType"),
-                        description=resource_data.get("description"),
-                    )
-                    server.resources.append(resource)
-
-                # Extract prompts
-                prompts = server_config.get("prompts", [])
-                for prompt_data in prompts:
-                    prompt = Prompt(
-                        name=prompt_data.get("name", ""),
-                        description=prompt_data.get("description"),
-                        arguments=prompt_data.get("arguments", []),
-                    )
-                    server.prompts.append(prompt)
+            server.tools.extend(tools)
+            server.resources.extend(resources)
+            server.prompts.extend(prompts)
 
             logger.debug(
                 f"Parsed mcpServers: {len(server.tools)} tools, "
@@ -577,52 +1077,39 @@ class NPMHarvester(BaseHarvester):
         Updates server.dependencies in place.
         """
         try:
-            # Runtime dependencies
-            dependencies = package_json.get("dependencies", {})
-            for lib_name, version_constraint in dependencies.items():
-                dep = Dependency(
-                    library_name=lib_name,
-                    version_constraint=version_constraint,
-                    ecosystem="npm",
-                    type="runtime",
-                )
-                server.dependencies.append(dep)
-
-            # Dev dependencies
-            dev_dependencies = package_json.get("devDependencies", {})
-            for lib_name, version_constraint in dev_dependencies.items():
-                dep = Dependency(
+            # Build every record in one pass and attach them with a single extend;
+            # sections that aren't objects are skipped
+            dependencies = [
+                Dependency(
                     library_name=lib_name,
                     version_constraint=version_constraint,
                     ecosystem="npm",
-                    type="dev",
+                    type=dependency_type,
                 )
-                server.dependencies.append(dep)
-
-            # Peer dependencies
-            peer_dependencies = package_json.get("peerDependencies", {})
-            for lib_name, version_constraint in peer_dependencies.items():
-                dep = Dependency(
-                    library_name=lib_name,
-                    version_constraint=version_constraint,
-                    ecosystem="npm",
-                    type="peer",
-                )
-                server.dependencies.append(dep)
+                for field, dependency_type in _NPM_DEPENDENCY_FIELDS
+                if isinstance(section := package_json.get(field), dict)
+                for lib_name, version_constraint in section.items()
+            ]
+            server.dependencies.extend(dependencies)
 
             logger.debug(f"Parsed {len(server.dependencies)} NPM dependencies")
 
         except Exception as e:
             logger.warning(f"Error parsing NPM dependencies: {str(e)}")
 
-    def _parse_version_history(self, server: Server, registry_data: Dict[str, Any]) -> None:
+    def _parse_version_history(
+        self, server: Server, registry_data: Dict[str, Any], now: datetime
+    ) -> None:
         """Parse version history into Release entities.
 
-        Extracts the 5 most recent releases from the registry data.
+        Extracts the 5 most recent releases from the registry data. Abbreviated
+        packuments lack the ``time`` map and yield no releases, since their publish
+        dates are unknown.
 
         Args:
             server: Server instance to populate
             registry_data: Package metadata from NPM registry
+            now: Harvest timestamp, used when a publish time can't be parsed
 
         Updates server.releases in place.
         """
@@ -630,26 +1117,28 @@ class NPMHarvester(BaseHarvester):
             versions = registry_data.get("versions", {})
             time_data = registry_data.get("time", {})
 
-            # Sort versions by publish time (most recent first)
-            sorted_versions = sorted(
-                [
-                    (version, time_data.get(version))
-                    for version in versions.keys()
-                    if version in time_data and version != "created" and version != "modified"
-                ],
-                key=lambda x: x[1] if x[1] else "",
-                reverse=True,
+            # Select the 5 most recent versions by publish time without sorting
+            # the full history (ISO timestamps order correctly as strings)
+            sorted_versions = heapq.nlargest(
+                5,
+                (
+                    (version, published_at_str)
+                    for version, published_at_str in time_data.items()
+                    if published_at_str and version in versions
+                ),
+                key=itemgetter(1),
             )
 
-            # Take top 5 most recent
-            for version, published_at_str in sorted_versions[:5]:
+            for version, published_at_str in sorted_versions:
                 if published_at_str:
                     try:
-                        published_at = datetime.fromisoformat(
-                            published_at_str.replace("Z", "+00:00")
-                        )
+                        published_at = datetime.fromisoformat(published_at_str)
+                        if published_at.tzinfo is not None:
+                            published_at = published_at.astimezone(timezone.utc).replace(
+                                tzinfo=None
+                            )
                     except Exception:
-                        published_at = datetime.utcnow()
+                        published_at = now
 
                     release = Release(
                         version=version.lstrip("v"),
@@ -700,12 +1189,10 @@ class NPMHarvester(BaseHarvester):
         score = 15  # Base score
 
         # Downloads contribution (0-20 points, logarithmic)
-        if downloads > 0:
-            score += min(20, int(math.log10(downloads + 1) * 4))
+        score += bisect_right(_DOWNLOAD_POINT_THRESHOLDS, downloads + 1)
 
         # Weekly downloads contribution (0-15 points, logarithmic)
-        if weekly_downloads > 0:
-            score += min(15, int(math.log10(weekly_downloads + 1) * 3))
+        score += bisect_right(_WEEKLY_DOWNLOAD_POINT_THRESHOLDS, weekly_downloads + 1)
 
         # Documentation
         if has_readme:
@@ -742,15 +1229,10 @@ class NPMHarvester(BaseHarvester):
         Returns:
             True if test indicators are found
         """
-        # Check for test script
-        scripts = package_json.get("scripts", {})
-        if "test" in scripts:
-            return True
-
-        # Check for test frameworks in devDependencies
-        dev_deps = package_json.get("devDependencies", {})
-        test_frameworks = ["jest", "mocha", "vitest", "ava", "tape", "jasmine", "karma"]
-        return any(framework in dev_deps for framework in test_frameworks)
+        # Check for test script, then test frameworks in devDependencies
+        return "test" in package_json.get("scripts", {}) or not _TEST_FRAMEWORKS.isdisjoint(
+            package_json.get("devDependencies", {})
+        )
 
     def _determine_risk_level(
         self, is_official: bool, has_dangerous_deps: bool, has_repository: bool
@@ -790,9 +1272,9 @@ class NPMHarvester(BaseHarvester):
             package_name: NPM package name
 
         Returns:
-            True if from @modelcontextprotocol scope
+            True if from an official scope such as @modelcontextprotocol
         """
-        return package_name.startswith("@modelcontextprotocol/")
+        return package_name.startswith(_OFFICIAL_NPM_SCOPES)
 
     def _has_dangerous_dependencies(self, dependencies: List[Dependency]) -> bool:
         """Check if dependencies include potentially dangerous packages.
@@ -808,24 +1290,12 @@ class NPMHarvester(BaseHarvester):
         - shelljs, execa (shell execution)
         - fs, fs-extra (filesystem access - runtime only)
         """
-        dangerous_npm = {
-            "child_process",
-            "shelljs",
-            "execa",
-        }
-
-        # Filesystem deps are only dangerous if runtime (not dev)
-        fs_deps = {"fs", "fs-extra", "node:fs"}
-
-        for dep in dependencies:
-            lib_name = dep.library_name.lower()
-
-            # Check for dangerous execution deps
-            if dep.ecosystem == "npm" and lib_name in dangerous_npm:
-                return True
-
-            # Check for filesystem deps (only runtime)
-            if dep.ecosystem == "npm" and dep.type == "runtime" and lib_name in fs_deps:
-                return True
-
-        return False
+        # Execution deps are always dangerous; filesystem deps only at runtime (not dev)
+        return any(
+            dep.ecosystem == "npm"
+            and (
+                (lib_name := dep.library_name.lower()) in _DANGEROUS_NPM_DEPS
+                or (dep.type == "runtime" and lib_name in _FILESYSTEM_NPM_DEPS)
+            )
+            for dep in dependencies
+        )
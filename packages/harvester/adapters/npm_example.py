@@ -9,59 +9,76 @@ Usage:
 
 import asyncio
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from packages.harvester.adapters.npm import NPMHarvester
+from packages.harvester.utils import close_client
 
+# uvloop (installed with uvicorn[standard]) runs the event loop on libuv
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
-async def example_harvest_npm_package():
-    """Example: Harvest an MCP server from NPM."""
 
-    # Create async database engine (in-memory for example)
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+def create_example_engine() -> AsyncEngine:
+    """Create an in-memory database engine shared by all examples.
 
-    # Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    In-memory SQLite lives only as long as its connection, so StaticPool keeps
+    a single connection open and every session sees the same database.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
-    # Create session
-    async with AsyncSession(engine) as session:
-        # Initialize harvester
-        harvester = NPMHarvester(session)
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+        # WAL does not apply to in-memory databases
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")  # 64MB
+        cursor.close()
 
-        # Example 1: Harvest official MCP package
-        print("Harvesting @modelcontextprotocol/server-filesystem...")
-        server1 = await harvester.harvest("@modelcontextprotocol/server-filesystem")
-        if server1:
-            print(f"✓ Harvested: {server1.name}")
-            print(f"  - Primary URL: {server1.primary_url}")
-            print(f"  - Host Type: {server1.host_type}")
-            print(f"  - Tools: {len(server1.tools)}")
-            print(f"  - Health Score: {server1.health_score}")
-            print(f"  - Risk Level: {server1.risk_level}")
+    return engine
 
-        # Example 2: Harvest with different URL formats
-        print("\nHarvesting with npm:// protocol...")
-        server2 = await harvester.harvest("npm://@scope/package")
 
-        # Example 3: Harvest with npmjs.com URL
-        print("\nHarvesting with npmjs.com URL...")
-        server3 = await harvester.harvest(
-            "https://www.npmjs.com/package/@modelcontextprotocol/server-filesystem"
-        )
-
-    await engine.dispose()
+async def example_harvest_npm_package(engine: AsyncEngine):
+    """Example: Harvest several MCP servers from NPM concurrently."""
 
+    # Create session
+    async with AsyncSession(engine) as session:
+        # Initialize harvester
+        harvester = NPMHarvester(session)
 
-async def example_fetch_only():
+        # Harvest several packages concurrently; the supported identifier formats
+        # (scoped name, npm:// protocol, npmjs.com URL) can be mixed freely
+        targets = [
+            "@modelcontextprotocol/server-filesystem",
+            "npm://@scope/package",
+            "https://www.npmjs.com/package/@modelcontextprotocol/server-memory",
+        ]
+        print(f"Harvesting {len(targets)} packages (up to 4 at a time)...")
+        servers = await harvester.harvest_many(targets, concurrency=4)
+
+        for server in servers:
+            print(f"✓ Harvested: {server.name}")
+            print(f"  - Primary URL: {server.primary_url}")
+            print(f"  - Host Type: {server.host_type}")
+            print(f"  - Tools: {len(server.tools)}")
+            print(f"  - Health Score: {server.health_score}")
+            print(f"  - Risk Level: {server.risk_level}")
+
+
+async def example_fetch_only(engine: AsyncEngine):
     """Example: Just fetch data without storing."""
 
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
-
     async with AsyncSession(engine) as session:
         harvester = NPMHarvester(session)
 
@@ -71,20 +88,36 @@ async def example_fetch_only():
 
         print(f"Package: {data['package_name']}")
         print(f"Version: {data['latest_version']}")
-        print(f"Tarball size: {len(data['tarball_content'])} bytes")
+        # package.json is only extracted from the tarball when the packument lacks it
+        if data["package_json_content"] is not None:
+            print(f"package.json size: {len(data['package_json_content'])} bytes")
 
         # Parse into Server model
         server = await harvester.parse(data)
         print(f"Parsed server: {server.name}")
         print(f"Dependencies: {len(server.dependencies)}")
 
-    await engine.dispose()
 
+async def main():
+    """Run the examples against one database and one HTTP client."""
+    engine = create_example_engine()
 
-if __name__ == "__main__":
-    # Run examples
-    print("=== NPM Harvester Example 1: Full Harvest ===\n")
-    asyncio.run(example_harvest_npm_package())
+    # Create tables once for all examples
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    try:
+        print("=== NPM Harvester Example 1: Full Harvest ===\n")
+        await example_harvest_npm_package(engine)
+
+        print("\n=== NPM Harvester Example 2: Fetch and Parse ===\n")
+        await example_fetch_only(engine)
+    finally:
+        # The pooled HTTP/2 client is shared by all harvesters and bound to this
+        # event loop, so close it before asyncio.run() tears the loop down
+        await close_client()
+        await engine.dispose()
 
-    print("\n=== NPM Harvester Example 2: Fetch and Parse ===\n")
-    asyncio.run(example_fetch_only())
+
+if __name__ == "__main__":
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None)
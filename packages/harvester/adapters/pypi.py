@@ -10,24 +10,293 @@ Based on:
 """
 
 import ast
+import asyncio
+import functools
+import gzip
 import io
-import json
+import itertools
+import math
 import re
+import string
+import struct
 import tarfile
-import tomllib
+import time
 import zipfile
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+from typing import (
+    Any,
+    BinaryIO,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import quote
+
+import orjson
 from loguru import logger
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from packages.harvester.core.base_harvester import BaseHarvester, HarvesterError
 from packages.harvester.core.models import DependencyType, HostType, RiskLevel
+from packages.harvester.core.upsert import server_child_tables, upsert_server
 from packages.harvester.models.models import Dependency, Release, Server, Tool
-from packages.harvester.utils.http_client import HTTPClientError, fetch_bytes, fetch_json
+from packages.harvester.settings import settings
+from packages.harvester.utils.http_client import HTTPClientError, fetch_bytes, get_client
+
+# tomli ships mypyc-compiled wheels with the same API as the pure-Python stdlib
+# tomllib, so prefer it when installed
+try:
+    import tomli as tomllib
+except ImportError:
+    import tomllib
+
+# ISA-L's gzip reader is a drop-in replacement several times faster than the
+# stdlib one on sdist tarballs; it is optional, so fall back to gzip
+try:
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
+
+# (conditional request headers, decoded JSON body, wall-clock fetch time)
+_ResponseCacheEntry = Tuple[Dict[str, str], Dict[str, Any], float]
+
+# End of central directory record: signature, disk numbers, entry counts,
+# central directory size and offset, comment length
+_ZIP_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP_END_SIGNATURE = b"PK\x05\x06"
+
+# Official MCP packages typically start with "mcp-" or "modelcontextprotocol-"
+_OFFICIAL_PYPI_PREFIXES = ("mcp-", "modelcontextprotocol-")
+
+# Dependencies that give remote shell or orchestration access. Most Python packages
+# pull in subprocess/socket-level libraries, so only these are flagged; they mark
+# packages that exist solely for exploitation.
+_DANGEROUS_PYPI_DEPS = frozenset({"pty", "paramiko", "fabric", "ansible"})
+
+# Python files larger than this are generated or vendored modules, not servers
+_MAX_PYTHON_SOURCE_SIZE = 256 * 1024  # 256KB
+
+# Anything that could be an @mcp.tool or @tool decorator. Sources without a match
+# are skipped before ast.parse, which dominates the cost of decorator detection.
+_TOOL_DECORATOR_RE = re.compile(rb"@\s*(?:mcp\s*\.\s*)?tool\b")
+
+# Tail fetched to locate the central directory: the end record plus the
+# comment search window zipfile reads
+_ZIP_TAIL_SIZE = _ZIP_END_RECORD.size + (1 << 16)
+
+
+class _RangeFile(io.RawIOBase):
+    """Seekable read-only view over the fetched byte ranges of a remote file.
+
+    Lets zipfile read the central directory and selected members of a wheel
+    without downloading the rest of it. Reading outside the fetched ranges
+    raises OSError.
+    """
+
+    def __init__(self, size: int) -> None:
+        super().__init__()
+        self._size = size
+        self._ranges: List[Tuple[int, bytes]] = []
+        self._position = 0
+
+    def add_range(self, start: int, data: bytes) -> None:
+        self._ranges.append((start, data))
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise OSError("negative seek position")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer: Any) -> int:
+        # Keep reading across adjacent ranges: zipfile reads the whole central
+        # directory at once and treats a short read as a truncated archive
+        read = 0
+        while read < len(buffer) and self._position < self._size:
+            for start, data in self._ranges:
+                offset = self._position - start
+                if 0 <= offset < len(data):
+                    size = min(len(buffer) - read, len(data) - offset)
+                    buffer[read : read + size] = data[offset : offset + size]
+                    self._position += size
+                    read += size
+                    break
+            else:
+                if read:
+                    break
+                raise OSError(f"byte {self._position} of remote file was not fetched")
+        return read
+
+
+# Suffixes of every member _select_config_files can pick
+_CONFIG_SUFFIXES = ("mcp.json", "pyproject.toml", ".py")
+
+
+class _ConfigFiles(NamedTuple):
+    """Archive members searched for MCP configuration."""
+
+    mcp_json: Optional[str]
+    pyproject: Optional[str]
+    python_files: List[str]
+
+
+def _select_config_files(
+    infos: Iterable[zipfile.ZipInfo], max_total_size: int, max_ratio: int
+) -> Optional[_ConfigFiles]:
+    """Classify archive members in a single pass, stopping at the first bomb signal.
+
+    Args:
+        infos: Central directory entries of the archive
+        max_total_size: Cap on the summed uncompressed size of all members
+        max_ratio: Cap on a single member's uncompressed to compressed size ratio
+
+    Returns:
+        First mcp.json, first pyproject.toml and the first ten Python files small
+        enough to be hand-written sources, or None if the archive is a zip bomb
+    """
+    mcp_json: Optional[str] = None
+    pyproject: Optional[str] = None
+    python_files: List[str] = []
+    total_size = 0
+    for info in infos:
+        size = info.file_size
+        total_size += size
+        if total_size > max_total_size or size > max_ratio * max(info.compress_size, 1):
+            return None
+
+        name = info.filename
+        # One C-level suffix test rejects data files and assets before classifying
+        if not name.endswith(_CONFIG_SUFFIXES):
+            continue
+        if name.endswith("mcp.json"):
+            mcp_json = mcp_json or name
+        elif name.endswith("pyproject.toml"):
+            pyproject = pyproject or name
+        elif len(python_files) < 10 and size <= _MAX_PYTHON_SOURCE_SIZE and name.endswith(".py"):
+            python_files.append(name)
+    return _ConfigFiles(mcp_json, pyproject, python_files)
+
+
+def _is_mcp_tool_decorator(decorator: ast.expr) -> bool:
+    """Check whether a decorator is ``@mcp.tool`` or a bare ``@tool``."""
+    if isinstance(decorator, ast.Attribute):
+        return (
+            decorator.attr == "tool"
+            and isinstance(decorator.value, ast.Name)
+            and decorator.value.id == "mcp"
+        )
+    return isinstance(decorator, ast.Name) and decorator.id == "tool"
+
+
+# Nodes whose children can hold a function definition; expressions never can
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_function_defs(node: ast.AST) -> Iterator[ast.FunctionDef | ast.AsyncFunctionDef]:
+    """Yield function definitions in source order, descending only through statements.
+
+    Tools may be registered inside classes, conditionals or factory functions,
+    so every statement body is searched, but expression subtrees are pruned.
+    """
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, _STATEMENT_NODES):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield child
+            yield from _iter_function_defs(child)
+
+
+# Child tables replaced on every store; PyPI packages never carry resources or
+# prompts, so those rows are left alone
+_SERVER_CHILD_TABLES = server_child_tables(
+    (Tool, "tools"),
+    (Dependency, "dependencies"),
+    (Release, "releases"),
+)
+
+
+# Translate tables for ASCII-only PEP 508 names: plain lowercasing, and PEP 503
+# style normalization that also maps underscores to hyphens
+_LOWER_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_PACKAGE_NAME_TABLE = str.maketrans(string.ascii_uppercase + "_", string.ascii_lowercase + "-")
+
+
+@functools.lru_cache(maxsize=16384)
+def _normalize_pypi_package_name(name: str) -> str:
+    """Cached implementation of PyPIHarvester._normalize_package_name."""
+    return name.translate(_PACKAGE_NAME_TABLE)
+
+
+class _Requirement(NamedTuple):
+    """Parsed requirement; immutable so cached results can be shared."""
+
+    name: str
+    version: Optional[str]
+    type: DependencyType
+
+
+# Characters ending a requirement's leading package name: the start of extras, a
+# version specifier, a marker or whitespace. Anything else, dots included, is
+# part of the name
+_REQUIREMENT_NAME_END = "<>=!~[(;" + string.whitespace
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_requirement_string(requirement: str) -> Optional[_Requirement]:
+    """Cached implementation of PyPIHarvester._parse_requirement.
+
+    Popular dependencies such as "requests>=2.0.0" repeat across packages, so
+    each distinct requirement string is parsed once.
+    """
+    try:
+        # Simple hand-rolled parser (production should use packaging library)
+        # Split at the first semicolon to separate package from markers
+        package_part, _, marker = requirement.partition(";")
+        package_part = package_part.strip()
+
+        # Determine dependency type from markers
+        dep_type = DependencyType.RUNTIME
+        if marker:
+            marker = marker.lower()
+            if "extra" in marker and ("dev" in marker or "test" in marker):
+                dep_type = DependencyType.DEV
+
+        # Extract package name and version constraint from "package[extras]>=1.0"
+        # with C-level string scans for the first character ending the name
+        name_end = min(
+            (index for char in _REQUIREMENT_NAME_END if (index := package_part.find(char)) != -1),
+            default=len(package_part),
+        )
+        if name_end:
+            name = package_part[:name_end]
+            rest = package_part[name_end:].lstrip()
+            if rest.startswith("[") and "]" in rest:
+                rest = rest.partition("]")[2]
+            return _Requirement(name, rest.strip() or None, dep_type)
+
+    except Exception as e:
+        logger.debug(f"Error parsing requirement '{requirement}': {str(e)}")
+
+    return None
 
 
 class PyPIHarvester(BaseHarvester):
@@ -54,12 +323,29 @@ class PyPIHarvester(BaseHarvester):
     # Maximum uncompressed size to prevent zip bombs (500MB)
     MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024
 
+    # Deflate tops out near 1032:1, so a wheel member this close to it is crafted
+    MAX_COMPRESSION_RATIO = 1000
+
     # PyPI JSON API endpoint
     PYPI_API_URL = "https://pypi.org/pypi/{package}/json"
 
     # pypistats API endpoint (if available)
     PYPISTATS_API_URL = "https://pypistats.org/api/packages/{package}/recent"
 
+    # pypistats only refreshes its numbers once a day
+    STATS_CACHE_TTL = 24 * 60 * 60
+
+    # JSON response cache shared by all instances: URL -> (validator headers, body,
+    # fetch time). Entries younger than their TTL are served without a request,
+    # older ones are revalidated with If-None-Match / If-Modified-Since. Least
+    # recently used entries are evicted beyond RESPONSE_CACHE_SIZE.
+    RESPONSE_CACHE_SIZE = 1024
+    _response_cache: ClassVar[OrderedDict[str, _ResponseCacheEntry]] = OrderedDict()
+
+    # Wheels larger than this are inspected through HTTP range requests for the
+    # central directory and the few members searched, instead of downloaded whole
+    RANGE_REQUEST_THRESHOLD = 2 * 1024 * 1024  # 2MB
+
     def __init__(self, session: AsyncSession):
         """Initialize PyPI harvester with session.
 
@@ -84,10 +370,7 @@ class PyPIHarvester(BaseHarvester):
             >>> _normalize_package_name("My_Package-Name")
             'my-package-name'
         """
-        # Convert to lowercase and replace underscores with hyphens
-        normalized = name.lower().replace("_", "-")
-        logger.debug(f"Normalized package name: {name} -> {normalized}")
-        return normalized
+        return _normalize_pypi_package_name(name)
 
     async def fetch(self, url: str) -> Dict[str, Any]:
         """Fetch package data from PyPI JSON API.
@@ -120,23 +403,17 @@ class PyPIHarvester(BaseHarvester):
         try:
             logger.info(f"Fetching PyPI package: {package_name}")
 
-            # Fetch package metadata from PyPI JSON API
+            # Fetch package metadata from PyPI JSON API and download statistics
+            # concurrently; they are independent requests to different hosts
             api_url = self.PYPI_API_URL.format(package=package_name)
-            package_data = await fetch_json(api_url)
+            package_data, download_stats = await asyncio.gather(
+                self._fetch_cached_json(api_url, settings.cache_ttl_default),
+                self._fetch_download_stats(package_name),
+            )
 
             if not package_data or "info" not in package_data:
                 raise HarvesterError(f"Invalid PyPI response for package: {package_name}")
 
-            # Try to fetch download statistics
-            download_stats = None
-            try:
-                stats_url = self.PYPISTATS_API_URL.format(package=package_name)
-                download_stats = await fetch_json(stats_url)
-                logger.debug(f"Fetched download statistics for {package_name}")
-            except (HTTPClientError, Exception) as e:
-                logger.warning(f"Could not fetch download statistics: {str(e)}")
-                # Continue without download stats
-
             # Combine package data and download stats
             result = {
                 "package_data": package_data,
@@ -154,6 +431,119 @@ class PyPIHarvester(BaseHarvester):
         except Exception as e:
             raise HarvesterError(f"Unexpected error fetching PyPI data: {str(e)}") from e
 
+    async def _fetch_download_stats(self, package_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch download statistics from pypistats.
+
+        Args:
+            package_name: Normalized package name
+
+        Returns:
+            pypistats response, or None if unavailable
+        """
+        try:
+            stats_url = self.PYPISTATS_API_URL.format(package=package_name)
+            download_stats = await self._fetch_cached_json(stats_url, self.STATS_CACHE_TTL)
+            logger.debug(f"Fetched download statistics for {package_name}")
+            return download_stats
+        except Exception as e:
+            logger.warning(f"Could not fetch download statistics: {str(e)}")
+            # Continue without download stats
+            return None
+
+    async def _fetch_cached_json(self, url: str, ttl: float) -> Dict[str, Any]:
+        """Fetch a JSON document through the conditional-GET response cache.
+
+        Args:
+            url: URL to fetch
+            ttl: Seconds a cached response is served without revalidation
+
+        Returns:
+            Decoded JSON body
+
+        Raises:
+            HTTPClientError: If the server returns an error status
+        """
+        cached = self._response_cache.get(url)
+        if cached is None and settings.pypi_metadata_cache_dir is not None:
+            cached = await asyncio.to_thread(self._load_response_entry, url)
+        if cached and time.time() - cached[2] < ttl:
+            self._remember_response_entry(url, cached)
+            return cached[1]
+
+        response = await get_client().get(url, headers=cached[0] if cached else None)
+        if cached and response.status_code == 304:
+            logger.debug(f"{url} not modified, reusing cached response")
+            data = cached[1]
+        elif response.is_error:
+            raise HTTPClientError(f"HTTP {response.status_code} error for {url}")
+        else:
+            data = orjson.loads(response.content)
+
+        validators = {}
+        if "etag" in response.headers:
+            validators["If-None-Match"] = response.headers["etag"]
+        if "last-modified" in response.headers:
+            validators["If-Modified-Since"] = response.headers["last-modified"]
+        if cached and not validators:
+            validators = cached[0]
+
+        entry = (validators, data, time.time())
+        self._remember_response_entry(url, entry)
+        if settings.pypi_metadata_cache_dir is not None:
+            await asyncio.to_thread(self._persist_response_entry, url, entry)
+
+        return data
+
+    def _remember_response_entry(self, url: str, entry: _ResponseCacheEntry) -> None:
+        """Insert or refresh an entry in the in-memory LRU response cache."""
+        self._response_cache[url] = entry
+        self._response_cache.move_to_end(url)
+        while len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    @staticmethod
+    def _response_entry_path(url: str) -> Optional[Path]:
+        """Location of a URL's persisted response, if persistence is enabled."""
+        cache_dir = settings.pypi_metadata_cache_dir
+        if cache_dir is None:
+            return None
+        return cache_dir / f"{quote(url, safe='')}.json"
+
+    def _persist_response_entry(self, url: str, entry: _ResponseCacheEntry) -> None:
+        """Write a response cache entry to the metadata cache directory.
+
+        Failures are logged and ignored; the on-disk cache is only an optimization.
+        """
+        path = self._response_entry_path(url)
+        if path is None:
+            return
+        validators, data, fetched_at = entry
+        try:
+            document = orjson.dumps(
+                {"validators": validators, "fetched_at": fetched_at, "data": data}
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(document)
+            tmp_path.replace(path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not persist response for {url}: {e}")
+
+    def _load_response_entry(self, url: str) -> Optional[_ResponseCacheEntry]:
+        """Read a persisted response cache entry, or None if absent or unreadable."""
+        path = self._response_entry_path(url)
+        if path is None:
+            return None
+        try:
+            document = orjson.loads(path.read_bytes())
+            return (document["validators"], document["data"], document["fetched_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable response cache for {url}: {e}")
+            return None
+
     async def parse(self, data: Dict[str, Any]) -> Server:
         """Parse PyPI data into Server model.
 
@@ -206,6 +596,9 @@ class PyPIHarvester(BaseHarvester):
 
             logger.info(f"Parsing PyPI package: {name} v{version}")
 
+            # Single harvest timestamp, stored as naive UTC to match the schema
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+
             # Create base Server entity
             server = Server(
                 name=name,
@@ -219,20 +612,20 @@ class PyPIHarvester(BaseHarvester):
                 license=license_name,
                 keywords=keywords,
                 downloads=total_downloads,
-                last_indexed_at=datetime.utcnow(),
+                last_indexed_at=now,
             )
 
-            # Download and extract package to find MCP config
-            if urls:
-                await self._extract_and_parse_package(server, urls)
-            else:
-                logger.warning(f"No distribution files found for {name}")
-
-            # Parse dependencies from package metadata
-            self._parse_dependencies(server, info)
-
-            # Extract release history
-            self._parse_releases(server, releases_data)
+            # Download and extract the package to find MCP config while dependencies
+            # and release history are parsed from the metadata in worker threads.
+            # The extraction fills server.tools, so the parsed records are only
+            # attached to the server once everything has finished
+            _, dependencies, releases = await asyncio.gather(
+                self._extract_and_parse_package(server, urls),
+                asyncio.to_thread(self._parse_dependencies, info),
+                asyncio.to_thread(self._parse_releases, releases_data, now),
+            )
+            server.dependencies.extend(dependencies)
+            server.releases.extend(releases)
 
             # If GitHub URL found, store it in readme_content (for now)
             if github_url:
@@ -249,13 +642,14 @@ class PyPIHarvester(BaseHarvester):
             )
 
             # Determine risk level
+            is_official = self._is_official_package(package_name)
             server.risk_level = self._determine_risk_level(
-                is_official=self._is_official_package(package_name),
+                is_official=is_official,
                 has_dangerous_deps=self._has_dangerous_dependencies(server.dependencies),
             )
 
             # Mark official packages as verified
-            server.verified_source = self._is_official_package(package_name)
+            server.verified_source = is_official
 
             logger.success(
                 f"Parsed PyPI package {name}: {len(server.tools)} tools, "
@@ -272,9 +666,9 @@ class PyPIHarvester(BaseHarvester):
         """Persist server and related entities to database.
 
         This method:
-        - Checks for existing server by primary_url (upsert logic)
-        - Updates existing or creates new server
-        - Cascades to all related entities (tools, dependencies, etc.)
+        - Upserts the server row with a single INSERT ... ON CONFLICT (primary_url)
+        - Replaces tools, dependencies, and releases with one bulk DELETE and
+          INSERT per table
         - Commits transaction
 
         Args:
@@ -285,52 +679,8 @@ class PyPIHarvester(BaseHarvester):
             HarvesterError: If storage operation fails
         """
         try:
-            # Check if server already exists
-            statement = select(Server).where(Server.primary_url == server.primary_url)
-            result = await session.execute(statement)
-            existing_server = result.scalar_one_or_none()
-
-            if existing_server:
-                logger.info(f"Updating existing PyPI server: {server.name}")
-
-                # Update scalar fields
-                existing_server.name = server.name
-                existing_server.description = server.description
-                existing_server.author_name = server.author_name
-                existing_server.homepage = server.homepage
-                existing_server.license = server.license
-                existing_server.readme_content = server.readme_content
-                existing_server.keywords = server.keywords
-                existing_server.categories = server.categories
-                existing_server.downloads = server.downloads
-                existing_server.risk_level = server.risk_level
-                existing_server.verified_source = server.verified_source
-                existing_server.health_score = server.health_score
-                existing_server.last_indexed_at = server.last_indexed_at
-                existing_server.updated_at = datetime.utcnow()
-
-                # Clear and replace related entities
-                existing_server.tools.clear()
-                existing_server.dependencies.clear()
-                existing_server.releases.clear()
-
-                # Add new related entities
-                for tool in server.tools:
-                    tool.server_id = existing_server.id
-                    existing_server.tools.append(tool)
-
-                for dependency in server.dependencies:
-                    dependency.server_id = existing_server.id
-                    existing_server.dependencies.append(dependency)
-
-                for release in server.releases:
-                    release.server_id = existing_server.id
-                    existing_server.releases.append(release)
-
-                session.add(existing_server)
-            else:
-                logger.info(f"Creating new PyPI server: {server.name}")
-                session.add(server)
+            server.updated_at = server.last_indexed_at
+            await upsert_server(session, server, _SERVER_CHILD_TABLES)
 
             await session.commit()
             logger.success(f"Successfully stored PyPI server: {server.name}")
@@ -402,9 +752,8 @@ class PyPIHarvester(BaseHarvester):
 
         This method:
         - Selects the best distribution (prefer wheels over sdist)
-        - Downloads the artifact
+        - Reads large wheels through range requests, downloads anything else
         - Checks for zip bombs
-        - Extracts to memory
         - Searches for MCP config in multiple locations
 
         Args:
@@ -414,19 +763,20 @@ class PyPIHarvester(BaseHarvester):
         Updates server.tools and other fields in place.
         """
         # Prefer wheels over source distributions
-        wheel_url = None
-        sdist_url = None
+        wheel_info = None
+        sdist_info = None
 
         for url_info in urls:
             package_type = url_info.get("packagetype", "")
-            if package_type == "bdist_wheel" and not wheel_url:
-                wheel_url = url_info.get("url")
-            elif package_type == "sdist" and not sdist_url:
-                sdist_url = url_info.get("url")
+            if package_type == "bdist_wheel" and not wheel_info:
+                wheel_info = url_info
+            elif package_type == "sdist" and not sdist_info:
+                sdist_info = url_info
 
         # Select best distribution
-        download_url = wheel_url or sdist_url
-        is_wheel = bool(wheel_url)
+        artifact_info = wheel_info or sdist_info
+        download_url = artifact_info.get("url") if artifact_info else None
+        is_wheel = artifact_info is wheel_info
 
         if not download_url:
             logger.warning(f"No suitable distribution found for {server.name}")
@@ -434,55 +784,142 @@ class PyPIHarvester(BaseHarvester):
 
         try:
             logger.info(f"Downloading {'wheel' if is_wheel else 'sdist'} for {server.name}")
-            artifact_bytes = await fetch_bytes(download_url)
 
-            logger.debug(f"Downloaded {len(artifact_bytes)} bytes")
+            if not is_wheel:
+                sdist_bytes = await fetch_bytes(download_url)
+                logger.debug(f"Downloaded {len(sdist_bytes)} bytes")
+                # Decompression and parsing are CPU-bound; keep them off the event loop
+                await asyncio.to_thread(self._extract_sdist, server, sdist_bytes)
+                return
 
-            # Extract and search for MCP config
-            if is_wheel:
-                self._extract_wheel(server, artifact_bytes)
-            else:
-                self._extract_sdist(server, artifact_bytes)
+            wheel: Optional[BinaryIO] = None
+            size = artifact_info.get("size") or 0
+            if size > self.RANGE_REQUEST_THRESHOLD:
+                try:
+                    wheel = await self._fetch_wheel_ranges(download_url, size)
+                except Exception as e:
+                    logger.debug(f"Range requests failed for {download_url}: {str(e)}")
+
+            if wheel is None:
+                wheel_bytes = await fetch_bytes(download_url)
+                logger.debug(f"Downloaded {len(wheel_bytes)} bytes")
+                wheel = io.BytesIO(wheel_bytes)
+
+            await asyncio.to_thread(self._extract_wheel, server, wheel)
 
         except Exception as e:
             logger.warning(f"Failed to extract package: {str(e)}")
             # Continue without MCP config extraction
 
-    def _extract_wheel(self, server: Server, wheel_bytes: bytes) -> None:
+    async def _fetch_range(self, url: str, start: int, end: int) -> Tuple[bytes, bool]:
+        """Fetch bytes [start, end) of a remote file.
+
+        Returns:
+            (content, partial): the requested bytes with partial=True, or the whole
+            file with partial=False if the server ignored the Range header
+        """
+        response = await get_client().get(url, headers={"Range": f"bytes={start}-{end - 1}"})
+        response.raise_for_status()
+        return response.content, response.status_code == 206
+
+    async def _fetch_wheel_ranges(self, url: str, size: int) -> Optional[BinaryIO]:
+        """Fetch only the central directory and searched members of a remote wheel.
+
+        Args:
+            url: Wheel download URL
+            size: Wheel size in bytes, as reported by PyPI
+
+        Returns:
+            A file object zipfile can read the selected members from (the whole
+            wheel if the server ignored Range), or None if the wheel has to be
+            downloaded whole (Zip64)
+        """
+        wheel = _RangeFile(size)
+
+        # The central directory is located through the end record at the tail
+        tail_start = max(size - _ZIP_TAIL_SIZE, 0)
+        tail, partial = await self._fetch_range(url, tail_start, size)
+        if not partial:
+            # The server sent the whole wheel instead; use it rather than download it again
+            return io.BytesIO(tail)
+        wheel.add_range(tail_start, tail)
+
+        record_start = tail.rfind(_ZIP_END_SIGNATURE)
+        if record_start < 0 or len(tail) - record_start < _ZIP_END_RECORD.size:
+            return None
+        *_, directory_offset, _ = _ZIP_END_RECORD.unpack_from(tail, record_start)
+        if directory_offset == 0xFFFFFFFF:
+            return None  # Zip64 archives are rare for wheels; download them whole
+
+        if directory_offset < tail_start:
+            directory, partial = await self._fetch_range(url, directory_offset, tail_start)
+            if not partial:
+                return io.BytesIO(directory)
+            wheel.add_range(directory_offset, directory)
+
+        with zipfile.ZipFile(wheel) as zf:
+            infos = zf.infolist()
+            files = _select_config_files(
+                infos, self.MAX_UNCOMPRESSED_SIZE, self.MAX_COMPRESSION_RATIO
+            )
+            if files is None:
+                # _extract_wheel reports the zip bomb from the central directory alone
+                return wheel
+
+            wanted = {name for name in (files.mcp_json, files.pyproject) if name}
+            wanted.update(files.python_files)
+
+            # A member spans from its local header to the next member's header
+            offsets = sorted({info.header_offset for info in infos} | {directory_offset})
+            next_offsets = dict(itertools.pairwise(offsets))
+            spans = [
+                (info.header_offset, next_offsets[info.header_offset])
+                for info in infos
+                if info.filename in wanted
+            ]
+
+        members = await asyncio.gather(*(self._fetch_range(url, *span) for span in spans))
+        for (start, _), (data, partial) in zip(spans, members, strict=True):
+            if not partial:
+                return io.BytesIO(data)
+            wheel.add_range(start, data)
+
+        logger.debug(
+            f"Fetched central directory and {len(spans)} members of {url} via range requests"
+        )
+        return wheel
+
+    def _extract_wheel(self, server: Server, wheel: BinaryIO) -> None:
         """Extract wheel file and search for MCP configuration.
 
         Args:
             server: Server instance to populate
-            wheel_bytes: Wheel file content
+            wheel: Seekable wheel file object
 
         Updates server in place.
         """
         try:
-            with zipfile.ZipFile(io.BytesIO(wheel_bytes)) as zf:
-                # Security check: zip bomb detection
-                total_size = sum(info.file_size for info in zf.filelist)
-                if total_size > self.MAX_UNCOMPRESSED_SIZE:
+            with zipfile.ZipFile(wheel) as zf:
+                # Classify members and check for zip bombs in one pass
+                files = _select_config_files(
+                    zf.infolist(), self.MAX_UNCOMPRESSED_SIZE, self.MAX_COMPRESSION_RATIO
+                )
+                if files is None:
                     logger.warning(
-                        f"Zip bomb detected: uncompressed size {total_size} exceeds limit"
+                        "Zip bomb detected: uncompressed size or compression ratio exceeds limit"
                     )
                     return
 
-                # Search for MCP config files
-                file_list = zf.namelist()
-
                 # Look for mcp.json
-                mcp_json_files = [f for f in file_list if f.endswith("mcp.json")]
-                if mcp_json_files:
-                    self._parse_mcp_json_from_zip(server, zf, mcp_json_files[0])
+                if files.mcp_json:
+                    self._parse_mcp_json_from_zip(server, zf, files.mcp_json)
 
                 # Look for pyproject.toml
-                pyproject_files = [f for f in file_list if f.endswith("pyproject.toml")]
-                if pyproject_files:
-                    self._parse_pyproject_toml_from_zip(server, zf, pyproject_files[0])
+                if files.pyproject:
+                    self._parse_pyproject_toml_from_zip(server, zf, files.pyproject)
 
-                # Look for @mcp.tool decorators in Python files
-                python_files = [f for f in file_list if f.endswith(".py")]
-                for py_file in python_files[:10]:  # Limit to first 10 files
+                # Look for @mcp.tool decorators in Python files (first 10 only)
+                for py_file in files.python_files:
                     self._parse_python_decorators_from_zip(server, zf, py_file)
 
         except zipfile.BadZipFile as e:
@@ -493,44 +930,68 @@ class PyPIHarvester(BaseHarvester):
     def _extract_sdist(self, server: Server, sdist_bytes: bytes) -> None:
         """Extract source distribution and search for MCP configuration.
 
+        The archive is read in a single sequential pass that keeps only the
+        searched members and stops once all of them have been found.
+
         Args:
             server: Server instance to populate
             sdist_bytes: Source distribution content
 
         Updates server in place.
         """
-        try:
-            with tarfile.open(fileobj=io.BytesIO(sdist_bytes), mode="r:gz") as tf:
-                # Security check: zip bomb detection
-                total_size = sum(member.size for member in tf.getmembers() if member.isfile())
-                if total_size > self.MAX_UNCOMPRESSED_SIZE:
-                    logger.warning(
-                        f"Tar bomb detected: uncompressed size {total_size} exceeds limit"
-                    )
-                    return
-
-                # Search for MCP config files
-                file_list = tf.getnames()
-
-                # Look for mcp.json
-                mcp_json_files = [f for f in file_list if f.endswith("mcp.json")]
-                if mcp_json_files:
-                    self._parse_mcp_json_from_tar(server, tf, mcp_json_files[0])
-
-                # Look for pyproject.toml
-                pyproject_files = [f for f in file_list if f.endswith("pyproject.toml")]
-                if pyproject_files:
-                    self._parse_pyproject_toml_from_tar(server, tf, pyproject_files[0])
+        mcp_json: Optional[Tuple[str, bytes]] = None
+        pyproject: Optional[Tuple[str, bytes]] = None
+        python_files: List[Tuple[str, bytes]] = []
 
-                # Look for @mcp.tool decorators in Python files
-                python_files = [f for f in file_list if f.endswith(".py")]
-                for py_file in python_files[:10]:  # Limit to first 10 files
-                    self._parse_python_decorators_from_tar(server, tf, py_file)
-
-        except tarfile.TarError as e:
+        try:
+            compressed = _gzip.GzipFile(fileobj=io.BytesIO(sdist_bytes))
+            with compressed, tarfile.open(fileobj=compressed, mode="r|") as tf:
+                total_size = 0
+                for member in tf:
+                    if not member.isfile():
+                        continue
+
+                    # Security check: zip bomb detection
+                    total_size += member.size
+                    if total_size > self.MAX_UNCOMPRESSED_SIZE:
+                        logger.warning(
+                            f"Tar bomb detected: uncompressed size {total_size} exceeds limit"
+                        )
+                        return
+
+                    name = member.name
+                    if mcp_json is None and name.endswith("mcp.json"):
+                        mcp_json = (name, tf.extractfile(member).read())
+                    elif pyproject is None and name.endswith("pyproject.toml"):
+                        pyproject = (name, tf.extractfile(member).read())
+                    elif (
+                        len(python_files) < 10
+                        and name.endswith(".py")
+                        and member.size <= _MAX_PYTHON_SOURCE_SIZE
+                    ):
+                        python_files.append((name, tf.extractfile(member).read()))
+
+                    if mcp_json and pyproject and len(python_files) == 10:
+                        break
+
+        except (tarfile.TarError, _gzip.BadGzipFile) as e:
             logger.warning(f"Invalid tar file: {str(e)}")
+            return
         except Exception as e:
             logger.warning(f"Error extracting sdist: {str(e)}")
+            return
+
+        # Look for mcp.json
+        if mcp_json:
+            self._parse_mcp_json(server, mcp_json[1])
+
+        # Look for pyproject.toml
+        if pyproject:
+            self._parse_pyproject_toml(server, pyproject[1])
+
+        # Look for @mcp.tool decorators in Python files (first 10 only)
+        for py_file, content in python_files:
+            self._parse_python_decorators(server, content, py_file)
 
     def _parse_mcp_json_from_zip(self, server: Server, zf: zipfile.ZipFile, filepath: str) -> None:
         """Parse mcp.json from zip file.
@@ -541,36 +1002,21 @@ class PyPIHarvester(BaseHarvester):
             filepath: Path to mcp.json in zip
         """
         try:
-            content = zf.read(filepath).decode("utf-8")
-            mcp_config = json.loads(content)
-
-            # Extract tools
-            tools_config = mcp_config.get("tools", [])
-            for tool_data in tools_config:
-                tool = Tool(
-                    name=tool_data.get("name", ""),
-                    description=tool_data.get("description"),
-                    input_schema=tool_data.get("inputSchema", {}),
-                )
-                server.tools.append(tool)
-
-            logger.debug(f"Parsed {len(tools_config)} tools from mcp.json")
-
+            content = zf.read(filepath)
         except Exception as e:
             logger.warning(f"Error parsing mcp.json: {str(e)}")
+            return
+        self._parse_mcp_json(server, content)
 
-    def _parse_mcp_json_from_tar(self, server: Server, tf: tarfile.TarFile, filepath: str) -> None:
-        """Parse mcp.json from tar file.
+    def _parse_mcp_json(self, server: Server, content: bytes) -> None:
+        """Parse tools from mcp.json content.
 
         Args:
             server: Server instance to populate
-            tf: TarFile instance
-            filepath: Path to mcp.json in tar
+            content: Raw mcp.json content
         """
         try:
-            member = tf.getmember(filepath)
-            content = tf.extractfile(member).read().decode("utf-8")
-            mcp_config = json.loads(content)
+            mcp_config = orjson.loads(content)
 
             # Extract tools
             tools_config = mcp_config.get("tools", [])
@@ -598,42 +1044,26 @@ class PyPIHarvester(BaseHarvester):
             filepath: Path to pyproject.toml in zip
         """
         try:
-            content = zf.read(filepath).decode("utf-8")
-            config = tomllib.loads(content)
-
-            # Look for [tool.mcp] section
-            mcp_config = config.get("tool", {}).get("mcp", {})
-            if mcp_config:
-                # Extract tools from [tool.mcp.tools]
-                tools_config = mcp_config.get("tools", [])
-                for tool_data in tools_config:
-                    if isinstance(tool_data, dict):
-                        tool = Tool(
-                            name=tool_data.get("name", ""),
-                            description=tool_data.get("description"),
-                            input_schema=tool_data.get("inputSchema", {}),
-                        )
-                        server.tools.append(tool)
-
-                logger.debug(f"Parsed {len(tools_config)} tools from pyproject.toml")
-
+            content = zf.read(filepath)
         except Exception as e:
             logger.warning(f"Error parsing pyproject.toml: {str(e)}")
+            return
+        self._parse_pyproject_toml(server, content)
 
-    def _parse_pyproject_toml_from_tar(
-        self, server: Server, tf: tarfile.TarFile, filepath: str
-    ) -> None:
-        """Parse pyproject.toml [tool.mcp] section from tar file.
+    def _parse_pyproject_toml(self, server: Server, content: bytes) -> None:
+        """Parse tools from the [tool.mcp] section of pyproject.toml content.
 
         Args:
             server: Server instance to populate
-            tf: TarFile instance
-            filepath: Path to pyproject.toml in tar
+            content: Raw pyproject.toml content
         """
+        # Covers [tool.mcp], [[tool.mcp.tools]] and dotted tool.mcp keys; most
+        # packages have none of them and never need a full TOML parse
+        if b"tool.mcp" not in content:
+            return
+
         try:
-            member = tf.getmember(filepath)
-            content = tf.extractfile(member).read().decode("utf-8")
-            config = tomllib.loads(content)
+            config = tomllib.loads(content.decode("utf-8"))
 
             # Look for [tool.mcp] section
             mcp_config = config.get("tool", {}).get("mcp", {})
@@ -665,159 +1095,117 @@ class PyPIHarvester(BaseHarvester):
             filepath: Path to Python file in zip
         """
         try:
-            content = zf.read(filepath).decode("utf-8")
-            self._extract_mcp_decorators(server, content, filepath)
-
+            content = zf.read(filepath)
         except Exception as e:
             logger.debug(f"Error parsing Python file {filepath}: {str(e)}")
+            return
+        self._parse_python_decorators(server, content, filepath)
 
-    def _parse_python_decorators_from_tar(
-        self, server: Server, tf: tarfile.TarFile, filepath: str
-    ) -> None:
-        """Search for @mcp.tool decorators in Python source files.
+    def _parse_python_decorators(self, server: Server, content: bytes, filepath: str) -> None:
+        """Search Python source content for @mcp.tool decorators.
 
         Args:
             server: Server instance to populate
-            tf: TarFile instance
-            filepath: Path to Python file in tar
+            content: Raw Python source
+            filepath: File path (for logging)
         """
-        try:
-            member = tf.getmember(filepath)
-            content = tf.extractfile(member).read().decode("utf-8")
-            self._extract_mcp_decorators(server, content, filepath)
+        if not _TOOL_DECORATOR_RE.search(content):
+            return
 
-        except Exception as e:
-            logger.debug(f"Error parsing Python file {filepath}: {str(e)}")
+        # ast.parse decodes bytes itself, honouring BOMs and PEP 263 coding cookies;
+        # _extract_mcp_decorators logs and swallows its own parse errors
+        self._extract_mcp_decorators(server, content, filepath)
 
-    def _extract_mcp_decorators(self, server: Server, python_code: str, filepath: str) -> None:
+    def _extract_mcp_decorators(
+        self, server: Server, python_code: str | bytes, filepath: str
+    ) -> None:
         """Extract tools from @mcp.tool decorators using AST parsing.
 
         Args:
             server: Server instance to populate
-            python_code: Python source code
+            python_code: Python source code, as text or raw bytes
             filepath: File path (for logging)
         """
         try:
-            tree = ast.parse(python_code)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Check for @mcp.tool decorator
-                    for decorator in node.decorator_list:
-                        decorator_name = ""
-                        if isinstance(decorator, ast.Name):
-                            decorator_name = decorator.id
-                        elif isinstance(decorator, ast.Attribute):
-                            if (
-                                isinstance(decorator.value, ast.Name)
-                                and decorator.value.id == "mcp"
-                            ):
-                                decorator_name = f"mcp.{decorator.attr}"
-
-                        if decorator_name in ("mcp.tool", "tool"):
-                            # Extract function name and docstring
-                            func_name = node.name
-                            docstring = ast.get_docstring(node)
-
-                            # Create tool
-                            tool = Tool(
-                                name=func_name,
-                                description=docstring or f"Tool: {func_name}",
-                                input_schema={},  # Would need more complex parsing for schema
-                            )
-                            server.tools.append(tool)
-
-                            logger.debug(f"Found @mcp.tool decorator for {func_name} in {filepath}")
+            for node in _iter_function_defs(ast.parse(python_code)):
+                if not any(_is_mcp_tool_decorator(d) for d in node.decorator_list):
+                    continue
+
+                func_name = node.name
+                tool = Tool(
+                    name=func_name,
+                    description=ast.get_docstring(node) or f"Tool: {func_name}",
+                    input_schema={},  # Would need more complex parsing for schema
+                )
+                server.tools.append(tool)
+
+                logger.debug(f"Found @mcp.tool decorator for {func_name} in {filepath}")
 
         except SyntaxError as e:
             logger.debug(f"Syntax error in {filepath}: {str(e)}")
         except Exception as e:
             logger.debug(f"Error extracting decorators from {filepath}: {str(e)}")
 
-    def _parse_dependencies(self, server: Server, info: Dict[str, Any]) -> None:
+    def _parse_dependencies(self, info: Dict[str, Any]) -> List[Dependency]:
         """Parse dependencies from package metadata.
 
         Args:
-            server: Server instance to populate
             info: Package info from PyPI API
 
-        Updates server.dependencies in place.
+        Returns:
+            Dependency records, skipping unparseable requirements
         """
+        dependencies: List[Dependency] = []
         try:
-            # Extract requires_dist
-            requires_dist = info.get("requires_dist", []) or []
-
-            for requirement in requires_dist:
-                # Parse requirement string (e.g., "requests>=2.0.0; extra == 'dev'")
-                parsed = self._parse_requirement(requirement)
-                if parsed:
-                    dep = Dependency(
-                        library_name=parsed["name"],
-                        version_constraint=parsed.get("version"),
-                        ecosystem="pypi",
-                        type=parsed["type"],
-                    )
-                    server.dependencies.append(dep)
-
-            logger.debug(f"Parsed {len(server.dependencies)} Python dependencies")
+            # Parse requirement strings (e.g., "requests>=2.0.0; extra == 'dev'") in
+            # one pass
+            requires_dist = info.get("requires_dist") or ()
+            dependencies = [
+                Dependency(
+                    library_name=parsed.name,
+                    version_constraint=parsed.version,
+                    ecosystem="pypi",
+                    type=parsed.type,
+                )
+                for parsed in map(_parse_requirement_string, requires_dist)
+                if parsed
+            ]
+
+            # Hit/miss counts show whether the requirement cache is sized well
+            logger.debug(
+                f"Parsed {len(dependencies)} Python dependencies "
+                f"({_parse_requirement_string.cache_info()})"
+            )
 
         except Exception as e:
             logger.warning(f"Error parsing dependencies: {str(e)}")
 
-    def _parse_requirement(self, requirement: str) -> Optional[Dict[str, Any]]:
+        return dependencies
+
+    def _parse_requirement(self, requirement: str) -> Optional[_Requirement]:
         """Parse a PEP 508 requirement string.
 
         Args:
             requirement: Requirement string (e.g., "requests>=2.0.0; extra == 'dev'")
 
         Returns:
-            Dict with name, version, and type, or None if parsing fails
+            Requirement with name, version, and type, or None if parsing fails
         """
-        try:
-            # Simple regex-based parser (production should use packaging library)
-            # Split by semicolon to separate package from markers
-            parts = requirement.split(";")
-            package_part = parts[0].strip()
-
-            # Determine dependency type from markers
-            dep_type = DependencyType.RUNTIME
-            if len(parts) > 1:
-                marker = parts[1].strip().lower()
-                if "extra" in marker:
-                    if "dev" in marker or "test" in marker:
-                        dep_type = DependencyType.DEV
-
-            # Extract package name and version constraint
-            # Match patterns like "package", "package>=1.0", "package[extra]>=1.0"
-            match = re.match(r"^([a-zA-Z0-9_-]+(?:\[[\w,]+\])?)\s*(.*)$", package_part)
-            if match:
-                name = match.group(1)
-                # Remove extras from name (e.g., "requests[security]" -> "requests")
-                name = re.sub(r"\[.*\]", "", name)
-                version = match.group(2).strip() or None
-
-                return {
-                    "name": name,
-                    "version": version,
-                    "type": dep_type,
-                }
-
-        except Exception as e:
-            logger.debug(f"Error parsing requirement '{requirement}': {str(e)}")
-
-        return None
+        return _parse_requirement_string(requirement)
 
     def _parse_releases(
-        self, server: Server, releases_data: Dict[str, List[Dict[str, Any]]]
-    ) -> None:
+        self, releases_data: Dict[str, List[Dict[str, Any]]], now: datetime
+    ) -> List[Release]:
         """Parse release history from PyPI data.
 
         Args:
-            server: Server instance to populate
             releases_data: Release data from PyPI API
+            now: Harvest timestamp, used for releases without an upload time
 
-        Updates server.releases in place.
+        Returns:
+            Release records of the newest five versions
         """
+        releases: List[Release] = []
         try:
             # Get last 5 releases (sorted by version)
             versions = sorted(releases_data.keys(), reverse=True)[:5]
@@ -828,24 +1216,25 @@ class PyPIHarvester(BaseHarvester):
                     # Get upload time from first file
                     upload_time_str = release_files[0].get("upload_time_iso_8601")
                     if upload_time_str:
-                        published_at = datetime.fromisoformat(
-                            upload_time_str.replace("Z", "+00:00")
-                        )
+                        # fromisoformat parses the trailing "Z" itself on Python 3.11+
+                        published_at = datetime.fromisoformat(upload_time_str)
                     else:
-                        published_at = datetime.utcnow()
+                        published_at = now
 
                     release = Release(
                         version=version,
                         changelog=None,  # PyPI doesn't provide changelogs in JSON API
                         published_at=published_at,
                     )
-                    server.releases.append(release)
+                    releases.append(release)
 
-            logger.debug(f"Parsed {len(server.releases)} releases")
+            logger.debug(f"Parsed {len(releases)} releases")
 
         except Exception as e:
             logger.warning(f"Error parsing releases: {str(e)}")
 
+        return releases
+
     def _has_recent_release(self, releases_data: Dict[str, List[Dict[str, Any]]]) -> bool:
         """Check if package has a recent release (within last 6 months).
 
@@ -856,14 +1245,19 @@ class PyPIHarvester(BaseHarvester):
             True if recent release found
         """
         try:
-            for version, release_files in releases_data.items():
-                if release_files:
-                    upload_time_str = release_files[0].get("upload_time_iso_8601")
-                    if upload_time_str:
-                        upload_time = datetime.fromisoformat(upload_time_str.replace("Z", "+00:00"))
-                        days_since = (datetime.now(upload_time.tzinfo) - upload_time).days
-                        if days_since < 180:  # 6 months
-                            return True
+            # PyPI's ISO 8601 UTC timestamps share one layout, so they order as
+            # strings and only the newest upload needs parsing
+            latest = max(
+                (
+                    release_files[0].get("upload_time_iso_8601") or ""
+                    for release_files in releases_data.values()
+                    if release_files
+                ),
+                default="",
+            )
+            if latest:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=180)  # 6 months
+                return datetime.fromisoformat(latest) > cutoff
         except Exception:
             pass
 
@@ -901,8 +1295,6 @@ class PyPIHarvester(BaseHarvester):
 
         # Downloads contribution (0-30 points, logarithmic)
         if downloads > 0:
-            import math
-
             score += min(30, int(math.log10(downloads + 1) * 6))
 
         # Recent release
@@ -952,10 +1344,7 @@ class PyPIHarvester(BaseHarvester):
         Returns:
             True if official MCP package
         """
-        # Official MCP packages typically start with "mcp-" or "modelcontextprotocol-"
-        official_prefixes = ["mcp-", "modelcontextprotocol-"]
-        normalized = package_name.lower()
-        return any(normalized.startswith(prefix) for prefix in official_prefixes)
+        return package_name.translate(_LOWER_TABLE).startswith(_OFFICIAL_PYPI_PREFIXES)
 
     def _has_dangerous_dependencies(self, dependencies: List[Dependency]) -> bool:
         """Check if dependencies include potentially dangerous packages.
@@ -970,13 +1359,7 @@ class PyPIHarvester(BaseHarvester):
         - subprocess, os, sys, shutil (system access)
         - socket, requests, httpx (network access)
         """
-        # Note: Most Python packages will have some of these, so we're lenient
-        # This is more for flagging packages that exist solely for exploitation
-        dangerous_pypi = {"pty", "paramiko", "fabric", "ansible"}
-
-        for dep in dependencies:
-            lib_name = dep.library_name.lower()
-            if lib_name in dangerous_pypi:
-                return True
-
-        return False
+        # isdisjoint consumes the names lazily and stops at the first match
+        return not _DANGEROUS_PYPI_DEPS.isdisjoint(
+            dep.library_name.translate(_LOWER_TABLE) for dep in dependencies
+        )
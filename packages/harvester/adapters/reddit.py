@@ -5,7 +5,9 @@ relevant subreddits discussing the Model Context Protocol.
 """
 
 import asyncio
+import functools
 import re
+import threading
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -13,12 +15,13 @@ import praw
 from loguru import logger
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from tenacity import retry, stop_after_attempt, wait_exponential
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from packages.harvester.core.base_harvester import BaseHarvester
+from packages.harvester.core.upsert import column_values, dialect_insert
 from packages.harvester.models import Server
 from packages.harvester.models.social import (
     ContentCategory,
@@ -27,6 +30,21 @@ from packages.harvester.models.social import (
     SocialPost,
 )
 
+# Engagement metrics refreshed when an already stored post is seen again
+_SOCIAL_POST_METRIC_COLUMNS = ("score", "comment_count", "share_count")
+
+
+@functools.cache
+def _sentiment_analyzer() -> SentimentIntensityAnalyzer:
+    """Shared VADER analyzer; loading its lexicon is too costly to repeat per harvester."""
+    return SentimentIntensityAnalyzer()
+
+
+@functools.lru_cache(maxsize=2048)
+def _vader_compound(text: str) -> float:
+    """VADER compound score, memoized for reposts and posts revisited across harvests."""
+    return _sentiment_analyzer().polarity_scores(text)["compound"]
+
 
 class RedditConfig(BaseSettings):
     """Configuration for Reddit API."""
@@ -73,6 +91,9 @@ class RedditConfig(BaseSettings):
     # Rate limiting
     requests_per_minute: int = Field(default=60, description="Reddit API rate limit")
     min_score_threshold: int = Field(default=5, description="Minimum upvote score to store post")
+    max_concurrent_subreddits: int = Field(
+        default=4, ge=1, description="Subreddits fetched concurrently during a harvest"
+    )
 
 
 class RedditHarvester(BaseHarvester):
@@ -89,8 +110,8 @@ class RedditHarvester(BaseHarvester):
             config: Reddit API configuration
         """
         self.config = config or RedditConfig()
-        self.reddit: Optional[praw.Reddit] = None
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        # PRAW clients are not thread safe; each worker thread creates its own
+        self._thread_local = threading.local()
 
         # URL patterns for extracting GitHub/NPM/PyPI links
         self.url_patterns = {
@@ -109,7 +130,37 @@ class RedditHarvester(BaseHarvester):
             r"mcp[-_]?server",
             r"mcp[-_]?tool",
         ]
-        self.mcp_pattern = re.compile("|".join(self.mcp_keywords), re.IGNORECASE)
+
+        # MCP patterns and configured keywords fused into one case-insensitive
+        # alternation, so each post is scanned once without lowercased copies
+        self.relevance_pattern = re.compile(
+            "|".join([*self.mcp_keywords, *map(re.escape, self.config.keywords)]),
+            re.IGNORECASE,
+        )
+
+        # Title categories in priority order. Each branch looks ahead through the
+        # whole title, so the first category with any match wins regardless of
+        # where its keyword appears; the empty named group labels the branch.
+        title_categories = {
+            "TUTORIAL": ["tutorial", "guide", "how to", "walkthrough"],
+            "ANNOUNCEMENT": ["release", "announcing", "launched"],
+            "QUESTION": ["?", "help", "issue", "problem"],
+            "SHOWCASE": ["showcase", "built", "made", "created", "project"],
+            "DISCUSSION": ["discussion", "thoughts", "opinion"],
+        }
+        self.category_pattern = re.compile(
+            "|".join(
+                f"(?=.*?(?:{'|'.join(map(re.escape, words))}))(?P<{category}>)"
+                for category, words in title_categories.items()
+            ),
+            re.IGNORECASE | re.DOTALL,
+        )
+        self.news_flair_pattern = re.compile("news|announcement", re.IGNORECASE)
+
+        # Server-side search query covering the same keywords as relevance_pattern
+        self.search_query = " OR ".join(
+            f'"{keyword}"' for keyword in ["MCP", *self.config.keywords]
+        )
 
     def _init_reddit(self) -> praw.Reddit:
         """Initialize Reddit API client.
@@ -133,6 +184,17 @@ class RedditHarvester(BaseHarvester):
         logger.info(f"Initialized Reddit API client (read-only: {reddit.read_only})")
         return reddit
 
+    def _thread_reddit(self) -> praw.Reddit:
+        """Return the calling worker thread's Reddit API client, creating it on first use.
+
+        Returns:
+            PRAW Reddit instance owned by the current thread
+        """
+        reddit = getattr(self._thread_local, "reddit", None)
+        if reddit is None:
+            reddit = self._thread_local.reddit = self._init_reddit()
+        return reddit
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=30),
@@ -147,26 +209,27 @@ class RedditHarvester(BaseHarvester):
         Returns:
             Dictionary containing posts data
         """
-        if not self.reddit:
-            # Run in thread pool since PRAW is synchronous
-            self.reddit = await asyncio.to_thread(self._init_reddit)
-
         subreddit_name = url.replace("r/", "").replace("/", "")
         logger.info(f"Fetching posts from r/{subreddit_name}...")
 
         posts_data = []
 
-        # Run PRAW operations in thread pool
+        # Run PRAW operations in thread pool since PRAW is synchronous
         def _fetch_posts():
-            subreddit = self.reddit.subreddit(subreddit_name)
+            subreddit = self._thread_reddit().subreddit(subreddit_name)
+
+            # Let Reddit's search do the filtering; fall back to scanning hot
+            # posts only when the search returns nothing
+            submissions = list(
+                subreddit.search(self.search_query, sort="new", time_filter="month", limit=100)
+            )
+            if not submissions:
+                submissions = subreddit.hot(limit=100)
 
-            # Fetch recent hot posts
-            for submission in subreddit.hot(limit=100):
-                # Check if post is relevant to MCP
+            for submission in submissions:
+                # Re-check relevance locally; search matching is looser than ours
                 text = f"{submission.title} {submission.selftext}"
-                if self.mcp_pattern.search(text) or any(
-                    keyword.lower() in text.lower() for keyword in self.config.keywords
-                ):
+                if self.relevance_pattern.search(text):
                     post_data = {
                         "id": submission.id,
                         "title": submission.title,
@@ -260,6 +323,9 @@ class RedditHarvester(BaseHarvester):
     async def store(self, posts: list[SocialPost], session: AsyncSession) -> list[SocialPost]:
         """Store Reddit posts in database, linking to servers where possible.
 
+        New posts are inserted and known ones have their engagement metrics
+        refreshed, all with a single INSERT ... ON CONFLICT (post_id) statement.
+
         Args:
             posts: List of SocialPost objects to store
             session: Database session
@@ -267,39 +333,35 @@ class RedditHarvester(BaseHarvester):
         Returns:
             List of stored SocialPost objects
         """
-        stored_posts = []
-
-        for post in posts:
-            # Check if post already exists
-            result = await session.execute(
-                select(SocialPost).where(SocialPost.post_id == post.post_id)
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                # Update engagement metrics
-                existing.score = post.score
-                existing.comment_count = post.comment_count
-                existing.share_count = post.share_count
-                logger.debug(f"Updated Reddit post {post.post_id} metrics")
-                stored_posts.append(existing)
-                continue
+        # One row per post; a statement may not upsert the same row twice
+        posts = list({post.post_id: post for post in posts}.values())
+        if not posts:
+            return []
 
-            # Link to mentioned servers
-            mentioned_server_ids = await self._link_servers(post, session)
-            post.mentioned_servers = mentioned_server_ids
+        upsert = dialect_insert(session)
 
-            session.add(post)
-            await session.flush()
-            await session.refresh(post)
+        # Resolve every mentioned URL of the batch with one query up front
+        server_ids_by_url = await self._link_servers(posts, session)
 
-            logger.info(
-                f"Stored Reddit post {post.post_id} from r/{post.subreddit} "
-                f"(score: {post.score}, linked: {len(mentioned_server_ids)} servers)"
-            )
-            stored_posts.append(post)
+        rows = []
+        for post in posts:
+            # Link to mentioned servers; only kept when the post is new
+            post.mentioned_servers = [
+                server_ids_by_url[url] for url in post.mentioned_urls if url in server_ids_by_url
+            ]
+            rows.append(column_values(post))
+
+        statement = upsert(SocialPost).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["post_id"],
+            # Existing posts only get their engagement metrics updated
+            set_={name: statement.excluded[name] for name in _SOCIAL_POST_METRIC_COLUMNS},
+        ).returning(SocialPost)
+        result = await session.scalars(statement, execution_options={"populate_existing": True})
+        stored_posts = list(result)
 
         await session.commit()
+        logger.info(f"Stored {len(stored_posts)} Reddit posts")
         return stored_posts
 
     async def harvest(self, session: AsyncSession) -> dict[str, Any]:
@@ -316,21 +378,26 @@ class RedditHarvester(BaseHarvester):
         all_posts = []
         errors = []
 
-        for subreddit in self.config.subreddits:
-            try:
-                # Fetch posts
-                data = await self.fetch(f"r/{subreddit}")
-
-                # Parse posts
-                posts = await self.parse(data)
-
-                # Store posts
-                stored = await self.store(posts, session)
-                all_posts.extend(stored)
+        # Fetch up to max_concurrent_subreddits at once; stores share one session,
+        # which cannot run statements concurrently, so they take turns
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_subreddits)
+        session_lock = asyncio.Lock()
+        results = await asyncio.gather(
+            *(
+                self._harvest_one(subreddit, session, semaphore, session_lock)
+                for subreddit in self.config.subreddits
+            ),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.error(f"Error harvesting r/{subreddit}: {e}")
-                errors.append({"subreddit": subreddit, "error": str(e)})
+        for subreddit, result in zip(self.config.subreddits, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error harvesting r/{subreddit}: {result}")
+                errors.append({"subreddit": subreddit, "error": str(result)})
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                all_posts.extend(result)
 
         logger.info(
             f"Reddit harvest complete: {len(all_posts)} posts stored from "
@@ -343,6 +410,40 @@ class RedditHarvester(BaseHarvester):
             "errors": errors,
         }
 
+    async def _harvest_one(
+        self,
+        subreddit: str,
+        session: AsyncSession,
+        semaphore: asyncio.Semaphore,
+        session_lock: asyncio.Lock,
+    ) -> list[SocialPost]:
+        """Fetch, parse and store the posts of one subreddit.
+
+        Args:
+            subreddit: Subreddit name
+            session: Database session shared by the whole harvest
+            semaphore: Bounds concurrent Reddit API fetches
+            session_lock: Serializes writes through the shared session
+
+        Returns:
+            Stored SocialPost objects
+        """
+        # Fetch posts
+        async with semaphore:
+            data = await self.fetch(f"r/{subreddit}")
+
+        # Parse posts
+        posts = await self.parse(data)
+
+        # Store posts
+        async with session_lock:
+            try:
+                return await self.store(posts, session)
+            except Exception:
+                # Leave the shared session usable for the other subreddits
+                await session.rollback()
+                raise
+
     def _extract_urls(self, text: str) -> list[str]:
         """Extract GitHub, NPM, PyPI URLs from text."""
         urls = []
@@ -352,28 +453,20 @@ class RedditHarvester(BaseHarvester):
 
     def _categorize_post(self, post_data: dict) -> ContentCategory:
         """Categorize post based on title and flair."""
-        title = post_data["title"].lower()
-        flair = (post_data.get("flair") or "").lower()
-
-        if any(word in title for word in ["tutorial", "guide", "how to", "walkthrough"]):
-            return ContentCategory.TUTORIAL
-        elif any(word in title for word in ["release", "announcing", "launched"]):
-            return ContentCategory.ANNOUNCEMENT
-        elif any(word in title for word in ["?", "help", "issue", "problem"]):
-            return ContentCategory.QUESTION
-        elif any(word in title for word in ["showcase", "built", "made", "created", "project"]):
-            return ContentCategory.SHOWCASE
-        elif any(word in flair for word in ["news", "announcement"]):
+        match = self.category_pattern.match(post_data["title"])
+        category = match.lastgroup if match else None
+
+        # News flair outranks discussion keywords and an uncategorized title
+        if category in (None, "DISCUSSION") and self.news_flair_pattern.search(
+            post_data.get("flair") or ""
+        ):
             return ContentCategory.NEWS
-        elif any(word in title for word in ["discussion", "thoughts", "opinion"]):
-            return ContentCategory.DISCUSSION
-        else:
-            return ContentCategory.OTHER
+
+        return ContentCategory[category] if category else ContentCategory.OTHER
 
     def _analyze_sentiment(self, text: str) -> SentimentScore:
         """Analyze sentiment of post using VADER."""
-        scores = self.sentiment_analyzer.polarity_scores(text)
-        compound = scores["compound"]
+        compound = _vader_compound(text)
 
         if compound >= 0.5:
             return SentimentScore.VERY_POSITIVE
@@ -437,17 +530,29 @@ class RedditHarvester(BaseHarvester):
 
         return min(100, score)
 
-    async def _link_servers(self, post: SocialPost, session: AsyncSession) -> list[int]:
-        """Link post to mentioned servers by matching URLs."""
-        server_ids = []
+    async def _link_servers(self, posts: list[SocialPost], session: AsyncSession) -> dict[str, int]:
+        """Map URLs mentioned in posts to the servers whose primary URL contains them.
 
-        for url in post.mentioned_urls:
-            # Try to find matching server
-            result = await session.execute(select(Server).where(Server.primary_url.contains(url)))
-            server = result.scalar_one_or_none()
+        All URLs of the batch are matched with a single query. When several
+        servers match a URL, the earliest stored one is linked.
+        """
+        urls = {url for post in posts for url in post.mentioned_urls}
+        if not urls:
+            return {}
+
+        result = await session.execute(
+            select(Server.id, Server.name, Server.primary_url)
+            .where(or_(*(Server.primary_url.contains(url) for url in urls)))
+            .order_by(Server.id)
+        )
 
-            if server:
-                server_ids.append(server.id)
-                logger.debug(f"Linked post {post.post_id} to server {server.name}")
+        server_ids_by_url: dict[str, int] = {}
+        for server_id, name, primary_url in result:
+            # LIKE is case-insensitive on some databases, so match the same way here
+            primary_url = primary_url.lower()
+            for url in urls:
+                if url.lower() in primary_url and url not in server_ids_by_url:
+                    server_ids_by_url[url] = server_id
+                    logger.debug(f"Linked {url} to server {name}")
 
-        return server_ids
+        return server_ids_by_url
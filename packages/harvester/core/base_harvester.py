@@ -4,9 +4,10 @@ This module implements the polymorphic strategy pattern referenced in PRD Sectio
 All harvester strategies (GitHub, NPM, PyPI, Docker, HTTP) must inherit from this base.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from sqlmodel import select
@@ -238,3 +239,57 @@ class BaseHarvester(ABC):
             logger.error(f"Error harvesting {url}: {error_msg}")
             await self._mark_processing_failed(url, error_msg)
             raise HarvesterError(error_msg) from e
+
+    async def harvest_many(self, urls: List[str], concurrency: int = 16) -> List[Server]:
+        """Harvest many URLs with bounded concurrency.
+
+        Network work (fetch + parse) runs concurrently, at most ``concurrency``
+        URLs at a time, and results are stored as they complete so slow sources
+        don't hold up fast ones. All database work (checkpointing and store)
+        stays serialized on this harvester's session. Failures are recorded in
+        the processing log and do not abort the batch.
+
+        Args:
+            urls: Source URLs or identifiers to harvest
+            concurrency: Maximum number of URLs fetched at once
+
+        Returns:
+            Servers that were stored successfully
+
+        Example:
+            servers = await harvester.harvest_many(["@scope/a", "b"], concurrency=8)
+        """
+        pending: List[str] = []
+        for url in dict.fromkeys(urls):
+            log = await self._get_processing_log(url)
+            if log and log.status == "completed":
+                logger.info(f"Skipping {url} - already completed")
+                continue
+            await self._mark_processing_started(url)
+            pending.append(url)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_and_parse(url: str) -> Tuple[str, Optional[Server], Optional[Exception]]:
+            async with semaphore:
+                try:
+                    return url, await self.parse(await self.fetch(url)), None
+                except Exception as e:
+                    return url, None, e
+
+        servers: List[Server] = []
+        for next_result in asyncio.as_completed([fetch_and_parse(url) for url in pending]):
+            url, server, error = await next_result
+            try:
+                if error is not None:
+                    raise error
+                await self.store(server, self.session)
+            except Exception as e:
+                await self._mark_processing_failed(url, f"Harvesting failed: {str(e)}")
+                continue
+
+            await self._mark_processing_completed(url)
+            servers.append(server)
+
+        logger.success(f"Harvested {len(servers)}/{len(pending)} URLs with {type(self).__name__}")
+        return servers
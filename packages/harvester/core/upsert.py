@@ -0,0 +1,118 @@
+"""Dialect-aware upsert helpers shared by the harvester adapters.
+
+Adapters persist their entities with a single INSERT ... ON CONFLICT DO UPDATE
+statement instead of a SELECT followed by an ORM flush. Keeping the supported
+dialects and the columns an upsert may overwrite here means every adapter
+follows the same rules.
+"""
+
+import functools
+from typing import Any, Callable, Dict, Tuple, Type
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import SQLModel, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from packages.harvester.core.base_harvester import HarvesterError
+from packages.harvester.models.models import Server, Tool, ToolEmbedding
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+DIALECT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Server columns an upsert must never overwrite on an existing row
+SERVER_IMMUTABLE_COLUMNS = frozenset({"uuid", "primary_url", "created_at"})
+
+# Child table replaced on every server store: (model, Server relationship, Core INSERT)
+ChildTable = Tuple[Type[SQLModel], str, Any]
+
+
+def dialect_insert(session: AsyncSession) -> Callable[..., Any]:
+    """Return the INSERT construct supporting ON CONFLICT for the session's database.
+
+    Args:
+        session: Database session the statement will run on
+
+    Returns:
+        The dialect's ``insert`` function
+
+    Raises:
+        HarvesterError: If the database dialect has no upsert support
+    """
+    dialect = session.get_bind().dialect.name
+    upsert = DIALECT_INSERTS.get(dialect)
+    if upsert is None:
+        raise HarvesterError(f"Upsert not supported for {dialect} databases")
+    return upsert
+
+
+def server_child_tables(*relationships: Tuple[Type[SQLModel], str]) -> Tuple[ChildTable, ...]:
+    """Pair child models and their Server relationships with reusable Core INSERTs.
+
+    The INSERT constructs are built once and reused for every executemany.
+    """
+    return tuple(
+        (model, relationship, insert(model.__table__)) for model, relationship in relationships
+    )
+
+
+@functools.cache
+def insert_columns(model: Type[SQLModel]) -> Tuple[str, ...]:
+    """Return a table's column names, leaving the primary key to the database."""
+    return tuple(column.name for column in model.__table__.columns if not column.primary_key)
+
+
+def column_values(entity: SQLModel) -> Dict[str, Any]:
+    """Return an entity's insertable column values."""
+    return {name: getattr(entity, name) for name in insert_columns(type(entity))}
+
+
+async def upsert_server(
+    session: AsyncSession, server: Server, child_tables: Tuple[ChildTable, ...]
+) -> int:
+    """Upsert a server by primary_url and replace its related rows.
+
+    The server row is written with one INSERT ... ON CONFLICT (primary_url)
+    statement, then each child table is replaced with one bulk DELETE and one
+    Core executemany INSERT. Committing is left to the caller.
+
+    Args:
+        session: Database session to use
+        server: Server model to persist; its id is set from the stored row
+        child_tables: Child tables to replace, from server_child_tables()
+
+    Returns:
+        Database id of the server row
+
+    Raises:
+        HarvesterError: If the database dialect has no upsert support
+    """
+    upsert = dialect_insert(session)
+
+    values = column_values(server)
+    statement = upsert(Server).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=["primary_url"],
+        set_={
+            name: statement.excluded[name]
+            for name in values
+            if name not in SERVER_IMMUTABLE_COLUMNS
+        },
+    ).returning(Server.id)
+    server_id = (await session.execute(statement)).scalar_one()
+    server.id = server_id
+
+    # Embeddings hang off tools, so they go before the tools are replaced
+    tool_ids = select(Tool.id).where(Tool.server_id == server_id)
+    await session.execute(delete(ToolEmbedding).where(ToolEmbedding.tool_id.in_(tool_ids)))
+    for model, relationship, insert_statement in child_tables:
+        await session.execute(delete(model).where(model.server_id == server_id))
+        if entities := getattr(server, relationship):
+            # Core executemany against the table, bypassing ORM unit-of-work
+            await session.execute(
+                insert_statement,
+                [{**column_values(entity), "server_id": server_id} for entity in entities],
+            )
+
+    return server_id
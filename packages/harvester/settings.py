@@ -127,6 +127,14 @@ class Settings(BaseSettings):
         default=True,
         description="Continue operation if cache fails",
     )
+    npm_metadata_cache_dir: Path | None = Field(
+        default=None,
+        description="Directory persisting NPM registry metadata between runs (None to disable)",
+    )
+    pypi_metadata_cache_dir: Path | None = Field(
+        default=None,
+        description="Directory persisting PyPI JSON API responses between runs (None to disable)",
+    )
 
     # Logging
     log_level: str = Field(
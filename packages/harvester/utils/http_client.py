@@ -32,7 +32,8 @@ def get_client() -> httpx.AsyncClient:
     """Get or create the global HTTP client instance.
 
     Returns a configured httpx.AsyncClient with:
-    - Connection pooling (limit=10)
+    - HTTP/2 so concurrent requests to one host share a connection
+    - Connection pooling (200 connections, 50 kept alive for 30s)
     - Reasonable timeouts
     - Custom headers for identification
 
@@ -46,10 +47,15 @@ def get_client() -> httpx.AsyncClient:
     global _global_client
 
     if _global_client is None:
-        limits = httpx.Limits(max_keepalive_connections=10, max_connections=10)
+        limits = httpx.Limits(
+            max_keepalive_connections=50,
+            max_connections=200,
+            keepalive_expiry=30.0,
+        )
         timeout = httpx.Timeout(30.0, connect=10.0)
 
         _global_client = httpx.AsyncClient(
+            http2=True,
             limits=limits,
             timeout=timeout,
             headers={
@@ -57,7 +63,7 @@ def get_client() -> httpx.AsyncClient:
             },
             follow_redirects=True,
         )
-        logger.debug("Created global HTTP client with connection limit=10")
+        logger.debug("Created global HTTP/2 client with connection limit=200")
 
     return _global_client
 
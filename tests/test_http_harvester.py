@@ -0,0 +1,394 @@
+"""Tests for HTTP harvester adapter.
+
+This test suite validates the HTTPHarvester implementation including:
+- URL normalization
+- Endpoint probing (GET with conditional OPTIONS fallback)
+- MCP header detection
+- Health score calculation
+- Risk level determination
+- Upserting servers and their related entities
+"""
+
+import asyncio
+import itertools
+import json
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from packages.harvester.adapters.http import _FEATURE_TABLE, HTTPHarvester
+from packages.harvester.core.base_harvester import HarvesterError
+from packages.harvester.core.models import HostType, RiskLevel
+from packages.harvester.models.models import Prompt, Server, Tool
+
+
+@pytest.fixture(autouse=True)
+def _reset_known_hosts():
+    """Keep the shared known-host cache from leaking between tests."""
+    HTTPHarvester._KNOWN_NON_CORS.clear()
+    yield
+    HTTPHarvester._KNOWN_NON_CORS.clear()
+
+
+def _mock_client(handler, seen: List[str]) -> httpx.AsyncClient:
+    """Build an AsyncClient whose transport records request methods."""
+
+    def recording_handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.method)
+        return handler(request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(recording_handler))
+
+
+class TestHTTPHarvester:
+    """Test suite for HTTPHarvester."""
+
+    def test_normalize_url(self):
+        """Test URL normalization adds a default scheme."""
+        harvester = HTTPHarvester(MagicMock())
+
+        assert harvester._normalize_url("mcp.example.com/sse") == "https://mcp.example.com/sse"
+        assert harvester._normalize_url("http://localhost:3000") == "http://localhost:3000"
+
+        with pytest.raises(HarvesterError):
+            harvester._normalize_url("https://")
+
+    def test_split_url(self):
+        """Test splitting URLs into scheme, netloc and path."""
+        harvester = HTTPHarvester(MagicMock())
+
+        assert harvester._split_url("https://mcp.example.com/sse?x=1") == (
+            "https",
+            "mcp.example.com",
+            "/sse",
+        )
+        assert harvester._split_url("http://localhost:3000") == ("http", "localhost:3000", "/")
+
+    def test_is_loopback_host(self):
+        """Test loopback detection used to skip OPTIONS probes."""
+        harvester = HTTPHarvester(MagicMock())
+
+        assert harvester._is_loopback_host("localhost:3000") is True
+        assert harvester._is_loopback_host("[::1]:8080") is True
+        assert harvester._is_loopback_host("printer.local") is True
+        assert harvester._is_loopback_host("mcp.example.com") is False
+
+    def test_known_non_cors_hosts_are_bounded(self):
+        """The shared known-host set should evict its least recently seen hosts."""
+        harvester = HTTPHarvester(MagicMock())
+        harvester.KNOWN_NON_CORS_SIZE = 2
+
+        harvester._remember_non_cors_host("a.example.com")
+        harvester._remember_non_cors_host("b.example.com")
+        harvester._remember_non_cors_host("a.example.com")
+        harvester._remember_non_cors_host("c.example.com")
+
+        assert list(HTTPHarvester._KNOWN_NON_CORS) == ["a.example.com", "c.example.com"]
+
+    def test_detect_mcp_headers(self):
+        """Test detection of MCP-specific headers."""
+        harvester = HTTPHarvester(MagicMock())
+
+        assert harvester._detect_mcp_headers(httpx.Headers({"X-MCP-Version": "1.0"})) is True
+        assert harvester._detect_mcp_headers(httpx.Headers({"content-type": "text/html"})) is False
+
+    def test_determine_risk_level(self):
+        """Test risk level determination."""
+        harvester = HTTPHarvester(MagicMock())
+
+        assert harvester._determine_risk_level(is_https=False, has_tools=True) == RiskLevel.HIGH
+        assert harvester._determine_risk_level(is_https=True, has_tools=False) == RiskLevel.UNKNOWN
+        assert harvester._determine_risk_level(is_https=True, has_tools=True) == RiskLevel.MODERATE
+
+    def test_calculate_health_score(self):
+        """Test health score calculation algorithm."""
+        harvester = HTTPHarvester(MagicMock())
+
+        score = harvester._calculate_health_score(
+            is_https=True,
+            has_tools=True,
+            has_resources=True,
+            has_prompts=True,
+            introspection_success=True,
+        )
+        assert score == 100
+
+        score = harvester._calculate_health_score(
+            is_https=False,
+            has_tools=False,
+            has_resources=False,
+            has_prompts=False,
+            introspection_success=False,
+        )
+        assert score == 20
+
+    def test_feature_table_matches_reference_helpers(self):
+        """The precomputed lookup table must agree with the scoring helpers."""
+        harvester = HTTPHarvester(MagicMock())
+
+        for flags in itertools.product([False, True], repeat=5):
+            is_https, has_tools, has_resources, has_prompts, introspected = flags
+            features = harvester._pack_features(*flags)
+
+            assert _FEATURE_TABLE[features] == (
+                harvester._determine_risk_level(is_https=is_https, has_tools=has_tools),
+                harvester._calculate_health_score(
+                    is_https=is_https,
+                    has_tools=has_tools,
+                    has_resources=has_resources,
+                    has_prompts=has_prompts,
+                    introspection_success=introspected,
+                ),
+            )
+
+
+@pytest.mark.asyncio
+class TestHTTPHarvesterFetch:
+    """Probe tests using a mocked transport."""
+
+    async def test_fetch_skips_options_when_get_is_conclusive(self):
+        """GET exposing MCP headers should not trigger an OPTIONS request."""
+        seen: List[str] = []
+        client = _mock_client(
+            lambda _request: httpx.Response(200, headers={"X-MCP-Version": "2024-11-05"}),
+            seen,
+        )
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            data = await harvester.fetch("https://mcp.example.com/mcp")
+
+        assert seen == ["GET"]
+        assert data["is_mcp"] is True
+        assert data["is_sse"] is False
+
+    async def test_fetch_falls_back_to_options(self):
+        """A 405 on GET should fall back to OPTIONS and merge headers."""
+        seen: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "OPTIONS":
+                return httpx.Response(204, headers={"X-MCP-Protocol": "jsonrpc"})
+            return httpx.Response(405)
+
+        client = _mock_client(handler, seen)
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            data = await harvester.fetch("https://mcp.example.com/mcp")
+
+        assert seen == ["GET", "OPTIONS"]
+        assert data["is_mcp"] is True
+        assert data["status_code"] == 405
+
+    async def test_fetch_skips_options_for_loopback(self):
+        """Loopback endpoints never need a CORS preflight."""
+        seen: List[str] = []
+        client = _mock_client(lambda _request: httpx.Response(200), seen)
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            data = await harvester.fetch("http://localhost:3000")
+
+        assert seen == ["GET"]
+        assert data["is_mcp"] is False
+
+    async def test_parse_non_mcp_endpoint_returns_stub(self):
+        """Endpoints without MCP indicators should yield a minimal server."""
+        harvester = HTTPHarvester(MagicMock())
+
+        server = await harvester.parse(
+            {"url": "https://www.example.com/", "is_mcp": False, "is_sse": False}
+        )
+
+        assert server.name == "MCP Server @ www.example.com"
+        assert server.risk_level == RiskLevel.UNKNOWN
+        assert server.health_score == 30
+        assert server.description is None
+        assert server.tools == []
+
+    async def test_parse_sse_endpoint_builds_related_entities(self):
+        """Introspection results should become tools, resources and prompts."""
+        harvester = HTTPHarvester(MagicMock())
+        introspection = {
+            "serverInfo": {"name": "demo", "version": "1.2.0"},
+            "tools": [{"name": "search", "inputSchema": {"type": "object"}}, {}],
+            "resources": [{"uriTemplate": "file://{path}", "mimeType": "text/plain"}],
+            "prompts": [{"name": "summarize", "arguments": [{"name": "text"}]}],
+        }
+
+        with patch.object(harvester, "_introspect_mcp_server", return_value=introspection):
+            server = await harvester.parse(
+                {"url": "https://mcp.example.com/sse", "is_mcp": True, "is_sse": True}
+            )
+
+        assert server.name == "demo"
+        assert [tool.name for tool in server.tools] == ["search", "unknown"]
+        assert server.tools[0].input_schema == {"type": "object"}
+        assert server.resources[0].uri_template == "file://{path}"
+        assert server.prompts[0].arguments == [{"name": "text"}]
+        assert server.risk_level == RiskLevel.MODERATE
+        assert server.health_score == 100
+
+    async def test_introspect_uses_single_batch_request(self):
+        """Introspection should send all JSON-RPC calls in one batch POST."""
+        seen: List[str] = []
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json=[
+                    {"jsonrpc": "2.0", "id": 4, "result": {"prompts": [{"name": "p"}]}},
+                    {"jsonrpc": "2.0", "id": 2, "result": {"tools": [{"name": "t"}]}},
+                    {"jsonrpc": "2.0", "id": 1, "result": {"serverInfo": {"name": "demo"}}},
+                    {"jsonrpc": "2.0", "id": 3, "error": {"code": -32601}},
+                ],
+            )
+
+        client = _mock_client(handler, seen)
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            result = await harvester._introspect_mcp_server("https://mcp.example.com/sse")
+
+        assert seen == ["POST"]
+        assert result["serverInfo"] == {"name": "demo"}
+        assert result["tools"] == [{"name": "t"}]
+        assert result["resources"] == []
+        assert result["prompts"] == [{"name": "p"}]
+
+    async def test_introspect_falls_back_when_batch_rejected(self):
+        """An Invalid Request error should fall back to one POST per call."""
+        seen: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            if isinstance(payload, list):
+                return httpx.Response(
+                    200,
+                    json={"jsonrpc": "2.0", "id": None, "error": {"code": -32600}},
+                )
+            if payload["method"] == "tools/list":
+                return httpx.Response(
+                    200, json={"jsonrpc": "2.0", "id": 2, "result": {"tools": [{"name": "t"}]}}
+                )
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": {}})
+
+        client = _mock_client(handler, seen)
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            result = await harvester._introspect_mcp_server("https://mcp.example.com/sse")
+
+        assert seen == ["POST"] * 5
+        assert result["tools"] == [{"name": "t"}]
+
+    async def test_introspect_respects_concurrency_limit(self):
+        """Concurrent introspections should never exceed the slot limit."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(_request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": 2, "result": {"tools": []}}])
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = HTTPHarvester(MagicMock())
+        original_limit = HTTPHarvester.MAX_CONCURRENT_INTROSPECTIONS
+
+        try:
+            await HTTPHarvester.set_max_introspections(2)
+            with patch("packages.harvester.adapters.http.get_client", return_value=client):
+                results = await asyncio.gather(
+                    *(
+                        harvester._introspect_mcp_server(f"https://mcp{i}.example.com/sse")
+                        for i in range(6)
+                    )
+                )
+        finally:
+            await HTTPHarvester.set_max_introspections(original_limit)
+
+        assert all(result is not None for result in results)
+        assert peak == 2
+
+    async def test_introspect_reads_sse_replies(self):
+        """Replies streamed as SSE frames should be parsed incrementally."""
+        seen: List[str] = []
+        frames = [
+            {"jsonrpc": "2.0", "id": 1, "result": {"serverInfo": {"name": "demo"}}},
+            {"jsonrpc": "2.0", "id": 2, "result": {"tools": [{"name": "t"}]}},
+            {"jsonrpc": "2.0", "id": 3, "result": {"resources": []}},
+            {"jsonrpc": "2.0", "id": 4, "result": {"prompts": []}},
+        ]
+        body = "".join(f"event: message\ndata: {json.dumps(frame)}\n\n" for frame in frames)
+
+        client = _mock_client(
+            lambda _request: httpx.Response(
+                200, headers={"Content-Type": "text/event-stream"}, text=body
+            ),
+            seen,
+        )
+        harvester = HTTPHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.http.get_client", return_value=client):
+            result = await harvester._introspect_mcp_server("https://mcp.example.com/sse")
+
+        assert seen == ["POST"]
+        assert result["serverInfo"] == {"name": "demo"}
+        assert result["tools"] == [{"name": "t"}]
+
+
+@pytest.mark.asyncio
+class TestHTTPHarvesterStore:
+    """Storage tests against an in-memory SQLite database."""
+
+    @pytest_asyncio.fixture
+    async def session(self):
+        """Create an async session bound to a fresh in-memory database."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+        await engine.dispose()
+
+    @staticmethod
+    def _server(tool_names: List[str]) -> Server:
+        server = Server(
+            name="demo",
+            primary_url="https://mcp.example.com/sse",
+            host_type=HostType.HTTP,
+        )
+        server.tools = [Tool(name=name) for name in tool_names]
+        server.prompts = [Prompt(name="summarize")]
+        return server
+
+    async def test_store_replaces_related_entities(self, session):
+        """Re-storing a server should replace, not accumulate, its children."""
+        harvester = HTTPHarvester(session)
+
+        await harvester.store(self._server(["a", "b", "c"]), session)
+        await harvester.store(self._server(["d"]), session)
+
+        servers = (await session.exec(select(Server))).all()
+        tools = (await session.exec(select(Tool))).all()
+        prompts = (await session.exec(select(Prompt))).all()
+
+        assert len(servers) == 1
+        assert [tool.name for tool in tools] == ["d"]
+        assert all(tool.server_id == servers[0].id for tool in tools)
+        assert len(prompts) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
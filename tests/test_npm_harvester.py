@@ -0,0 +1,654 @@
+"""Tests for NPM harvester adapter.
+
+This test suite validates the NPMHarvester implementation including:
+- Package name normalization
+- Streaming package.json extraction from registry tarballs
+- Zip bomb protection
+- Parsing package.json into Server entities
+- Upserting servers and their related entities
+- Batch harvesting with checkpointing
+"""
+
+import asyncio
+import io
+import json
+import math
+import random
+import tarfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from packages.harvester.adapters.npm import NPMHarvester
+from packages.harvester.core.base_harvester import HarvesterError
+from packages.harvester.core.models import HostType
+from packages.harvester.models.models import Dependency, ProcessingLog, Release, Server, Tool
+from packages.harvester.settings import settings
+
+TARBALL_URL = "https://registry.npmjs.org/@scope/demo/-/demo-1.0.0.tgz"
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry_cache():
+    """Keep the shared conditional-GET cache from leaking between tests."""
+    NPMHarvester._registry_cache.clear()
+    yield
+    NPMHarvester._registry_cache.clear()
+
+
+def _make_tarball(files: Dict[str, bytes], symlinks: Optional[Dict[str, str]] = None) -> bytes:
+    """Build an in-memory .tgz containing the given members."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, target in (symlinks or {}).items():
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tar.addfile(info)
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def _registry_data() -> Dict:
+    return {
+        "name": "@scope/demo",
+        "dist-tags": {"latest": "1.0.0"},
+        "versions": {"1.0.0": {"dist": {"tarball": TARBALL_URL}}},
+        "time": {"1.0.0": "2024-01-01T00:00:00.000Z"},
+    }
+
+
+def _mock_client(tarball: bytes, accepts: Optional[List[str]] = None) -> httpx.AsyncClient:
+    """Build an AsyncClient serving the registry document and tarball."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if accepts is not None:
+            accepts.append(request.headers.get("Accept", ""))
+        if str(request.url) == TARBALL_URL:
+            return httpx.Response(200, content=tarball)
+        return httpx.Response(200, json=_registry_data())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestNPMHarvester:
+    """Test suite for NPMHarvester."""
+
+    def test_normalize_package_name(self):
+        """Test normalization of the supported package identifier formats."""
+        harvester = NPMHarvester(MagicMock())
+
+        assert harvester._normalize_package_name("npm://@scope/package") == "@scope/package"
+        assert harvester._normalize_package_name("@scope/package@1.2.3") == "@scope/package"
+        assert harvester._normalize_package_name("simple-pkg@2.0.0") == "simple-pkg"
+        assert (
+            harvester._normalize_package_name("https://www.npmjs.com/package/simple-pkg")
+            == "simple-pkg"
+        )
+        assert (
+            harvester._normalize_package_name("https://www.npmjs.com/package/%40scope/pkg/v/1.0.0")
+            == "@scope/pkg"
+        )
+
+    def test_extract_github_url(self):
+        """Test GitHub URL extraction from package.json repository fields."""
+        harvester = NPMHarvester(MagicMock())
+
+        assert (
+            harvester._extract_github_url(
+                {"type": "git", "url": "git+https://github.com/user/repo.git"}
+            )
+            == "https://github.com/user/repo"
+        )
+        assert harvester._extract_github_url("github:user/repo") == "https://github.com/user/repo"
+        assert (
+            harvester._extract_github_url("git@github.com:user/repo.git")
+            == "https://github.com/user/repo"
+        )
+        assert harvester._extract_github_url("https://gitlab.com/user/repo") is None
+        assert harvester._extract_github_url("gitlab:user/repo") is None
+        assert harvester._extract_github_url(None) is None
+
+    def test_parse_mcp_servers_skips_malformed_entries(self):
+        """Malformed entries should be skipped without dropping valid ones."""
+        harvester = NPMHarvester(MagicMock())
+        server = Server(name="demo", primary_url="npm://demo", host_type=HostType.NPM)
+
+        harvester._parse_mcp_servers(
+            server,
+            {
+                "broken": "not-an-object",
+                "first": {"tools": ["oops", {"name": "read"}], "resources": "oops"},
+                "second": {
+                    "tools": [{"name": "write", "inputSchema": {"type": "object"}}],
+                    "prompts": [{"name": "summarize"}],
+                },
+            },
+        )
+
+        assert [tool.name for tool in server.tools] == ["read", "write"]
+        assert server.tools[1].input_schema == {"type": "object"}
+        assert server.resources == []
+        assert [prompt.name for prompt in server.prompts] == ["summarize"]
+
+    def test_parse_npm_dependencies(self):
+        """Each dependency section should map to its Dependency type."""
+        harvester = NPMHarvester(MagicMock())
+        server = Server(name="demo", primary_url="npm://demo", host_type=HostType.NPM)
+
+        harvester._parse_npm_dependencies(
+            server,
+            {
+                "dependencies": {"zod": "^3.0.0"},
+                "devDependencies": {"vitest": "^1.0.0"},
+                "peerDependencies": {"react": ">=18"},
+                "optionalDependencies": {"fsevents": "*"},
+                "bundledDependencies": ["zod"],
+            },
+        )
+
+        assert [
+            (dep.library_name, dep.type, dep.version_constraint) for dep in server.dependencies
+        ] == [
+            ("zod", "runtime", "^3.0.0"),
+            ("vitest", "dev", "^1.0.0"),
+            ("react", "peer", ">=18"),
+        ]
+
+    def test_has_dangerous_dependencies(self):
+        """Execution deps are always risky, filesystem deps only at runtime."""
+        harvester = NPMHarvester(MagicMock())
+
+        def deps(*specs):
+            return [
+                Dependency(library_name=name, ecosystem=ecosystem, type=dep_type)
+                for name, ecosystem, dep_type in specs
+            ]
+
+        assert harvester._has_dangerous_dependencies(deps(("ShellJS", "npm", "dev"))) is True
+        assert harvester._has_dangerous_dependencies(deps(("fs-extra", "npm", "runtime"))) is True
+        assert harvester._has_dangerous_dependencies(deps(("fs-extra", "npm", "dev"))) is False
+        assert harvester._has_dangerous_dependencies(deps(("execa", "pypi", "runtime"))) is False
+        assert harvester._has_dangerous_dependencies([]) is False
+
+    def test_calculate_health_score(self):
+        """Download contributions should follow the logarithmic scoring formula."""
+        harvester = NPMHarvester(MagicMock())
+
+        def score(downloads: int, weekly_downloads: int) -> int:
+            return harvester._calculate_health_score(
+                downloads=downloads,
+                weekly_downloads=weekly_downloads,
+                has_readme=False,
+                has_license=False,
+                has_repository=False,
+                version_count=1,
+                has_tests=False,
+            )
+
+        for downloads in (0, 1, 9, 10, 99, 999, 12345, 99999, 100000, 10**9):
+            expected = 15
+            if downloads > 0:
+                expected += min(20, int(math.log10(downloads + 1) * 4))
+                expected += min(15, int(math.log10(downloads + 1) * 3))
+            assert score(downloads, downloads) == expected
+
+        assert score(10**9, 10**9) == 50
+
+    def test_parse_version_history_keeps_newest_five(self):
+        """Only the five most recently published versions become releases."""
+        harvester = NPMHarvester(MagicMock())
+        server = Server(name="demo", primary_url="npm://demo", host_type=HostType.NPM)
+        published = {f"1.{minor}.0": f"2024-0{9 - minor}-01T00:00:00.000Z" for minor in range(7)}
+
+        harvester._parse_version_history(
+            server,
+            {
+                "versions": {version: {} for version in published},
+                "time": {"created": "2023-01-01T00:00:00.000Z", **published},
+            },
+            datetime(2024, 12, 1),
+        )
+
+        assert [release.version for release in server.releases] == [
+            "1.0.0",
+            "1.1.0",
+            "1.2.0",
+            "1.3.0",
+            "1.4.0",
+        ]
+
+    def test_parse_version_history_without_time(self):
+        """Abbreviated packuments have no publish times, so no releases are invented."""
+        harvester = NPMHarvester(MagicMock())
+        server = Server(name="demo", primary_url="npm://demo", host_type=HostType.NPM)
+
+        harvester._parse_version_history(
+            server,
+            {
+                "modified": "2024-06-01T12:00:00.000Z",
+                "versions": {f"1.{minor}.0": {} for minor in range(8)},
+            },
+            datetime(2024, 12, 1),
+        )
+
+        assert server.releases == []
+
+
+@pytest.mark.asyncio
+class TestNPMHarvesterFetch:
+    """Fetch tests using a mocked transport."""
+
+    async def test_fetch_streams_package_json(self):
+        """fetch should return the extracted package.json instead of the tarball."""
+        package_json = {"name": "@scope/demo", "description": "Demo server"}
+        tarball = _make_tarball(
+            {
+                "package/README.md": b"# demo",
+                "package/package.json": json.dumps(package_json).encode(),
+            }
+        )
+        harvester = NPMHarvester(MagicMock())
+        accepts: List[str] = []
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client",
+            return_value=_mock_client(tarball, accepts),
+        ):
+            data = await harvester.fetch("@scope/demo")
+
+        # Release history needs the publish times only the full packument carries
+        assert accepts[0] == "application/json"
+        assert "tarball_content" not in data
+        assert json.loads(data["package_json_content"]) == package_json
+        assert data["latest_version"] == "1.0.0"
+
+    async def test_fetch_requests_abbreviated_packument_without_history(self):
+        """With release history disabled the smaller install-v1 packument suffices."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+        harvester = NPMHarvester(MagicMock())
+        harvester.FETCH_RELEASE_HISTORY = False
+        accepts: List[str] = []
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client",
+            return_value=_mock_client(tarball, accepts),
+        ):
+            await harvester.fetch("@scope/demo")
+
+        assert accepts[0].startswith("application/vnd.npm.install-v1+json")
+
+    async def test_fetch_uses_manifest_embedded_in_packument(self):
+        """Packuments that already include mcpServers should skip the tarball."""
+        registry_data = _registry_data()
+        manifest = registry_data["versions"]["1.0.0"]
+        manifest.update({"name": "@scope/demo", "mcpServers": {"demo": {"tools": [{"name": "x"}]}}})
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            return httpx.Response(200, json=registry_data)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.npm.get_client", return_value=client):
+            data = await harvester.fetch("@scope/demo")
+        server = await harvester.parse(data)
+
+        assert TARBALL_URL not in requested
+        assert data["package_json_content"] is None
+        assert [tool.name for tool in server.tools] == ["x"]
+
+    async def test_fetch_revalidates_cached_packument(self):
+        """A 304 from the registry should reuse the cached package.json."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if str(request.url) == TARBALL_URL:
+                return httpx.Response(200, content=tarball)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=_registry_data(), headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(MagicMock())
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=client),
+            patch.object(settings, "cache_ttl_default", 0),
+        ):
+            first = await harvester.fetch("@scope/demo")
+            second = await harvester.fetch("@scope/demo")
+
+        assert requested.count(TARBALL_URL) == 1
+        assert len(requested) == 3
+        assert second == first
+
+    async def test_fetch_reuses_package_json_for_unchanged_version(self):
+        """A changed packument with the same latest version should skip the tarball."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if str(request.url) == TARBALL_URL:
+                return httpx.Response(200, content=tarball)
+            etag = f'"v{len(requested)}"'
+            return httpx.Response(200, json=_registry_data(), headers={"ETag": etag})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(MagicMock())
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=client),
+            patch.object(settings, "cache_ttl_default", 0),
+        ):
+            first = await harvester.fetch("@scope/demo")
+            second = await harvester.fetch("@scope/demo")
+
+        assert requested.count(TARBALL_URL) == 1
+        assert second["package_json_content"] == first["package_json_content"]
+
+    async def test_fetch_reuses_fresh_packument_without_request(self):
+        """Entries younger than the cache TTL should not hit the registry."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if str(request.url) == TARBALL_URL:
+                return httpx.Response(200, content=tarball)
+            return httpx.Response(200, json=_registry_data(), headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(MagicMock())
+
+        with patch("packages.harvester.adapters.npm.get_client", return_value=client):
+            first = await harvester.fetch("@scope/demo")
+            second = await harvester.fetch("@scope/demo")
+
+        assert len(requested) == 2
+        assert second == first
+
+    async def test_fetch_persists_registry_cache_to_disk(self, tmp_path):
+        """A persisted entry should be revalidated by a fresh process."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if str(request.url) == TARBALL_URL:
+                return httpx.Response(200, content=tarball)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=_registry_data(), headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(MagicMock())
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=client),
+            patch.object(settings, "npm_metadata_cache_dir", tmp_path),
+            patch.object(settings, "cache_ttl_default", 0),
+        ):
+            first = await harvester.fetch("@scope/demo")
+            assert (tmp_path / "%40scope%2Fdemo.json").is_file()
+
+            # Simulate a new process: only the on-disk cache survives
+            NPMHarvester._registry_cache.clear()
+            second = await harvester.fetch("@scope/demo")
+
+        assert requested.count(TARBALL_URL) == 1
+        assert len(requested) == 3
+        assert second == first
+
+    async def test_fetch_falls_back_to_tar_walk_beyond_scan_window(self):
+        """package.json past the fast-path window should still be found."""
+        tarball = _make_tarball(
+            {
+                "package/dist/bundle.js": bytes(range(256)) * 4096,
+                "package/package.json": b'{"name": "@scope/demo"}',
+            }
+        )
+        harvester = NPMHarvester(MagicMock())
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)
+        ):
+            data = await harvester.fetch("@scope/demo")
+
+        assert json.loads(data["package_json_content"]) == {"name": "@scope/demo"}
+
+    async def test_fetch_ignores_nested_package_json(self):
+        """Only the top-level package/package.json should be extracted."""
+        tarball = _make_tarball(
+            {
+                "package/test/fixtures/package.json": b'{"name": "fixture"}',
+                "package/package.json": b'{"name": "@scope/demo"}',
+            }
+        )
+        harvester = NPMHarvester(MagicMock())
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)
+        ):
+            data = await harvester.fetch("@scope/demo")
+
+        assert json.loads(data["package_json_content"]) == {"name": "@scope/demo"}
+
+    async def test_fetch_skips_symlinked_package_json(self):
+        """A symlink named package.json must not be followed."""
+        tarball = _make_tarball(
+            {"package/package.json": b'{"name": "@scope/demo"}'},
+            symlinks={"package/package.json": "/etc/passwd"},
+        )
+        harvester = NPMHarvester(MagicMock())
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)
+        ):
+            data = await harvester.fetch("@scope/demo")
+
+        assert json.loads(data["package_json_content"]) == {"name": "@scope/demo"}
+
+    async def test_fetch_rejects_oversized_archives(self):
+        """Cumulative member sizes above the cap should abort extraction."""
+        tarball = _make_tarball(
+            {
+                "package/big.bin": b"x" * 64,
+                "package/package.json": b"{}",
+            }
+        )
+        harvester = NPMHarvester(MagicMock())
+        harvester.MAX_UNCOMPRESSED_SIZE = 32
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)),
+            pytest.raises(HarvesterError, match="zip bomb"),
+        ):
+            await harvester.fetch("@scope/demo")
+
+    async def test_fetch_rejects_oversized_downloads(self):
+        """Tarballs larger than the download cap should be refused."""
+        tarball = _make_tarball({"package/package.json": b"{}"})
+        harvester = NPMHarvester(MagicMock())
+        harvester.MAX_TARBALL_SIZE = 16
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)),
+            pytest.raises(HarvesterError, match="exceeds limit"),
+        ):
+            await harvester.fetch("@scope/demo")
+
+    async def test_fetch_without_package_json(self):
+        """A tarball without package.json should raise HarvesterError."""
+        tarball = _make_tarball({"package/index.js": b"module.exports = {};"})
+        harvester = NPMHarvester(MagicMock())
+
+        with (
+            patch("packages.harvester.adapters.npm.get_client", return_value=_mock_client(tarball)),
+            pytest.raises(HarvesterError, match=r"No package\.json"),
+        ):
+            await harvester.fetch("@scope/demo")
+
+    @pytest.mark.parametrize("package_json_first", [True, False])
+    async def test_fetch_streams_through_bounded_queue(self, package_json_first):
+        """Many more chunks than queue slots must flow, also after the reader stopped."""
+        files = {"package/dist/bundle.bin": random.Random(0).randbytes(1 << 20)}
+        package_json = {"package/package.json": b'{"name": "@scope/demo"}'}
+        files = {**package_json, **files} if package_json_first else {**files, **package_json}
+        harvester = NPMHarvester(MagicMock())
+        harvester.TAR_BUFFER_SIZE = 4096
+        harvester.STREAM_QUEUE_SIZE = 2
+
+        with patch(
+            "packages.harvester.adapters.npm.get_client",
+            return_value=_mock_client(_make_tarball(files)),
+        ):
+            data = await asyncio.wait_for(harvester.fetch("@scope/demo"), 10)
+
+        assert json.loads(data["package_json_content"]) == {"name": "@scope/demo"}
+
+    async def test_cancelled_download_releases_reader_thread(self):
+        """Cancelling a tarball download must not leave the extraction thread blocked."""
+        tarball = _make_tarball({"package/package.json": b"{}"})
+        chunk_sent = asyncio.Event()
+
+        async def stalled_body():
+            yield tarball[:10]
+            chunk_sent.set()
+            await asyncio.Event().wait()
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=stalled_body())
+
+        harvester = NPMHarvester(MagicMock())
+        reader_done = threading.Event()
+        extract = harvester._extract_package_json
+
+        def tracked_extract(stream):
+            try:
+                return extract(stream)
+            finally:
+                reader_done.set()
+
+        harvester._extract_package_json = tracked_extract
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        download = asyncio.create_task(harvester._stream_package_json(client, TARBALL_URL))
+        await chunk_sent.wait()
+        download.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await download
+        assert await asyncio.to_thread(reader_done.wait, 5)
+
+    async def test_parse_builds_server(self):
+        """parse should build a Server from the fetched package.json."""
+        package_json = {
+            "name": "@scope/demo",
+            "license": "MIT",
+            "repository": "github:user/demo",
+            "dependencies": {"execa": "^8.0.0"},
+            "mcpServers": {"demo": {"tools": [{"name": "echo"}]}},
+        }
+        harvester = NPMHarvester(MagicMock())
+
+        server = await harvester.parse(
+            {
+                "registry_data": _registry_data(),
+                "package_json": None,
+                "package_json_content": json.dumps(package_json).encode(),
+                "package_name": "@scope/demo",
+                "latest_version": "1.0.0",
+            }
+        )
+
+        assert server.primary_url == "npm://@scope/demo"
+        assert server.host_type == HostType.NPM
+        assert [tool.name for tool in server.tools] == ["echo"]
+        assert [dep.library_name for dep in server.dependencies] == ["execa"]
+        assert [release.version for release in server.releases] == ["1.0.0"]
+
+
+@pytest.mark.asyncio
+class TestNPMHarvesterStore:
+    """Storage and batch harvesting against an in-memory SQLite database."""
+
+    @pytest_asyncio.fixture
+    async def session(self):
+        """Create an async session bound to a fresh in-memory database."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+        await engine.dispose()
+
+    @staticmethod
+    def _server(tool_names: List[str], version: str) -> Server:
+        server = Server(name="demo", primary_url="npm://@scope/demo", host_type=HostType.NPM)
+        server.tools = [Tool(name=name) for name in tool_names]
+        server.releases = [Release(version=version, published_at=datetime(2024, 1, 1))]
+        return server
+
+    async def test_store_upserts_and_replaces_related_entities(self, session):
+        """Re-storing a package should update one row and replace its children."""
+        harvester = NPMHarvester(session)
+
+        first = self._server(["a", "b"], "1.0.0")
+        await harvester.store(first, session)
+        second = self._server(["c"], "1.1.0")
+        second.description = "updated"
+        await harvester.store(second, session)
+
+        servers = (await session.exec(select(Server))).all()
+        tools = (await session.exec(select(Tool))).all()
+        releases = (await session.exec(select(Release))).all()
+
+        assert len(servers) == 1
+        assert second.id == first.id == servers[0].id
+        assert servers[0].uuid == first.uuid
+        assert servers[0].description == "updated"
+        assert [tool.name for tool in tools] == ["c"]
+        assert [release.version for release in releases] == ["1.1.0"]
+        assert all(tool.server_id == servers[0].id for tool in tools)
+
+    async def test_harvest_many_stores_successes_and_logs_failures(self, session):
+        """Failed packages should be logged without aborting the batch."""
+        tarball = _make_tarball({"package/package.json": b'{"name": "@scope/demo"}'})
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404)
+            if str(request.url) == TARBALL_URL:
+                return httpx.Response(200, content=tarball)
+            return httpx.Response(200, json=_registry_data())
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = NPMHarvester(session)
+
+        with patch("packages.harvester.adapters.npm.get_client", return_value=client):
+            servers = await harvester.harvest_many(["@scope/demo", "missing"], concurrency=2)
+
+        logs = {log.url: log.status for log in (await session.exec(select(ProcessingLog))).all()}
+
+        assert [server.primary_url for server in servers] == ["npm://@scope/demo"]
+        assert logs == {"@scope/demo": "completed", "missing": "failed"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,591 @@
+"""Tests for PyPI harvester adapter.
+
+This test suite validates the PyPIHarvester implementation including:
+- Server upserts with bulk related-entity replacement
+- Concurrent metadata and download statistics fetching
+- Conditional-GET response caching
+- Wheel inspection through HTTP range requests
+- Sequential sdist extraction
+- Zip bomb protection
+- MCP configuration discovery in archives
+- @mcp.tool decorator detection
+"""
+
+import asyncio
+import io
+import json
+import random
+import tarfile
+import zipfile
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from packages.harvester.adapters.pypi import PyPIHarvester
+from packages.harvester.core.models import DependencyType, HostType
+from packages.harvester.models.models import Dependency, Release, Server, Tool
+from packages.harvester.settings import settings
+
+ARTIFACT_URL = "https://files.pythonhosted.org/packages/demo/demo-1.0.0-py3-none-any.whl"
+
+TOOL_SOURCE = b'''
+import mcp
+
+@mcp.tool
+def search(query):
+    """Search the index."""
+'''
+
+
+@pytest.fixture(autouse=True)
+def _reset_response_cache():
+    """Keep the shared conditional-GET cache from leaking between tests."""
+    PyPIHarvester._response_cache.clear()
+    yield
+    PyPIHarvester._response_cache.clear()
+
+
+def _make_wheel(files: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _make_sdist(files: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def _server() -> Server:
+    return Server(name="demo", primary_url="pypi://demo", host_type=HostType.PYPI)
+
+
+def _mock_client(
+    artifact: bytes, ranges: List[str], support_ranges: bool = True
+) -> httpx.AsyncClient:
+    """Build an AsyncClient serving the artifact, honouring Range headers."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        byte_range = request.headers.get("Range")
+        if byte_range is None or not support_ranges:
+            ranges.append("full")
+            return httpx.Response(200, content=artifact)
+        ranges.append(byte_range)
+        start, end = (int(bound) for bound in byte_range.removeprefix("bytes=").split("-"))
+        return httpx.Response(206, content=artifact[start : end + 1])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _patch_client(client: httpx.AsyncClient):
+    return (
+        patch("packages.harvester.adapters.pypi.get_client", return_value=client),
+        patch("packages.harvester.utils.http_client.get_client", return_value=client),
+    )
+
+
+class TestPyPIHarvester:
+    """Test suite for PyPIHarvester helpers."""
+
+    def test_extract_mcp_decorators(self):
+        """Decorated sync, async, nested and guarded functions should all become tools."""
+        source = """
+import mcp
+from mcp import tool
+
+@mcp.tool
+def search(query):
+    \"\"\"Search the index.\"\"\"
+
+@tool
+async def fetch(url):
+    pass
+
+@other.tool
+def ignored():
+    pass
+
+def build_server():
+    @mcp.tool
+    def nested():
+        pass
+
+if mcp:
+    class Handlers:
+        @mcp.tool
+        def guarded(self):
+            pass
+"""
+        harvester = PyPIHarvester(MagicMock())
+        server = _server()
+
+        harvester._extract_mcp_decorators(server, source, "server.py")
+
+        assert [(tool.name, tool.description) for tool in server.tools] == [
+            ("search", "Search the index."),
+            ("fetch", "Tool: fetch"),
+            ("nested", "Tool: nested"),
+            ("guarded", "Tool: guarded"),
+        ]
+
+    def test_normalize_package_name(self):
+        """Names should be lowercased with underscores mapped to hyphens."""
+        harvester = PyPIHarvester(MagicMock())
+
+        assert harvester._normalize_package_name("My_Package-Name") == "my-package-name"
+        assert harvester._normalize_package_name("mcp-server") == "mcp-server"
+
+    def test_parse_requirement(self):
+        """Requirement strings should yield name, constraint and type."""
+        harvester = PyPIHarvester(MagicMock())
+
+        parsed = harvester._parse_requirement("requests[security]>=2.0; extra == 'test'")
+
+        assert (parsed.name, parsed.version, parsed.type) == (
+            "requests",
+            ">=2.0",
+            DependencyType.DEV,
+        )
+        assert harvester._parse_requirement("httpx") == ("httpx", None, DependencyType.RUNTIME)
+        assert harvester._parse_requirement("uvicorn [standard, http2] >=0.30") == (
+            "uvicorn",
+            ">=0.30",
+            DependencyType.RUNTIME,
+        )
+        assert harvester._parse_requirement("!!!") is None
+
+    @pytest.mark.parametrize(
+        ("requirement", "expected"),
+        [
+            ("zope.interface>=5.0", ("zope.interface", ">=5.0")),
+            ("backports.zoneinfo; python_version < '3.9'", ("backports.zoneinfo", None)),
+            ("jaraco.classes[test] ==3.2.3", ("jaraco.classes", "==3.2.3")),
+            ("ruamel.yaml.clib!=0.2.7", ("ruamel.yaml.clib", "!=0.2.7")),
+            ("zc.lockfile~=3.0", ("zc.lockfile", "~=3.0")),
+            ("pywin32 (>=300)", ("pywin32", "(>=300)")),
+            ("mcp\t<2", ("mcp", "<2")),
+        ],
+    )
+    def test_parse_requirement_name_end(self, requirement, expected):
+        """Only extras, specifiers, markers or whitespace end a name; dots don't."""
+        harvester = PyPIHarvester(MagicMock())
+
+        assert harvester._parse_requirement(requirement)[:2] == expected
+
+    def test_parse_dependencies(self):
+        """requires_dist entries should become PyPI dependencies, skipping unparseable ones."""
+        harvester = PyPIHarvester(MagicMock())
+
+        dependencies = harvester._parse_dependencies(
+            {"requires_dist": ["mcp>=1.0", "!!!", "pytest; extra == 'dev'"]}
+        )
+
+        assert [(dep.library_name, dep.version_constraint, dep.type) for dep in dependencies] == [
+            ("mcp", ">=1.0", DependencyType.RUNTIME),
+            ("pytest", None, DependencyType.DEV),
+        ]
+        assert {dep.ecosystem for dep in dependencies} == {"pypi"}
+
+    def test_has_dangerous_dependencies(self):
+        """Only known remote-access libraries should be flagged, case-insensitively."""
+        harvester = PyPIHarvester(MagicMock())
+
+        def deps(*names):
+            return [Dependency(library_name=name, ecosystem="pypi") for name in names]
+
+        assert harvester._has_dangerous_dependencies(deps("requests", "Paramiko"))
+        assert not harvester._has_dangerous_dependencies(deps("requests", "httpx"))
+        assert not harvester._has_dangerous_dependencies([])
+
+    def test_has_recent_release(self):
+        """Only the newest upload should decide recency, whatever the version order."""
+        harvester = PyPIHarvester(MagicMock())
+        recent = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+        def releases(**upload_times):
+            return {
+                version: [{"upload_time_iso_8601": upload_time}] if upload_time else []
+                for version, upload_time in upload_times.items()
+            }
+
+        assert harvester._has_recent_release(
+            releases(v9="2020-01-01T00:00:00.000000Z", v10=recent, v11=None)
+        )
+        assert not harvester._has_recent_release(releases(v1="2020-01-01T00:00:00.000000Z"))
+        assert not harvester._has_recent_release({})
+
+    def test_parse_python_decorators_prefilters_sources(self):
+        """Sources without a tool decorator should never reach the AST parser."""
+        harvester = PyPIHarvester(MagicMock())
+        server = _server()
+
+        with patch.object(harvester, "_extract_mcp_decorators") as extract:
+            harvester._parse_python_decorators(server, b"def helper():\n    pass\n", "a.py")
+            harvester._parse_python_decorators(server, b"@mcp . tool\ndef f(): ...\n", "b.py")
+
+        assert [call.args[2] for call in extract.call_args_list] == ["b.py"]
+
+    def test_parse_pyproject_toml_prefilters_content(self):
+        """pyproject.toml without a tool.mcp table should never reach the TOML parser."""
+        harvester = PyPIHarvester(MagicMock())
+        server = _server()
+
+        with patch("packages.harvester.adapters.pypi.tomllib") as toml:
+            harvester._parse_pyproject_toml(server, b'[project]\nname = "demo"\n')
+        toml.loads.assert_not_called()
+
+        harvester._parse_pyproject_toml(server, b'[[tool.mcp.tools]]\nname = "fetch"\n')
+        assert [tool.name for tool in server.tools] == ["fetch"]
+
+
+@pytest.mark.asyncio
+class TestPyPIHarvesterArtifacts:
+    """Test suite for PyPI artifact inspection."""
+
+    async def _extract(self, harvester, artifact, url_info, **client_kwargs):
+        ranges: List[str] = []
+        client = _mock_client(artifact, ranges, **client_kwargs)
+        server = _server()
+        first, second = _patch_client(client)
+        with first, second:
+            await harvester._extract_and_parse_package(server, [url_info])
+        return server, ranges
+
+    async def test_large_wheel_is_read_through_range_requests(self):
+        """Only the central directory and searched members should be fetched."""
+        wheel = _make_wheel(
+            {
+                "demo/data.bin": random.Random(0).randbytes(256 * 1024),
+                "demo/mcp.json": json.dumps({"tools": [{"name": "lookup"}]}).encode(),
+                "demo/server.py": TOOL_SOURCE,
+            }
+        )
+        harvester = PyPIHarvester(MagicMock())
+        harvester.RANGE_REQUEST_THRESHOLD = 0
+
+        server, ranges = await self._extract(
+            harvester,
+            wheel,
+            {"packagetype": "bdist_wheel", "url": ARTIFACT_URL, "size": len(wheel)},
+        )
+
+        assert [tool.name for tool in server.tools] == ["lookup", "search"]
+        assert "full" not in ranges
+        # tail (covering the central directory) + central directory + two members
+        assert len(ranges) <= 4
+
+    async def test_large_central_directory_is_read_through_range_requests(self):
+        """A central directory larger than the fetched tail spans two ranges."""
+        files = {
+            f"demo/generated/module_{index:04d}_with_a_long_descriptive_name.txt": b"x"
+            for index in range(2000)
+        }
+        files["demo/mcp.json"] = json.dumps({"tools": [{"name": "lookup"}]}).encode()
+        files["demo/server.py"] = TOOL_SOURCE
+        wheel = _make_wheel(files)
+        harvester = PyPIHarvester(MagicMock())
+        harvester.RANGE_REQUEST_THRESHOLD = 0
+
+        with zipfile.ZipFile(io.BytesIO(wheel)) as zf:
+            directory_offset = min(info.header_offset for info in zf.infolist()[-2:])
+        assert len(wheel) - directory_offset > 1 << 16
+
+        server, ranges = await self._extract(
+            harvester,
+            wheel,
+            {"packagetype": "bdist_wheel", "url": ARTIFACT_URL, "size": len(wheel)},
+        )
+
+        assert [tool.name for tool in server.tools] == ["lookup", "search"]
+        assert "full" not in ranges
+        # tail + rest of the central directory + two members
+        assert len(ranges) == 4
+
+    async def test_wheel_without_range_support_is_downloaded(self):
+        """Servers ignoring Range should fall back to a full download."""
+        wheel = _make_wheel({"demo/server.py": TOOL_SOURCE})
+        harvester = PyPIHarvester(MagicMock())
+        harvester.RANGE_REQUEST_THRESHOLD = 0
+
+        server, ranges = await self._extract(
+            harvester,
+            wheel,
+            {"packagetype": "bdist_wheel", "url": ARTIFACT_URL, "size": len(wheel)},
+            support_ranges=False,
+        )
+
+        assert [tool.name for tool in server.tools] == ["search"]
+        # The ignored range request already returned the whole wheel
+        assert ranges == ["full"]
+
+    async def test_small_wheel_is_downloaded_whole(self):
+        """Wheels below the threshold should take a single request."""
+        wheel = _make_wheel({"demo/server.py": TOOL_SOURCE})
+        harvester = PyPIHarvester(MagicMock())
+
+        server, ranges = await self._extract(
+            harvester,
+            wheel,
+            {"packagetype": "bdist_wheel", "url": ARTIFACT_URL, "size": len(wheel)},
+        )
+
+        assert [tool.name for tool in server.tools] == ["search"]
+        assert ranges == ["full"]
+
+    async def test_parse_combines_artifact_and_metadata(self):
+        """parse() should merge artifact tools with metadata parsed during the download."""
+        wheel = _make_wheel({"demo/server.py": TOOL_SOURCE})
+        data = {
+            "package_name": "mcp-demo",
+            "download_stats": None,
+            "package_data": {
+                "info": {"name": "mcp-demo", "version": "1.0.0", "requires_dist": ["mcp>=1.0"]},
+                "urls": [{"packagetype": "bdist_wheel", "url": ARTIFACT_URL, "size": len(wheel)}],
+                "releases": {"1.0.0": [{"upload_time_iso_8601": None}]},
+            },
+        }
+        first, second = _patch_client(_mock_client(wheel, []))
+
+        with first, second:
+            server = await PyPIHarvester(MagicMock()).parse(data)
+
+        assert [tool.name for tool in server.tools] == ["search"]
+        assert [dep.library_name for dep in server.dependencies] == ["mcp"]
+        assert server.verified_source is True
+        # Releases without an upload time share the naive UTC harvest timestamp
+        assert server.last_indexed_at.tzinfo is None
+        assert [(release.version, release.published_at) for release in server.releases] == [
+            ("1.0.0", server.last_indexed_at)
+        ]
+
+    async def test_sdist_is_read_sequentially(self):
+        """Config files should be found in a single pass over the sdist."""
+        sdist = _make_sdist(
+            {
+                "demo-1.0.0/server.py": TOOL_SOURCE,
+                "demo-1.0.0/pyproject.toml": b'[[tool.mcp.tools]]\nname = "fetch"\n',
+                "demo-1.0.0/mcp.json": json.dumps({"tools": [{"name": "lookup"}]}).encode(),
+            }
+        )
+        harvester = PyPIHarvester(MagicMock())
+
+        server, _ = await self._extract(
+            harvester, sdist, {"packagetype": "sdist", "url": ARTIFACT_URL}
+        )
+
+        # mcp.json, then pyproject.toml, then decorators, regardless of archive order
+        assert [tool.name for tool in server.tools] == ["lookup", "fetch", "search"]
+
+    async def test_wheel_zip_bombs_are_skipped(self):
+        """Wheels above the size cap or with an extreme compression ratio yield no tools."""
+        padded = _make_wheel({"demo/data.bin": b"x" * 64, "demo/server.py": TOOL_SOURCE})
+        small_cap = PyPIHarvester(MagicMock())
+        small_cap.MAX_UNCOMPRESSED_SIZE = 32
+        # Deflate squeezes long runs of zeros close to its ~1032:1 maximum
+        crafted = _make_wheel({"demo/zeros.bin": bytes(4 << 20), "demo/server.py": TOOL_SOURCE})
+
+        for harvester, wheel in ((small_cap, padded), (PyPIHarvester(MagicMock()), crafted)):
+            server, _ = await self._extract(
+                harvester, wheel, {"packagetype": "bdist_wheel", "url": ARTIFACT_URL}
+            )
+            assert server.tools == []
+
+    async def test_sdist_tar_bomb_is_skipped(self):
+        """Archives above the uncompressed size cap should yield no tools."""
+        sdist = _make_sdist(
+            {
+                "demo-1.0.0/data.bin": b"x" * 64,
+                "demo-1.0.0/server.py": TOOL_SOURCE,
+            }
+        )
+        harvester = PyPIHarvester(MagicMock())
+        harvester.MAX_UNCOMPRESSED_SIZE = 32
+
+        server, _ = await self._extract(
+            harvester, sdist, {"packagetype": "sdist", "url": ARTIFACT_URL}
+        )
+
+        assert server.tools == []
+
+
+@pytest.mark.asyncio
+class TestPyPIHarvesterFetch:
+    """Test suite for PyPI metadata fetching."""
+
+    async def test_fetch_requests_metadata_and_stats_concurrently(self):
+        """Both requests should be in flight before either completes."""
+        in_flight: List[str] = []
+        both_started = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight.append(request.url.host)
+            if len(in_flight) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            if request.url.host == "pypi.org":
+                return httpx.Response(200, json={"info": {"name": "demo"}})
+            return httpx.Response(200, json={"data": {"last_month": 42}})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = PyPIHarvester(MagicMock())
+
+        first, second = _patch_client(client)
+        with first, second:
+            data = await harvester.fetch("pypi://Demo_Pkg")
+
+        assert sorted(in_flight) == ["pypi.org", "pypistats.org"]
+        assert data["package_name"] == "demo-pkg"
+        assert data["download_stats"] == {"data": {"last_month": 42}}
+
+    async def test_fetch_without_download_stats(self):
+        """A failing pypistats request should not fail the fetch."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "pypi.org":
+                return httpx.Response(200, json={"info": {"name": "demo"}})
+            return httpx.Response(503)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = PyPIHarvester(MagicMock())
+
+        first, second = _patch_client(client)
+        with first, second:
+            data = await harvester.fetch("demo")
+
+        assert data["download_stats"] is None
+
+    async def test_fetch_reuses_fresh_responses(self):
+        """Responses younger than their TTL should not be requested again."""
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.host)
+            return httpx.Response(200, json={"info": {"name": "demo"}})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = PyPIHarvester(MagicMock())
+
+        first, second = _patch_client(client)
+        with first, second:
+            await harvester.fetch("demo")
+            await harvester.fetch("demo")
+
+        assert sorted(requested) == ["pypi.org", "pypistats.org"]
+
+    async def test_fetch_revalidates_stale_responses(self):
+        """Stale responses should be revalidated and reused on 304."""
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host != "pypi.org":
+                return httpx.Response(200, json={"data": {"last_month": 1}})
+            if request.headers.get("If-None-Match") == '"v1"':
+                requested.append("304")
+                return httpx.Response(304)
+            requested.append("200")
+            return httpx.Response(200, json={"info": {"name": "demo"}}, headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = PyPIHarvester(MagicMock())
+
+        first, second = _patch_client(client)
+        with first, second, patch.object(settings, "cache_ttl_default", 0):
+            data = await harvester.fetch("demo")
+            again = await harvester.fetch("demo")
+
+        assert requested == ["200", "304"]
+        assert again["package_data"] == data["package_data"]
+
+    async def test_fetch_persists_response_cache_to_disk(self, tmp_path):
+        """A persisted response should be revalidated by a fresh process."""
+        requested: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host != "pypi.org":
+                return httpx.Response(404)
+            if request.headers.get("If-None-Match") == '"v1"':
+                requested.append("304")
+                return httpx.Response(304)
+            requested.append("200")
+            return httpx.Response(200, json={"info": {"name": "demo"}}, headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        harvester = PyPIHarvester(MagicMock())
+
+        first, second = _patch_client(client)
+        with (
+            first,
+            second,
+            patch.object(settings, "pypi_metadata_cache_dir", tmp_path),
+            patch.object(settings, "cache_ttl_default", 0),
+        ):
+            data = await harvester.fetch("demo")
+            assert (tmp_path / "https%3A%2F%2Fpypi.org%2Fpypi%2Fdemo%2Fjson.json").is_file()
+
+            # Simulate a new process: only the on-disk cache survives
+            PyPIHarvester._response_cache.clear()
+            again = await harvester.fetch("demo")
+
+        assert requested == ["200", "304"]
+        assert again["package_data"] == data["package_data"]
+
+
+@pytest.mark.asyncio
+class TestPyPIHarvesterStore:
+    """Storage tests against an in-memory SQLite database."""
+
+    @pytest_asyncio.fixture
+    async def session(self):
+        """Create an async session bound to a fresh in-memory database."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+        await engine.dispose()
+
+    @staticmethod
+    def _server(tool_names: List[str], version: str) -> Server:
+        server = _server()
+        server.tools = [Tool(name=name) for name in tool_names]
+        server.dependencies = [Dependency(library_name="mcp", ecosystem="pypi")]
+        server.releases = [Release(version=version, published_at=datetime(2024, 1, 1))]
+        return server
+
+    async def test_store_upserts_and_replaces_related_entities(self, session):
+        """Re-storing a package should update one row and replace its children."""
+        harvester = PyPIHarvester(session)
+
+        first = self._server(["a", "b"], "1.0.0")
+        await harvester.store(first, session)
+        second = self._server(["c"], "1.1.0")
+        second.description = "updated"
+        await harvester.store(second, session)
+
+        servers = (await session.exec(select(Server))).all()
+        tools = (await session.exec(select(Tool))).all()
+        dependencies = (await session.exec(select(Dependency))).all()
+        releases = (await session.exec(select(Release))).all()
+
+        assert len(servers) == 1
+        assert second.id == first.id == servers[0].id
+        assert servers[0].uuid == first.uuid
+        assert servers[0].description == "updated"
+        assert [tool.name for tool in tools] == ["c"]
+        assert len(dependencies) == 1
+        assert [release.version for release in releases] == ["1.1.0"]
+        assert all(tool.server_id == servers[0].id for tool in tools)
@@ -0,0 +1,259 @@
+"""Tests for Reddit harvester adapter.
+
+This test suite validates the RedditHarvester implementation including:
+- Post categorization by title keywords and flair
+- Post upserts that refresh engagement metrics of known posts
+- Linking posts to the servers they mention
+- Concurrent subreddit harvests with per-subreddit error handling
+"""
+
+import asyncio
+import itertools
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from packages.harvester.adapters.reddit import RedditConfig, RedditHarvester
+from packages.harvester.core.models import HostType
+from packages.harvester.models.models import Server
+from packages.harvester.models.social import ContentCategory, SocialPlatform, SocialPost
+
+
+def _post(post_id: str, **fields) -> SocialPost:
+    """Build a parsed Reddit post with overridable fields."""
+    values = {
+        "platform": SocialPlatform.REDDIT,
+        "post_id": post_id,
+        "url": f"https://reddit.com/r/mcp/comments/{post_id}",
+        "title": "My MCP server",
+        "author": "someone",
+        "score": 10,
+        "comment_count": 1,
+        "platform_created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "subreddit": "mcp",
+    }
+    values.update(fields)
+    return SocialPost(**values)
+
+
+def _raw_post(post_id: str, subreddit: str, **fields) -> dict:
+    """Build a post as returned by fetch()."""
+    values = {
+        "id": post_id,
+        "title": "My MCP server",
+        "selftext": "",
+        "author": "someone",
+        "subreddit": subreddit,
+        "url": f"https://reddit.com/r/{subreddit}/comments/{post_id}",
+        "score": 10,
+        "upvote_ratio": 0.9,
+        "num_comments": 1,
+        "created_utc": 1704067200,
+        "is_self": True,
+        "link_url": None,
+        "flair": None,
+        "is_pinned": False,
+        "is_locked": False,
+    }
+    values.update(fields)
+    return values
+
+
+@pytest.fixture
+def harvester() -> RedditHarvester:
+    return RedditHarvester(RedditConfig(subreddits=["mcp"]))
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an async session bound to a fresh in-memory database."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+def _reference_category(title: str, flair: Optional[str]) -> ContentCategory:
+    """The ordered keyword rules category_pattern encodes, checked one by one."""
+    title = title.lower()
+    flair = (flair or "").lower()
+    if any(word in title for word in ["tutorial", "guide", "how to", "walkthrough"]):
+        return ContentCategory.TUTORIAL
+    if any(word in title for word in ["release", "announcing", "launched"]):
+        return ContentCategory.ANNOUNCEMENT
+    if any(word in title for word in ["?", "help", "issue", "problem"]):
+        return ContentCategory.QUESTION
+    if any(word in title for word in ["showcase", "built", "made", "created", "project"]):
+        return ContentCategory.SHOWCASE
+    if any(word in flair for word in ["news", "announcement"]):
+        return ContentCategory.NEWS
+    if any(word in title for word in ["discussion", "thoughts", "opinion"]):
+        return ContentCategory.DISCUSSION
+    return ContentCategory.OTHER
+
+
+class TestRedditHarvester:
+    """Test suite for RedditHarvester helpers."""
+
+    @pytest.mark.parametrize(
+        ("title", "flair", "expected"),
+        [
+            ("How to release?", None, ContentCategory.TUTORIAL),
+            ("Announcing v2 - any problem?", None, ContentCategory.ANNOUNCEMENT),
+            ("Help: I built a server", None, ContentCategory.QUESTION),
+            ("Project showcase: my thoughts", None, ContentCategory.SHOWCASE),
+            ("Some thoughts", "News", ContentCategory.NEWS),
+            ("Some thoughts", None, ContentCategory.DISCUSSION),
+            ("Weekly MCP roundup", "Official Announcement", ContentCategory.NEWS),
+            ("I MADE a GUIDE", "News", ContentCategory.TUTORIAL),
+            ("Weekly MCP roundup", None, ContentCategory.OTHER),
+            ("", "", ContentCategory.OTHER),
+            ("Multi\nline question?", None, ContentCategory.QUESTION),
+        ],
+    )
+    def test_categorize_post(self, harvester, title, flair, expected):
+        """The first matching category in priority order should win."""
+        assert harvester._categorize_post({"title": title, "flair": flair}) == expected
+
+    def test_categorize_post_matches_ordered_rules(self, harvester):
+        """category_pattern must agree with the ordered keyword rules it replaces."""
+        words = ["guide", "launched", "?", "made", "opinion", "roundup"]
+        for count in range(3):
+            for combination in itertools.permutations(words, count):
+                title = " ".join(combination)
+                for flair in [None, "News", "Meta"]:
+                    assert harvester._categorize_post(
+                        {"title": title, "flair": flair}
+                    ) == _reference_category(title, flair), (title, flair)
+
+
+@pytest.mark.asyncio
+class TestRedditHarvesterStore:
+    """Storage tests against an in-memory SQLite database."""
+
+    async def test_store_inserts_posts_and_links_servers(self, harvester, session):
+        """New posts should be inserted and linked to the servers they mention."""
+        server = Server(
+            name="demo",
+            primary_url="https://github.com/acme/demo",
+            host_type=HostType.GITHUB,
+        )
+        session.add(server)
+        await session.commit()
+
+        stored = await harvester.store(
+            [_post("a", mentioned_urls=["acme/demo"]), _post("b"), _post("b")], session
+        )
+
+        assert sorted(post.post_id for post in stored) == ["a", "b"]
+        rows = {post.post_id: post for post in (await session.exec(select(SocialPost))).all()}
+        assert rows.keys() == {"a", "b"}
+        assert rows["a"].mentioned_servers == [server.id]
+        assert rows["b"].mentioned_servers == []
+
+    async def test_restore_only_refreshes_engagement_metrics(self, harvester, session):
+        """Re-storing a known post should update its metrics and keep everything else."""
+        server = Server(
+            name="demo",
+            primary_url="https://github.com/acme/demo",
+            host_type=HostType.GITHUB,
+        )
+        session.add(server)
+        await session.commit()
+        server_id = server.id
+        await harvester.store([_post("a", mentioned_urls=["acme/demo"])], session)
+
+        stored = await harvester.store(
+            [_post("a", title="Edited", score=99, comment_count=7, share_count=3)], session
+        )
+
+        assert [post.score for post in stored] == [99]
+
+        # Read back from the database rather than the identity map
+        session.expire_all()
+        rows = (await session.exec(select(SocialPost))).all()
+        assert len(rows) == 1
+        post = rows[0]
+        assert (post.score, post.comment_count, post.share_count) == (99, 7, 3)
+        assert post.title == "My MCP server"
+        assert post.mentioned_servers == [server_id]
+
+    async def test_store_without_posts(self, harvester, session):
+        """An empty batch should not touch the database."""
+        assert await harvester.store([], session) == []
+
+
+@pytest.mark.asyncio
+class TestRedditHarvesterHarvest:
+    """Harvest tests with a stubbed fetch and an in-memory SQLite database."""
+
+    async def test_harvest_stores_other_subreddits_when_one_fails(self, session):
+        """A failing subreddit should be reported without losing the others."""
+        harvester = RedditHarvester(
+            RedditConfig(subreddits=["one", "broken", "two", "three"], max_concurrent_subreddits=2)
+        )
+        in_flight = 0
+        peak = 0
+
+        async def fetch(url: str) -> dict:
+            nonlocal in_flight, peak
+            subreddit = url.removeprefix("r/")
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if subreddit == "broken":
+                raise RuntimeError("rate limited")
+            return {"subreddit": subreddit, "posts": [_raw_post(f"{subreddit}-1", subreddit)]}
+
+        harvester.fetch = fetch
+        result = await harvester.harvest(session)
+
+        assert result["total_posts"] == 3
+        assert result["errors"] == [{"subreddit": "broken", "error": "rate limited"}]
+        assert peak == 2
+        stored = (await session.exec(select(SocialPost.post_id))).all()
+        assert sorted(stored) == ["one-1", "three-1", "two-1"]
+
+    async def test_harvest_rolls_back_failed_store(self, session):
+        """Writes of a failed store must not be committed along with a later subreddit."""
+        harvester = RedditHarvester(
+            RedditConfig(subreddits=["broken", "ok"], max_concurrent_subreddits=1)
+        )
+        store = harvester.store
+
+        async def fetch(url: str) -> dict:
+            subreddit = url.removeprefix("r/")
+            return {"subreddit": subreddit, "posts": [_raw_post(f"{subreddit}-1", subreddit)]}
+
+        async def failing_store(posts, session):
+            if posts[0].subreddit == "broken":
+                session.add(posts[0])
+                await session.flush()
+                raise RuntimeError("lost connection")
+            return await store(posts, session)
+
+        harvester.fetch = fetch
+        harvester.store = failing_store
+        result = await harvester.harvest(session)
+
+        assert result["errors"] == [{"subreddit": "broken", "error": "lost connection"}]
+        assert (await session.exec(select(SocialPost.post_id))).all() == ["ok-1"]
+
+    async def test_harvest_propagates_cancellation(self, session):
+        """Cancellation is not a per-subreddit error and must not be swallowed."""
+        harvester = RedditHarvester(RedditConfig(subreddits=["one"]))
+
+        async def fetch(_url: str) -> dict:
+            raise asyncio.CancelledError
+
+        harvester.fetch = fetch
+        with pytest.raises(asyncio.CancelledError):
+            await harvester.harvest(session)